@@ -1,8 +1,13 @@
-from fastapi import APIRouter, UploadFile, File
-from controllers.audio_controller import stt_and_route_con
+from fastapi import APIRouter, UploadFile, File, WebSocket
+from controllers.audio_controller import stt_and_route_con, stream_stt_con
 
 router = APIRouter(prefix="/audio", tags=["audio"])
 
 @router.post("/speech-to-text")
 async def speech_to_text(file: UploadFile = File(...), use_flac: bool = False):
-    return await stt_and_route_con(file, use_flac)
\ No newline at end of file
+    return await stt_and_route_con(file, use_flac)
+
+# 오디오 조각을 보내는 동안 중간 인식 결과와 의도를 받는다 (format: webm 등 ffmpeg 입력 | pcm = 16kHz mono s16le)
+@router.websocket("/stream")
+async def speech_stream(websocket: WebSocket, format: str = "webm", lang: str = "ko-KR"):
+    await stream_stt_con(websocket, format, lang)
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Query
-from schemas.average_price_schema import RateRequest
-from controllers.average_price_controller import fetch_average_price
+from schemas.average_price_schema import RateBatchRequest, RateRequest
+from controllers.average_price_controller import fetch_average_price, fetch_average_price_batch
 
 router = APIRouter()
 
 @router.post("/average-deposit")
 def get_average_price(data: RateRequest):
-    return fetch_average_price(data)
\ No newline at end of file
+    return fetch_average_price(data)
+
+# 여러 매물을 열 단위 배열로 한 번에 계산 (예: {"city": [...], "district": [...], "type": [...], "price": [...]})
+@router.post("/average-deposit/batch")
+def get_average_price_batch(data: RateBatchRequest):
+    return fetch_average_price_batch(data)
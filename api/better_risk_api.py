@@ -1,9 +1,14 @@
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Query
 from schemas.risk_prediction_schema import RiskRequest
 from controllers.better_risk_controller import fetch_better_risk
 
 router = APIRouter()
 
 @router.post("/better-risk")
-def get_better_risk(data: RiskRequest):
-    return fetch_better_risk(data)
\ No newline at end of file
+def get_better_risk(
+    data: RiskRequest,
+    strategy: Optional[str] = Query(None, description="추천 탐색 방식 (grid, coarse_to_fine, coordinate_descent, latin_hypercube)"),
+    budget: Optional[int] = Query(None, ge=1, le=5000, description="추천 탐색 시 모델 평가 횟수 상한")
+):
+    return fetch_better_risk(data, strategy=strategy, budget=budget)
\ No newline at end of file
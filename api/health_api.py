@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from controllers.health_controller import fetch_health, fetch_ready
+
+router = APIRouter()
+
+@router.get("/health")
+def get_health():
+    return fetch_health()
+
+@router.get("/ready")
+def get_ready():
+    return fetch_ready()
@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+from controllers.metrics_controller import fetch_metrics
+
+router = APIRouter()
+
+@router.get("/metrics")
+def get_metrics():
+    return fetch_metrics()
@@ -1,9 +1,23 @@
-from fastapi import APIRouter
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Body, Query, Request
 from schemas.risk_prediction_schema import RiskRequest
-from controllers.risk_prediction_controller import fetch_risk_prediction
+from controllers.risk_prediction_controller import fetch_risk_prediction, fetch_risk_prediction_batch, stream_risk_prediction
 
 router = APIRouter()
 
 @router.post("/risk-prediction")
 def get_risk_prediction(data: RiskRequest):
-    return fetch_risk_prediction(data)
\ No newline at end of file
+    return fetch_risk_prediction(data)
+
+@router.post("/risk-prediction/batch")
+def get_risk_prediction_batch(items: List[Dict[str, Any]] = Body(...)):
+    return fetch_risk_prediction_batch(items)
+
+# NDJSON 또는 CSV 본문을 스트리밍으로 읽어 NDJSON 결과를 스트리밍으로 반환
+@router.post("/risk-prediction/stream")
+async def get_risk_prediction_stream(
+    request: Request,
+    format: Optional[str] = Query(None, description="ndjson 또는 csv (기본: Content-Type 으로 판단)"),
+    chunk_size: int = Query(2000, ge=1, le=10000)
+):
+    return await stream_risk_prediction(request, format, chunk_size)
\ No newline at end of file
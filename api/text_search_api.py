@@ -1,9 +1,14 @@
+from typing import List
 from fastapi import APIRouter, Body
-from controllers.text_search_controller import fetch_text_search
+from controllers.text_search_controller import fetch_text_search, fetch_text_search_batch
 
 router = APIRouter()
 
 @router.post("/text-search")
-def get_text_search(data: dict = Body(...)):
+async def get_text_search(data: dict = Body(...)):
     text = data.get("text", "")
-    return fetch_text_search(text)
\ No newline at end of file
+    return await fetch_text_search(text)
+
+@router.post("/text-search/batch")
+async def get_text_search_batch(texts: List[str] = Body(..., embed=True)):
+    return await fetch_text_search_batch(texts)
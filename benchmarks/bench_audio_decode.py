@@ -0,0 +1,125 @@
+# benchmarks/bench_audio_decode.py
+# 업로드 오디오 → 16kHz mono PCM: 프로세스 내 디코딩(decode_to_pcm16k) vs ffmpeg 파이프(run_ffmpeg_pipe)
+#   FFMPEG_PATH=/usr/bin/ffmpeg python -m benchmarks.bench_audio_decode [--corpus samples/] [-n 20]
+# --corpus 가 없으면 1/3/5/10초 wav(48kHz stereo, 44.1kHz mono)를 만들어 사용 (ffmpeg 가 있으면 webm/opus 도)
+# 요청당 지연시간과 CPU 시간(자식 ffmpeg 프로세스 포함)을 순차 실행으로 측정
+import argparse
+import asyncio
+import io
+import resource
+import shutil
+import tempfile
+import time
+import wave
+from pathlib import Path
+import numpy as np
+from utils.audio_decode import decode_to_pcm16k, sniff_format
+
+DURATIONS_SEC = [1, 3, 5, 10]
+
+
+def synth_wav(sec: int, rate: int, channels: int) -> bytes:
+    # 음성 대역 사인파 + 잡음
+    t = np.arange(sec * rate) / rate
+    rng = np.random.default_rng(sec)
+    signal = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(len(t))
+    pcm = (np.repeat(signal[:, None], channels, axis=1) * 32767).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def synthesize_corpus(out_dir: Path):
+    samples = {}
+    for sec in DURATIONS_SEC:
+        samples[f"{sec}s_48k_stereo.wav"] = synth_wav(sec, 48000, 2)
+        samples[f"{sec}s_44k_mono.wav"] = synth_wav(sec, 44100, 1)
+    try:
+        from benchmarks.bench_ffmpeg_transcode import synthesize_corpus as synth_webm
+        for path in synth_webm(out_dir):
+            samples[path.name] = path.read_bytes()
+    except Exception as e:
+        print(f"webm 샘플 생략 (ffmpeg 없음: {e.__class__.__name__})")
+    return samples
+
+
+def cpu_seconds() -> float:
+    # 이 프로세스 + 종료된 자식 프로세스(ffmpeg)의 user + sys
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+async def measure(fn, data: bytes, n: int):
+    latencies, cpu = [], []
+    for _ in range(n):
+        cpu_start, start = cpu_seconds(), time.perf_counter()
+        await fn(data)
+        latencies.append((time.perf_counter() - start) * 1000)
+        cpu.append((cpu_seconds() - cpu_start) * 1000)
+    lat = np.array(latencies)
+    return {
+        "p50_ms": round(float(np.percentile(lat, 50)), 2),
+        "p99_ms": round(float(np.percentile(lat, 99)), 2),
+        "cpu_ms": round(float(np.mean(cpu)), 2),
+    }
+
+
+async def native(data: bytes) -> bytes:
+    pcm = decode_to_pcm16k(data)
+    if pcm is None:
+        raise RuntimeError("지원하지 않는 형식")
+    return pcm
+
+
+def ffmpeg_pipe():
+    try:
+        from utils.ffmpeg_util import FFMPEG, run_ffmpeg_pipe
+    except RuntimeError:
+        return None
+    return run_ffmpeg_pipe if shutil.which(FFMPEG) else None
+
+
+def snr_db(reference: bytes, other: bytes) -> float:
+    a = np.frombuffer(reference, dtype="<i2").astype(np.float64)
+    b = np.frombuffer(other, dtype="<i2").astype(np.float64)
+    n = min(len(a), len(b))
+    noise = np.sum((a[:n] - b[:n]) ** 2)
+    return float("inf") if noise == 0 else 10 * np.log10(np.sum(a[:n] ** 2) / noise)
+
+
+async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", help="오디오 파일 디렉터리 (webm, wav, ...)")
+    ap.add_argument("-n", type=int, default=20, help="파일당 반복 횟수")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        if args.corpus:
+            samples = {p.name: p.read_bytes() for p in sorted(Path(args.corpus).iterdir()) if p.is_file()}
+        else:
+            samples = synthesize_corpus(Path(td))
+    pipe = ffmpeg_pipe()
+    if pipe is None:
+        print("ffmpeg 없음: 프로세스 내 디코딩만 측정")
+
+    for name, data in samples.items():
+        print(f"{name} ({sniff_format(data)}, {len(data) / 1024:.0f} KiB)")
+        native_ok = decode_to_pcm16k(data) is not None
+        if native_ok:
+            print(f"  native: {await measure(native, data, args.n)}")
+        else:
+            print("  native: 미지원 (ffmpeg 로 처리)")
+        if pipe is not None:
+            print(f"  ffmpeg: {await measure(pipe, data, args.n)}")
+            if native_ok:
+                # 리샘플링 필터가 달라 샘플 단위로 같지는 않음 → 신호 대 차이 비율로 확인
+                print(f"  SNR(ffmpeg 기준): {snr_db(await pipe(data), decode_to_pcm16k(data)):.1f} dB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
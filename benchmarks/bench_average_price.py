@@ -0,0 +1,94 @@
+# benchmarks/bench_average_price.py
+# 평균 전세가 rate 조회: 기존 선형 탐색 vs 2단계 해시 색인 vs NumPy 배치
+# + 엔드포인트: /average-deposit 반복 호출 vs /average-deposit/batch 한 번 (항목당 비용, 앱 안에서 TestClient 로)
+#   python -m benchmarks.bench_average_price [-n 100000] [--single 2000] [--batch 10000 100000]
+import argparse
+import time
+import numpy as np
+from data.rate_data import rate
+from services.average_price_service import calculate_average_price, calculate_average_prices
+
+
+def linear_scan(city, district, type_, price):
+    # 기존 구현: 조건에 맞는 첫 행 (district=None 행이 먼저 나오면 그 행)
+    matched = next(
+        (r for r in rate if r["city"] == city and r["type"] == type_ and (r["district"] == district or r["district"] is None)),
+        None,
+    )
+    if not matched:
+        return None
+    return {"rate": matched["rate"], "averagePrice": int(price * matched["rate"] / 100)}
+
+
+def make_queries(n: int, seed: int = 0):
+    # 실제 (시, 구, 유형) + 일부는 없는 구(시/도 값으로 대체) / 없는 조합
+    rng = np.random.default_rng(seed)
+    keys = [(r["city"], r["district"] or "기타구", r["type"]) for r in rate] + [("세종시", "없는구", "오피스텔")]
+    picks = rng.integers(0, len(keys), n)
+    prices = rng.uniform(5e7, 1e9, n).round(-4)
+    return [(*keys[k], float(p)) for k, p in zip(picks, prices)]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def bench_endpoints(n_single: int, batch_sizes):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from api.average_price_api import router
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    queries = make_queries(n_single, seed=1)
+    start = time.perf_counter()
+    singles = [client.post("/average-deposit", json={"city": c, "district": d, "type": t, "price": p}).json()
+               for c, d, t, p in queries]
+    single_us = (time.perf_counter() - start) * 1e6 / n_single
+
+    # 응답 확인: 배치 결과가 단건 호출과 같아야 함
+    columns = dict(zip(("city", "district", "type", "price"), map(list, zip(*queries))))
+    resp = client.post("/average-deposit/batch", json=columns).json()
+    rows = [{"rate": r, "averagePrice": a} if m else {"error": "해당 조건에 맞는 데이터가 없습니다."}
+            for m, r, a in zip(resp["matched"], resp["rate"], resp["averagePrice"])]
+    assert rows == singles, "배치 응답이 단건 응답과 다릅니다"
+
+    print("endpoint, per item:")
+    print(f"  /average-deposit x{n_single:<7d}  {single_us:8.2f} us")
+    for n in batch_sizes:
+        queries = make_queries(n, seed=2)
+        columns = dict(zip(("city", "district", "type", "price"), map(list, zip(*queries))))
+        start = time.perf_counter()
+        client.post("/average-deposit/batch", json=columns).raise_for_status()
+        batch_us = (time.perf_counter() - start) * 1e6 / n
+        print(f"  /average-deposit/batch n={n:<7d}  {batch_us:8.2f} us  ({single_us / batch_us:5.0f}x cheaper)")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", type=int, default=100000)
+    ap.add_argument("--single", type=int, default=2000, help="단건 엔드포인트 호출 수")
+    ap.add_argument("--batch", type=int, nargs="+", default=[10000, 100000], help="배치 크기")
+    args = ap.parse_args()
+    queries = make_queries(args.n)
+
+    expected, scan_sec = timed(lambda: [linear_scan(*q) for q in queries])
+    indexed, index_sec = timed(lambda: [calculate_average_price(*q) for q in queries])
+    batch, batch_sec = timed(calculate_average_prices, *zip(*queries))
+    assert indexed == expected, "색인 조회 결과가 선형 탐색과 다릅니다"
+    batched = [{"rate": float(r), "averagePrice": int(a)} if m else None
+               for m, r, a in zip(batch["matched"], batch["rate"], batch["averagePrice"])]
+    assert batched == expected, "배치 결과가 선형 탐색과 다릅니다"
+
+    print(f"{args.n} lookups, {len(rate)} rate rows")
+    for name, sec in (("linear scan", scan_sec), ("hash index", index_sec), ("numpy batch", batch_sec)):
+        print(f"  {name:12s} {sec * 1e9 / args.n:8.0f} ns/item  ({scan_sec / sec:5.1f}x)")
+    bench_endpoints(args.single, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/bench_encoder_backends.py
+# 인코더 백엔드 비교: 라우팅 결과 parity + 임베딩 코사인 + cold start/peak RSS + 단건/배치 지연시간
+#   python -m services.encoder_backends export --quantize   # ONNX 아티팩트 먼저 생성
+#   python -m benchmarks.bench_encoder_backends [--backends sentence_transformers onnx onnx:int8] [--threads 4]
+# 라우팅 결과(function, matched)가 하나라도 다르면 exit code 1
+# 기준이 sentence_transformers 이고 모두 일치하면 ONNX 모델 옆 parity.json 에 결과를 기록 (OnnxEncoder.verified)
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+import numpy as np
+from services.encoder_backends import ONNX_DIR, onnx_model_file, record_parity
+
+HELDOUT_PATH = Path(__file__).parent / "data" / "intent_heldout.txt"
+
+# 백엔드별로 새 프로세스에서 intent_service 를 import 해 라우팅 결과와 cold start/RSS 를 측정
+WORKER_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import services.intent_service as s
+cold = time.perf_counter() - start
+texts = [t for ex in s.FUNCTION_EXAMPLES.values() for t in ex] + json.loads(sys.stdin.read())
+routes = s.route_intents(texts)
+queries = s.embed_queries(texts)
+print(json.dumps({
+    "cold_start_ms": round(cold * 1000, 1),
+    "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    "texts": texts,
+    "routes": [[r["function"], r["matched"]] for r in routes],
+    "queries": queries.tolist(),
+}))
+"""
+
+TIMING_SCRIPT = """
+import json, sys
+from benchmarks.bench_risk_inference import measure
+from services.encoder_backends import ONNX_DIR, onnx_model_file, record_parity
+import services.intent_service as s
+texts = json.loads(sys.stdin.read())
+n = int(sys.argv[1])
+print(json.dumps({
+    "single": measure(lambda: s._encode_queries(texts[:1]), n),
+    "batch32": measure(lambda: s._encode_queries((texts * 32)[:32]), max(1, n // 10)),
+}))
+"""
+
+
+def load_heldout():
+    return [line.strip() for line in HELDOUT_PATH.read_text(encoding="utf-8").splitlines()
+            if line.strip() and not line.startswith("#")]
+
+
+def backend_env(spec: str, threads: int):
+    name, _, variant = spec.partition(":")
+    env = dict(os.environ, INTENT_ENCODER_BACKEND=name, QUERY_EMBED_CACHE_SIZE="0")
+    env["INTENT_ONNX_QUANTIZE"] = "1" if variant == "int8" else "0"
+    if threads:
+        env["INTENT_ENCODER_THREADS"] = str(threads)
+    return env
+
+
+def run(script, spec, threads, texts, *args):
+    out = subprocess.run([sys.executable, "-c", script, *args], input=json.dumps(texts, ensure_ascii=False),
+                         env=backend_env(spec, threads), capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backends", nargs="+", default=["sentence_transformers", "onnx", "onnx:int8"])
+    ap.add_argument("--threads", type=int, default=0)
+    ap.add_argument("-n", type=int, default=300)
+    args = ap.parse_args()
+
+    heldout = load_heldout()
+    reference = None
+    ok = True
+    passed = {}
+    for spec in args.backends:
+        # FUNCTION_EXAMPLES + held-out 발화
+        result = run(WORKER_SCRIPT, spec, args.threads, heldout)
+        texts = result.pop("texts")
+        queries = np.array(result.pop("queries"))
+        routes = result.pop("routes")
+        if reference is None:
+            reference = (spec, routes, queries)
+        ref_spec, ref_routes, ref_queries = reference
+        mismatches = [t for t, a, b in zip(texts, routes, ref_routes) if a != b]
+        ok &= not mismatches
+        parity = {
+            "routes_identical": f"{len(texts) - len(mismatches)}/{len(texts)} (vs {ref_spec})",
+            "min_cosine": round(float(np.min(np.sum(queries * ref_queries, axis=1))), 6),
+        }
+        if ref_spec == "sentence_transformers" and spec.startswith("onnx") and not mismatches:
+            passed[spec] = parity
+        print(spec, {
+            **parity,
+            **result,
+            **run(TIMING_SCRIPT, spec, args.threads, texts, str(args.n)),
+        })
+        for t in mismatches:
+            print(f"  라우팅 불일치: {t}", file=sys.stderr)
+
+    if not ok:
+        sys.exit(1)
+    onnx_dir = Path(os.getenv("INTENT_ONNX_DIR", str(ONNX_DIR)))
+    for spec, parity in passed.items():
+        record_parity(onnx_model_file(onnx_dir, quantize=spec.endswith(":int8")), parity)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_ffmpeg_transcode.py
+# 업로드 오디오 → 16kHz mono 변환: 임시 파일 방식(run_ffmpeg) vs 파이프 방식(run_ffmpeg_pipe)
+#   FFMPEG_PATH=/usr/bin/ffmpeg python -m benchmarks.bench_ffmpeg_transcode [--corpus samples/] [-n 20] [--concurrency 8]
+# --corpus 가 없으면 ffmpeg 로 1/3/5/10초 webm(opus) 샘플을 만들어 사용
+import argparse
+import asyncio
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from utils.ffmpeg_util import FFMPEG, run_ffmpeg, run_ffmpeg_pipe
+
+DURATIONS_SEC = [1, 3, 5, 10]
+
+
+def synthesize_corpus(out_dir: Path):
+    # 음성 대역 사인파 + 잡음을 48kHz opus/webm 으로 (브라우저 MediaRecorder 업로드와 비슷한 형식)
+    paths = []
+    for sec in DURATIONS_SEC:
+        path = out_dir / f"sample_{sec}s.webm"
+        subprocess.run([
+            FFMPEG, "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate=48000:duration={sec}",
+            "-f", "lavfi", "-i", f"anoisesrc=color=pink:sample_rate=48000:amplitude=0.05:duration={sec}",
+            "-filter_complex", "amix=inputs=2", "-c:a", "libopus", str(path),
+        ], check=True)
+        paths.append(path)
+    return paths
+
+
+async def file_path_transcode(data: bytes) -> bytes:
+    # 기존 audio_service 경로: 임시 파일 쓰기 → ffmpeg 파일 변환 → 결과 읽기
+    with tempfile.TemporaryDirectory() as td:
+        src, out = Path(td) / "audio.webm", Path(td) / "audio.pcm"
+        src.write_bytes(data)
+        await asyncio.to_thread(run_ffmpeg, src, out)
+        return out.read_bytes()
+
+
+async def measure(fn, samples, n: int, concurrency: int):
+    latencies = []
+    jobs = iter([s for _ in range(n) for s in samples])
+
+    async def worker():
+        for data in jobs:
+            start = time.perf_counter()
+            await fn(data)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    lat = np.array(latencies)
+    return {
+        "files_per_sec": round(len(lat) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(lat, 50)), 1),
+        "p99_ms": round(float(np.percentile(lat, 99)), 1),
+    }
+
+
+async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", help="오디오 파일 디렉터리 (webm, wav, ...)")
+    ap.add_argument("-n", type=int, default=20, help="파일당 반복 횟수")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        paths = sorted(p for p in Path(args.corpus).iterdir() if p.is_file()) if args.corpus else synthesize_corpus(Path(td))
+        samples = [p.read_bytes() for p in paths]
+        print(f"corpus: {len(samples)} files, {sum(map(len, samples)) / 1024:.0f} KiB")
+
+        for data in samples:
+            # 파이프 출력은 헤더 없는 PCM, 파일 출력은 WAV (헤더 + 같은 PCM)
+            pipe_pcm = await run_ffmpeg_pipe(data)
+            wav = await file_path_transcode(data)
+            assert wav.endswith(pipe_pcm) and len(wav) - len(pipe_pcm) < 256, "파이프/파일 변환 결과가 다릅니다"
+
+        for concurrency in args.concurrency:
+            print(f"concurrency={concurrency}")
+            print(f"  temp file: {await measure(file_path_transcode, samples, args.n, concurrency)}")
+            print(f"  pipe:      {await measure(run_ffmpeg_pipe, samples, args.n, concurrency)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+# benchmarks/bench_import_time.py
+# `python -X importtime -c "import main"` 요약: 전체 import 시간 + 누적 시간 상위 모듈
+#   python -m benchmarks.bench_import_time [--module main] [--top 15] [--max-ms 1500]
+# --max-ms 를 넘거나 --forbid 모듈(무거운 서비스)이 import 되면 exit code 1
+import argparse
+import re
+import subprocess
+import sys
+
+# 앱 import 만으로 로드되면 안 되는 모듈 (첫 사용 / 워밍업 때 로드)
+DEFAULT_FORBIDDEN = [
+    "catboost", "sentence_transformers", "torch", "onnxruntime", "google.cloud.speech",
+    "services.intent_service", "services.audio_service",
+]
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module: str):
+    # [(모듈, self_us, cumulative_us, depth)]
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in out.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--module", default="main")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--max-ms", type=float, default=None)
+    ap.add_argument("--forbid", nargs="*", default=DEFAULT_FORBIDDEN)
+    args = ap.parse_args()
+
+    rows = import_profile(args.module)
+    total_ms = sum(self_us for _, self_us, _, _ in rows) / 1000
+    print(f"import {args.module}: {total_ms:.1f}ms, {len(rows)} modules")
+    # 대상 모듈이 직접 import 한 모듈(깊이 1)별 누적 시간
+    direct = sorted((r for r in rows if r[3] == 1), key=lambda r: r[2], reverse=True)
+    for name, _, cumulative, _ in direct[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+    loaded = {name for name, _, _, _ in rows}
+    forbidden = [name for name in args.forbid if name in loaded]
+    ok = True
+    if forbidden:
+        print(f"import 시 로드되면 안 되는 모듈: {', '.join(forbidden)}", file=sys.stderr)
+        ok = False
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"import 시간 {total_ms:.1f}ms > {args.max_ms}ms", file=sys.stderr)
+        ok = False
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_intent_batching.py
+# 동시 요청 수별 route_intent 처리량/지연시간: 요청마다 인코딩 vs 마이크로 배치
+#   python -m benchmarks.bench_intent_batching [--requests 512] [--concurrency 1 4 16 64]
+import argparse
+import asyncio
+import time
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+from services.intent_service import FUNCTION_EXAMPLES, route_intent, route_intents
+from services.intent_batcher import IntentMicroBatcher, MAX_BATCH_SIZE, MAX_WAIT_MS
+
+UTTERANCES = [t for examples in FUNCTION_EXAMPLES.values() for t in examples]
+
+
+async def run_load(route, n_requests: int, concurrency: int):
+    latencies = []
+    counter = iter(range(n_requests))
+
+    async def client():
+        for i in counter:
+            start = time.perf_counter()
+            await route(UTTERANCES[i % len(UTTERANCES)])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    lat = np.array(latencies)
+    return {
+        "req_per_sec": round(n_requests / elapsed, 1),
+        "p50_ms": round(float(np.percentile(lat, 50)), 2),
+        "p99_ms": round(float(np.percentile(lat, 99)), 2),
+    }
+
+
+async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=512)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    ap.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    ap.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = ap.parse_args()
+
+    route_intents(UTTERANCES)  # 워밍업
+
+    async def unbatched(text):
+        return await run_in_threadpool(route_intent, text)
+
+    for concurrency in args.concurrency:
+        batcher = IntentMicroBatcher(route_intents, args.max_batch_size, args.max_wait_ms)
+        print(f"concurrency={concurrency}")
+        print(f"  per-request: {await run_load(unbatched, args.requests, concurrency)}")
+        result = await run_load(batcher.route, args.requests, concurrency)
+        await batcher.close()
+        stats = batcher.stats()
+        print(f"  micro-batch: {result} (mean batch {stats['mean_batch_size']}, mean wait {stats['mean_wait_ms']}ms)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+# benchmarks/bench_intent_ranking.py
+# 의도 점수 계산: 기능별 반복(기존 rank_functions) vs IntentIndex 행렬곱 한 번
+# 인코더 없이 임의의 정규화 벡터로 기능 수를 늘려가며 측정
+#   python -m benchmarks.bench_intent_ranking [-n 2000] [--examples 8]
+import argparse
+import numpy as np
+from benchmarks.bench_risk_inference import measure
+from services.intent_index import IntentIndex
+
+DIM = 384  # multilingual-e5-small 임베딩 차원
+
+
+def _unit(rng, n):
+    v = rng.standard_normal((n, DIM)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def legacy_scores(q, func_names, example_bank, desc_embs, boosts, top_k=3):
+    # 기존 rank_functions 의 계산 방식
+    out = {}
+    for i, f in enumerate(func_names):
+        knn = float(np.sort(example_bank[f] @ q)[-top_k:].mean())
+        out[f] = knn * 0.7 + float(np.dot(q, desc_embs[f])) * 0.25 + boosts[i]
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", type=int, default=2000)
+    ap.add_argument("--examples", type=int, default=8, help="기능당 예시 수")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n_funcs in (4, 16, 64):
+        func_names = [f"func_{i}" for i in range(n_funcs)]
+        example_bank = {f: _unit(rng, int(rng.integers(3, args.examples + 1))) for f in func_names}
+        desc_embs = {f: _unit(rng, 1)[0] for f in func_names}
+        index = IntentIndex.from_banks(func_names, example_bank, desc_embs)
+        q = _unit(rng, 1)
+        boosts = np.zeros(n_funcs)
+
+        legacy = legacy_scores(q[0], func_names, example_bank, desc_embs, boosts)
+        packed = index.scores(q, boosts)[0]
+        max_diff = float(np.max(np.abs(np.array([legacy[f] for f in func_names]) - packed)))
+
+        print(f"functions={n_funcs} (max |diff| {max_diff:.2e})")
+        print(f"  legacy: {measure(lambda: legacy_scores(q[0], func_names, example_bank, desc_embs, boosts), args.n)}")
+        print(f"  packed: {measure(lambda: index.scores(q, boosts), args.n)}")
+
+
+if __name__ == "__main__":
+    main()
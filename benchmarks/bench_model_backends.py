@@ -0,0 +1,89 @@
+# benchmarks/bench_model_backends.py
+# 모델 백엔드 비교: predict_proba / 분류 임계값 / 예측 클래스 parity + cold start + peak RSS + 단건 p50/p99
+#   CATBOOST_MODEL_LIB=/path/libcatboostmodel.so python -m benchmarks.bench_model_backends [--backends catboost cmodel] [--tol 1e-6] [--model path.cbm]
+# 확률 차이가 허용 오차를 넘거나 임계값/예측 클래스가 하나라도 다르면 exit code 1
+import argparse
+import json
+import subprocess
+import sys
+import numpy as np
+from benchmarks.bench_risk_inference import measure
+from services.feature_store import MODEL_PATH, load_market_index
+from services.model_backends import load_backend
+from services.risk_features import classes_from_proba
+
+COLD_START_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+from services.model_backends import load_backend
+from services.risk_features import classes_from_proba
+backend = load_backend(sys.argv[1], __import__("pathlib").Path(sys.argv[2]))
+backend.predict_proba([json.loads(sys.argv[3])])
+print(json.dumps({
+    "cold_start_ms": round((time.perf_counter() - start) * 1000, 1),
+    "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+}))
+"""
+
+
+def sample_rows(n: int, seed: int = 0):
+    # 실제 서비스에서 나올 수 있는 (시도, 주택구분) 조합과 그럴듯한 수치 범위로 샘플 생성
+    index = load_market_index()
+    regions = sorted({region for region, _ in index.jeonse.keys})
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n):
+        house_price = int(rng.integers(50_000_000, 1_500_000_000))
+        ltv = float(rng.uniform(0.2, 1.3))
+        start_y, end_y = int(rng.integers(2021, 2025)), int(rng.integers(2022, 2027))
+        rows.append([
+            ltv, house_price, int(house_price * rng.uniform(0.3, 1.0)), int(house_price * rng.uniform(0, 0.5)),
+            str(rng.choice(regions)), str(rng.choice(["아파트", "단독주택", "종합"])),
+            int(rng.integers(1, 48)), float(rng.uniform(40, 95)), float(rng.uniform(0.5, 3.5)), int(rng.integers(0, 15000)),
+            start_y, int(rng.integers(1, 13)), end_y, int(rng.integers(1, 13)), ltv * house_price,
+        ])
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backends", nargs="+", default=["catboost", "cmodel"])
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("-n", type=int, default=1000)
+    ap.add_argument("--tol", type=float, default=1e-6)
+    ap.add_argument("--model", default=str(MODEL_PATH), help="비교할 .cbm 경로")
+    args = ap.parse_args()
+
+    rows = sample_rows(args.rows)
+    reference = load_backend("catboost", args.model)
+    expected = reference.predict_proba(rows)
+    expected_classes = classes_from_proba(reference, expected)
+
+    ok = True
+    for name in args.backends:
+        backend = reference if name == "catboost" else load_backend(name, args.model)
+        proba = backend.predict_proba(rows)
+        max_diff = float(np.max(np.abs(proba - expected)))
+        class_agreement = float(np.mean(classes_from_proba(backend, proba) == expected_classes))
+        ok &= max_diff <= args.tol
+        ok &= backend.probability_threshold == reference.probability_threshold and class_agreement == 1.0
+
+        cold = subprocess.run(
+            [sys.executable, "-c", COLD_START_SCRIPT, name, args.model, json.dumps(rows[0])],
+            capture_output=True, text=True, check=True,
+        )
+        print(name, {
+            "parity_max_abs_diff": float(f"{max_diff:.3g}"),
+            "threshold": backend.probability_threshold,
+            "class_agreement": class_agreement,
+            **json.loads(cold.stdout),
+            **measure(lambda: backend.predict_proba([rows[0]]), args.n),
+        })
+
+    if not ok:
+        print(f"parity 실패: 확률 허용 오차 {args.tol} 초과 또는 임계값/예측 클래스 불일치", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_recommendation_search.py
+# 추천 탐색 방식 비교: 같은 평가 예산에서 찾은 최소 위험 확률 (grid 대비 승/무/패) 과 지연시간
+#   python -m benchmarks.bench_recommendation_search [--budget 125] [--requests 200] [--grid-steps 11]
+import argparse
+import statistics
+import time
+import numpy as np
+from fastapi import HTTPException
+from services.feature_store import get_feature_store
+from services.better_risk_service import better_risk, better_risk_result_cache
+from services import recommendation_search
+from services.recommendation_search import SEARCH_STRATEGIES
+
+
+def sample_requests(n: int, seed: int = 0):
+    store = get_feature_store()
+    regions = sorted({region for region, _ in store.market_index.jeonse.keys})
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        house_price = int(rng.integers(50_000_000, 1_500_000_000))
+        deposit = int(house_price * rng.uniform(0.5, 1.0))
+        seniority = int(house_price * rng.uniform(0.05, 0.5))
+        start = int(rng.integers(2021, 2025)) * 100 + int(rng.integers(1, 13))
+        yield dict(
+            initialLTV=(deposit + seniority) / house_price, housePrice=house_price, depositAmount=deposit,
+            seniority=seniority, region=str(rng.choice(regions)), houseType=str(rng.choice(["아파트", "단독주택", "빌라"])),
+            guaranteeStartMonth=start, guaranteeEndMonth=start + 200,
+        )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--budget", type=int, default=125)
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--grid-steps", type=int, default=recommendation_search.GRID_STEPS)
+    args = ap.parse_args()
+    recommendation_search.GRID_STEPS = args.grid_steps
+
+    store = get_feature_store()
+    results = {name: [] for name in SEARCH_STRATEGIES}
+    latency = {name: [] for name in SEARCH_STRATEGIES}
+    evaluations = {name: [] for name in SEARCH_STRATEGIES}
+    for req in sample_requests(args.requests):
+        try:
+            base = better_risk(**req, store=store, strategy="grid", budget=args.budget)
+        except HTTPException:
+            continue
+        if "recommendation" not in base:
+            continue  # 위험 예측이 아닌 경우 추천 탐색 없음
+        for name in SEARCH_STRATEGIES:
+            better_risk_result_cache.clear()  # 앞의 호출이 채운 결과 캐시를 재지 않도록
+            start = time.perf_counter()
+            rec = better_risk(**req, store=store, strategy=name, budget=args.budget)["recommendation"]
+            latency[name].append((time.perf_counter() - start) * 1000)
+            results[name].append(rec["probability"])
+            evaluations[name].append(rec["evaluations"])
+
+    grid = np.array(results["grid"])
+    print(f"위험 예측 요청 {len(grid)}건, 평가 예산 {args.budget}")
+    for name in SEARCH_STRATEGIES:
+        probs = np.array(results[name])
+        if len(probs) == 0:
+            continue
+        print(name, {
+            "mean_best_prob": round(float(probs.mean()), 3),
+            "better_than_grid": int((probs < grid).sum()),
+            "equal": int((probs == grid).sum()),
+            "worse": int((probs > grid).sum()),
+            "mean_evaluations": round(float(np.mean(evaluations[name])), 1),
+            "p50_ms": round(statistics.median(latency[name]), 2),
+        })
+
+
+if __name__ == "__main__":
+    main()
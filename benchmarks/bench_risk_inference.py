@@ -0,0 +1,57 @@
+# benchmarks/bench_risk_inference.py
+# 단건 위험도 예측 지연시간: 기존 경로(DataFrame + Pool + predict + predict_proba) vs predict_risk
+#   python -m benchmarks.bench_risk_inference [-n 2000]
+import argparse
+import statistics
+import time
+import pandas as pd
+from catboost import CatBoostClassifier, Pool
+from services.feature_store import MODEL_PATH, get_feature_store
+from services.risk_features import FEATURE_ORDER, CATEGORICAL_FEATURES
+from services.risk_prediction_service import predict_risk
+
+SAMPLE = dict(
+    initialLTV=0.9, housePrice=300000000, depositAmount=200000000, seniority=70000000,
+    region="서울", houseType="아파트", guaranteeStartMonth=202210, guaranteeEndMonth=202410,
+)
+SAMPLE_ROW = [0.9, 300000000, 200000000, 70000000, "서울", "아파트", 24, 70.0, 3.0, 900, 2022, 10, 2024, 10, 0.9 * 300000000]
+
+
+def measure(fn, n: int):
+    for _ in range(min(50, n)):
+        fn()
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {
+        "p50_us": round(statistics.median(samples), 1),
+        "p99_us": round(samples[int(len(samples) * 0.99) - 1], 1),
+        "mean_us": round(statistics.fmean(samples), 1),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", type=int, default=2000)
+    args = ap.parse_args()
+
+    store = get_feature_store()
+    # 기존 경로는 RISK_MODEL_BACKEND 와 상관없이 catboost 패키지로 직접 로드
+    model = CatBoostClassifier()
+    model.load_model(MODEL_PATH)
+
+    def legacy_inference():
+        features_df = pd.DataFrame([SAMPLE_ROW], columns=FEATURE_ORDER)
+        pool = Pool(features_df, cat_features=CATEGORICAL_FEATURES)
+        model.predict(pool)
+        model.predict_proba(pool)[:, 1]
+
+    print("legacy inference  ", measure(legacy_inference, args.n))
+    print("predict_risk (e2e)", measure(lambda: predict_risk(**SAMPLE, store=store), args.n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_stt_pool.py
+# STT 클라이언트 재사용 효과: 요청마다 새 클라이언트(기존 방식) vs 프로세스 공용 풀 (로컬 대역 서버 대상)
+#   python -m benchmarks.bench_stt_pool [-n 200] [--concurrency 1 4 8] [--latency-ms 80] [--handshake-ms 60]
+# --app 을 주면 실행 중인 앱의 /audio/speech-to-text 에 wav 업로드로 부하를 건다 (앱 쪽 설정 예:
+#   STT_PROVIDER=http STT_HTTP_ENDPOINT=http://127.0.0.1:8765 uvicorn main:app  +  python -m benchmarks.fake_stt_server)
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from benchmarks.bench_audio_decode import synth_wav
+from benchmarks.fake_stt_server import start_in_thread
+from services.stt_providers import HttpStt, recognize_with_retry
+
+
+def run_load(call, n: int, concurrency: int):
+    def timed(_):
+        start = time.perf_counter()
+        call()
+        return (time.perf_counter() - start) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        lat = np.array(list(pool.map(timed, range(n))))
+    elapsed = time.perf_counter() - started
+    return {
+        "req_per_sec": round(n / elapsed, 1),
+        "p50_ms": round(float(np.percentile(lat, 50)), 1),
+        "p99_ms": round(float(np.percentile(lat, 99)), 1),
+    }
+
+
+def bench_providers(args):
+    server = start_in_thread(latency_ms=args.latency_ms, handshake_ms=args.handshake_ms, error_rate=args.error_rate)
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    pcm = np.zeros(16000 * 2, dtype="<i2").tobytes()  # 2초 무음 LINEAR16
+    print(f"fake STT latency={args.latency_ms}ms handshake={args.handshake_ms}ms error_rate={args.error_rate}")
+    for concurrency in args.concurrency:
+        results = {}
+        for reuse in (False, True):
+            provider = HttpStt(endpoint, pool_size=concurrency, reuse=reuse)
+            connections = server.connections
+            results[reuse] = run_load(lambda: recognize_with_retry(pcm, provider=provider), args.n, concurrency)
+            results[reuse]["connections"] = server.connections - connections
+        saved = results[False]["p99_ms"] - results[True]["p99_ms"]
+        print(f"concurrency={concurrency}")
+        print(f"  new client per request: {results[False]}")
+        print(f"  pooled client:          {results[True]}")
+        print(f"  p99 saved: {saved:.1f}ms")
+    server.shutdown()
+
+
+def bench_app(args):
+    import httpx
+    wav = synth_wav(3, 48000, 2)
+    with httpx.Client(base_url=args.app, timeout=60,
+                      limits=httpx.Limits(max_connections=max(args.concurrency))) as client:
+        def call():
+            resp = client.post("/audio/speech-to-text", files={"file": ("sample.wav", wav, "audio/wav")})
+            resp.raise_for_status()
+
+        for concurrency in args.concurrency:
+            print(f"concurrency={concurrency}: {run_load(call, args.n, concurrency)}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", type=int, default=200, help="요청 수")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    ap.add_argument("--latency-ms", type=float, default=80)
+    ap.add_argument("--handshake-ms", type=float, default=60)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--app", help="실행 중인 앱 주소 (예: http://127.0.0.1:8000)")
+    args = ap.parse_args()
+    if args.app:
+        bench_app(args)
+    else:
+        bench_providers(args)
+
+
+if __name__ == "__main__":
+    main()
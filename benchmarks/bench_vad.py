@@ -0,0 +1,115 @@
+# benchmarks/bench_vad.py
+# STT 전 무음 제거(VAD) 효과: 요청당 제거된 오디오 길이, 무음 클립 조기 거절 수, STT 지연시간 변화
+#   python -m benchmarks.bench_vad [-n 60] [--concurrency 4] [--latency-ms 80] [--ms-per-audio-sec 150]
+# --corpus 가 없으면 앞뒤 무음(약한 잡음)이 붙은 합성 발화 + 잡음이 큰 방의 작은 발화 + 무음 클립을 만들어 사용
+# STT 지연시간은 실제 STT 가 아니라 로컬 대역 서버(고정 지연 + 오디오 1초당 --ms-per-audio-sec 의 합성 비용)로 잰 값
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+from benchmarks.fake_stt_server import start_in_thread
+from services.stt_providers import HttpStt, recognize_with_retry
+from utils.audio_decode import decode_to_pcm16k
+from utils.vad import trim_silence
+
+RATE = 16000
+
+
+def synth_utterance(rng, speech_sec: float, lead_sec: float, trail_sec: float) -> bytes:
+    # 음절처럼 진폭이 바뀌는 배음 + 앞뒤로 -60dBFS 정도의 잡음
+    t = np.arange(int(speech_sec * RATE)) / RATE
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    voice = sum(np.sin(2 * np.pi * k * np.cumsum(f0) / RATE) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0.15, 1.0)
+    speech = 0.15 * voice * envelope
+    noise = lambda sec: 0.001 * rng.standard_normal(int(sec * RATE))
+    signal = np.concatenate([noise(lead_sec), speech + 0.001 * rng.standard_normal(len(speech)), noise(trail_sec)])
+    return (np.clip(signal, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def synth_noisy_room(rng, speech_sec: float, lead_sec: float) -> bytes:
+    # -45dBFS 잡음 위의 -38dBFS 음성 (적응형 문턱값을 넘지 못해도 STT 로 보내야 하는 경우)
+    noise = 10 ** (-45 / 20) * rng.standard_normal(int((lead_sec + speech_sec) * RATE))
+    t = np.arange(int(speech_sec * RATE)) / RATE
+    noise[-len(t):] += 10 ** (-38 / 20) * np.sqrt(2) * np.sin(2 * np.pi * 200 * t)
+    return (np.clip(noise, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def synthesize_corpus(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    clips = []
+    for i in range(n):
+        if i % 10 == 4:
+            clips.append(synth_noisy_room(rng, rng.uniform(1.0, 3.0), rng.uniform(0.5, 2.0)))
+        elif i % 10 == 9:
+            clips.append((0.001 * rng.standard_normal(int(rng.uniform(1, 4) * RATE)) * 32767).astype("<i2").tobytes())
+        else:
+            clips.append(synth_utterance(rng, rng.uniform(1.0, 3.0), rng.uniform(0.3, 2.5), rng.uniform(0.5, 3.0)))
+    return clips
+
+
+def run(clips, provider, concurrency: int, use_vad: bool):
+    def one(pcm: bytes):
+        start = time.perf_counter()
+        if use_vad:
+            pcm, summary = trim_silence(pcm)
+            if not pcm:
+                return (time.perf_counter() - start) * 1000, summary
+        recognize_with_retry(pcm, provider=provider)
+        return (time.perf_counter() - start) * 1000, None
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        rows = list(pool.map(one, clips))
+    lat = np.array([ms for ms, _ in rows])
+    return {
+        "p50_ms": round(float(np.percentile(lat, 50)), 1),
+        "p99_ms": round(float(np.percentile(lat, 99)), 1),
+        "mean_ms": round(float(lat.mean()), 1),
+        "rejected_empty": sum(1 for _, s in rows if s is not None),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", help="오디오 파일 디렉터리 (wav 등, 16kHz mono 로 변환해서 사용)")
+    ap.add_argument("-n", type=int, default=60, help="합성 클립 수")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--latency-ms", type=float, default=80)
+    ap.add_argument("--ms-per-audio-sec", type=float, default=150)
+    args = ap.parse_args()
+
+    if args.corpus:
+        clips = [decode_to_pcm16k(p.read_bytes()) for p in sorted(Path(args.corpus).iterdir()) if p.is_file()]
+        clips = [c for c in clips if c is not None]
+    else:
+        clips = synthesize_corpus(args.n)
+
+    vad_ms, summaries = [], []
+    for pcm in clips:
+        start = time.perf_counter()
+        _, summary = trim_silence(pcm)
+        vad_ms.append((time.perf_counter() - start) * 1000)
+        summaries.append(summary)
+    input_sec = sum(s["input_sec"] for s in summaries)
+    removed_sec = sum(s["removed_sec"] for s in summaries)
+    print(f"clips={len(clips)} audio={input_sec:.1f}s removed={removed_sec:.1f}s "
+          f"({removed_sec / input_sec:.0%}), avg removed per request={removed_sec / len(clips):.2f}s, "
+          f"empty={sum(s['speech_sec'] == 0 for s in summaries)}, "
+          f"untrimmed={sum(s['untrimmed'] for s in summaries)}")
+    print(f"VAD cost: mean {np.mean(vad_ms):.2f}ms, max {np.max(vad_ms):.2f}ms per clip")
+
+    print(f"STT latency below is from the local fake server ({args.latency_ms:.0f}ms fixed + "
+          f"{args.ms_per_audio_sec:.0f}ms per audio second, synthetic), not a real STT service")
+    server = start_in_thread(latency_ms=args.latency_ms, handshake_ms=0, ms_per_audio_sec=args.ms_per_audio_sec)
+    provider = HttpStt(f"http://127.0.0.1:{server.server_address[1]}", pool_size=args.concurrency)
+    for use_vad in (False, True):
+        before = server.audio_sec
+        result = run(clips, provider, args.concurrency, use_vad)
+        result["stt_audio_sec"] = round(server.audio_sec - before, 1)
+        print(f"{'with VAD   ' if use_vad else 'without VAD'}: {result}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
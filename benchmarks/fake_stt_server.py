@@ -0,0 +1,109 @@
+# benchmarks/fake_stt_server.py
+# 오프라인 부하 테스트용 STT 대역 서버 (Google REST POST /v1/speech:recognize 형식)
+#   python -m benchmarks.fake_stt_server [--port 8765] [--latency-ms 80] [--handshake-ms 60] [--error-rate 0.0]
+#                                        [--ms-per-audio-sec 0]
+# 앱은 STT_PROVIDER=http STT_HTTP_ENDPOINT=http://127.0.0.1:8765 로 연결
+# 새 TCP 연결의 첫 요청에는 handshake-ms 만큼 더 기다려 TLS / 채널 생성 비용을 흉내낸다 (연결 재사용 효과 측정용)
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_TRANSCRIPT = "전세 사기 위험도 알려줘"
+
+
+class FakeSttHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # 헤더와 본문을 한 번에 보내 Nagle + delayed ACK 지연(~40ms)이 측정에 섞이지 않도록
+    disable_nagle_algorithm = True
+    wbufsize = 1 << 16
+
+    def setup(self):
+        super().setup()
+        self.first_request = True
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        try:
+            request = json.loads(body)
+            audio = base64.b64decode(request["audio"]["content"])
+            audio_sec = len(audio) / (2 * request["config"].get("sampleRateHertz", 16000))
+        except (ValueError, KeyError, TypeError):
+            request, audio, audio_sec = None, b"", 0.0
+        # 고정 지연 + (새 연결이면) 연결 비용 + 오디오 길이에 비례하는 인식 시간
+        delay = server.latency_ms + (server.handshake_ms if self.first_request else 0) + server.ms_per_audio_sec * audio_sec
+        self.first_request = False
+        time.sleep(delay / 1000)
+        with server.lock:
+            server.requests += 1
+            server.audio_sec += audio_sec
+        if not self.path.startswith("/v1/speech:recognize"):
+            return self._reply(404, {"error": {"code": 404, "message": "not found"}})
+        if random.random() < server.error_rate:
+            return self._reply(503, {"error": {"code": 503, "message": "unavailable"}})
+        if request is None:
+            return self._reply(400, {"error": {"code": 400, "message": "invalid request"}})
+        results = [{"alternatives": [{"transcript": server.transcript, "confidence": 0.9}]}] if audio else []
+        self._reply(200, {"results": results})
+
+    def _reply(self, status: int, payload: dict):
+        data = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_server(port: int = 0, latency_ms: float = 80, handshake_ms: float = 60, error_rate: float = 0.0,
+                transcript: str = DEFAULT_TRANSCRIPT, ms_per_audio_sec: float = 0.0) -> ThreadingHTTPServer:
+    # port=0 이면 빈 포트 (server.server_address 로 확인)
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeSttHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.latency_ms, server.handshake_ms, server.error_rate = latency_ms, handshake_ms, error_rate
+    server.transcript = transcript
+    server.ms_per_audio_sec = ms_per_audio_sec
+    server.connections = 0
+    server.requests = 0
+    server.audio_sec = 0.0
+    return server
+
+
+def start_in_thread(**kwargs) -> ThreadingHTTPServer:
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name="fake-stt", daemon=True).start()
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=80)
+    ap.add_argument("--handshake-ms", type=float, default=60)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--transcript", default=DEFAULT_TRANSCRIPT)
+    ap.add_argument("--ms-per-audio-sec", type=float, default=0.0, help="오디오 1초당 추가 인식 시간")
+    args = ap.parse_args()
+    server = make_server(args.port, args.latency_ms, args.handshake_ms, args.error_rate, args.transcript,
+                         args.ms_per_audio_sec)
+    print(f"fake STT: http://127.0.0.1:{server.server_address[1]}/v1/speech:recognize")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"connections={server.connections} requests={server.requests} audio_sec={server.audio_sec:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,53 @@
 # controllers/audio_controller.py
-from fastapi import HTTPException, UploadFile
-from services.audio_service import stt_from_webm_ser
-from services.intent_service import route_intent
+from fastapi import HTTPException, UploadFile, WebSocket, WebSocketDisconnect
+from services.components import speech
+from services.executors import stream_executor
+from services.intent_batcher import intent_batcher
+from services.stt_streaming import stream_session
 
 async def stt_and_route_con(file: UploadFile, use_flac: bool = False):
     try:
-        stt_result = await stt_from_webm_ser(file, use_flac)
+        # Google STT 클라이언트 모듈과 ffmpeg 설정은 첫 요청 때 로드
+        stt_result = await (await speech.aget()).stt_from_webm_ser(file, use_flac)
         text = stt_result.get("text", "")
         if not text:
             return {"error": "음성에서 텍스트를 추출하지 못했습니다."}
-        intent_result = route_intent(text)
+        intent_result = await intent_batcher.route(text)
         return {
             "stt": stt_result,
             "intent": intent_result
         }
+    except HTTPException:
+        raise  # 400 (ffmpeg 변환 실패), 503 (대기열 가득 참) 등은 그대로 전달
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"처리 중 오류: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"처리 중 오류: {str(e)}")
+
+async def _receive_audio(websocket: WebSocket):
+    # 바이너리 프레임 = 오디오 조각, 텍스트 프레임("end") = 입력 끝
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        if message.get("bytes"):
+            yield message["bytes"]
+        elif message.get("text") is not None:
+            return
+
+async def stream_stt_con(websocket: WebSocket, audio_format: str = "webm", lang: str = "ko-KR"):
+    await websocket.accept()
+    try:
+        # 동시 스트리밍 연결 수 제한 (가득 차면 오류 메시지 후 1013 으로 종료)
+        with stream_executor.admit():
+            await stream_session(_receive_audio(websocket), websocket.send_json, intent_batcher.route,
+                                 audio_format=audio_format, lang=lang)
+    except WebSocketDisconnect:
+        return  # 클라이언트가 먼저 끊음 (ffmpeg / 인식 스트림은 stream_session 에서 정리)
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "status": e.status_code, "detail": e.detail})
+        await websocket.close(code=1013 if e.status_code == 503 else 1011)
+        return
+    except Exception as e:
+        await websocket.send_json({"type": "error", "status": 500, "detail": f"처리 중 오류: {str(e)}"})
+        await websocket.close(code=1011)
+        return
+    await websocket.close()
@@ -1,5 +1,8 @@
-from schemas.average_price_schema import RateRequest
-from services.average_price_service import calculate_average_price
+import numpy as np
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from schemas.average_price_schema import RateBatchRequest, RateRequest
+from services.average_price_service import calculate_average_price, calculate_average_prices
 
 def fetch_average_price(data: RateRequest):
     result = calculate_average_price(
@@ -10,4 +13,33 @@ def fetch_average_price(data: RateRequest):
     )
     if not result:
         return {"error": "해당 조건에 맞는 데이터가 없습니다."}
-    return result
\ No newline at end of file
+    return result
+
+AVERAGE_PRICE_BATCH_MAX_ITEMS = 100000
+# 가격 한도 (1,000조 원): averagePrice 를 int64 로 만들 때 넘치지 않도록 inf / NaN / 이보다 큰 값은 422
+AVERAGE_PRICE_BATCH_MAX_PRICE = 1e15
+
+def fetch_average_price_batch(data: RateBatchRequest):
+    n = len(data.city)
+    if any(len(column) != n for column in (data.district, data.type, data.price)):
+        raise HTTPException(status_code=422, detail="city, district, type, price 의 길이가 같아야 합니다.")
+    if n > AVERAGE_PRICE_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {AVERAGE_PRICE_BATCH_MAX_ITEMS}건까지 요청할 수 있습니다.")
+    prices = np.asarray(data.price, dtype=np.float64)
+    invalid = np.flatnonzero(~(np.abs(prices) <= AVERAGE_PRICE_BATCH_MAX_PRICE))  # NaN 도 걸러진다
+    if len(invalid):
+        raise HTTPException(status_code=422, detail=(
+            f"price 는 절댓값 {AVERAGE_PRICE_BATCH_MAX_PRICE:.0f} 이하의 유한한 값이어야 합니다 "
+            f"(index: {', '.join(map(str, invalid[:20].tolist()))}{' ...' if len(invalid) > 20 else ''})."
+        ))
+
+    result = calculate_average_prices(data.city, data.district, data.type, prices)
+    matched = result["matched"]
+    # 열 단위 응답 (조건에 맞는 데이터가 없는 위치는 null)
+    # 리스트가 크므로 jsonable_encoder 를 거치지 않고 바로 직렬화
+    return JSONResponse(content={
+        "count": n,
+        "matched": matched.tolist(),
+        "rate": np.where(matched, result["rate"], None).tolist(),
+        "averagePrice": np.where(matched, result["averagePrice"], None).tolist(),
+    })
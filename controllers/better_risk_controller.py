@@ -1,7 +1,8 @@
+from typing import Optional
 from schemas.risk_prediction_schema import RiskRequest
 from services.better_risk_service import better_risk
 
-def fetch_better_risk(data: RiskRequest):
+def fetch_better_risk(data: RiskRequest, strategy: Optional[str] = None, budget: Optional[int] = None):
     result = better_risk(
         initialLTV = data.initialLTV,
         housePrice = data.housePrice,
@@ -10,7 +11,9 @@ def fetch_better_risk(data: RiskRequest):
         region = data.region,
         houseType = data.houseType,
         guaranteeStartMonth = data.guaranteeStartMonth,
-        guaranteeEndMonth = data.guaranteeEndMonth
+        guaranteeEndMonth = data.guaranteeEndMonth,
+        strategy = strategy,
+        budget = budget
     )
     if not result:
         return {"error": "해당 조건에 맞는 데이터가 없습니다."}
@@ -0,0 +1,16 @@
+from fastapi.responses import JSONResponse
+from services.components import health_report, is_ready, warmup_state
+
+def fetch_health():
+    # 프로세스가 살아 있으면 항상 200 (컴포넌트 로드 여부와 무관)
+    return {"status": "ok", "components": health_report()}
+
+def fetch_ready():
+    # 워밍업 대상 컴포넌트가 모두 로드되기 전에는 503
+    ready = is_ready()
+    body = {
+        "ready": ready,
+        "warmup": warmup_state["requested"],
+        "components": health_report(),
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
@@ -0,0 +1,18 @@
+from services.feature_store import feature_store
+from services.intent_batcher import intent_batcher
+from services import stt_providers
+from services.executors import audio_executor, embedding_executor  # noqa: F401 (실행기 등록)
+from utils.bounded_executor import EXECUTOR_REGISTRY
+from utils.result_cache import CACHE_REGISTRY
+from utils import vad
+
+def fetch_metrics():
+    # 캐시 적중/미스/제거 수와 feature store 상태 (로드를 유발하지 않음)
+    return {
+        "caches": {name: cache.stats() for name, cache in CACHE_REGISTRY.items()},
+        "feature_store": feature_store.timing_report(),
+        "intent_batcher": intent_batcher.stats(),
+        "executors": {name: executor.stats() for name, executor in EXECUTOR_REGISTRY.items()},
+        "stt": stt_providers.stats(),
+        "vad": vad.stats(),
+    }
@@ -1,5 +1,12 @@
+import io
+import tempfile
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from schemas.risk_prediction_schema import RiskRequest
-from services.risk_prediction_service import predict_risk
+from services.risk_prediction_service import predict_risk, predict_risk_batch
+from services.bulk_scoring_service import score_text_stream
 
 def fetch_risk_prediction(data: RiskRequest):
     result = predict_risk(
@@ -14,4 +21,61 @@ def fetch_risk_prediction(data: RiskRequest):
     )
     if not result:
         return {"error": "해당 조건에 맞는 데이터가 없습니다."}
-    return result
\ No newline at end of file
+    return result
+
+RISK_BATCH_MAX_ITEMS = 10000
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+def fetch_risk_prediction_batch(items: List[Dict[str, Any]]):
+    if len(items) > RISK_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {RISK_BATCH_MAX_ITEMS}건까지 요청할 수 있습니다.")
+
+    # 항목별로 스키마 검증 → 실패한 항목만 오류로 돌려주고 나머지는 점수 계산
+    requests, positions, errors = [], [], []
+    for i, item in enumerate(items):
+        try:
+            requests.append(RiskRequest(**item))
+            positions.append(i)
+        except ValidationError as e:
+            fields = [".".join(str(p) for p in err["loc"]) for err in e.errors()]
+            errors.append({"index": i, "detail": "입력 형식이 올바르지 않습니다.", "fields": fields})
+
+    result = predict_risk_batch(requests)
+    for r in result["results"]:
+        r["index"] = positions[r["index"]]
+    for e in result["errors"]:
+        e["index"] = positions[e["index"]]
+    errors.extend(result["errors"])
+
+    return {
+        "results": result["results"],
+        "errors": sorted(errors, key=lambda e: e["index"])
+    }
+
+
+async def _score_spooled(spool, fmt: str, chunk_size: int):
+    # csv.reader 가 따옴표 안 줄바꿈을 처리하도록 newline="" 로 연다
+    text = io.TextIOWrapper(spool, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        async for data in score_text_stream(text, fmt=fmt, chunk_size=chunk_size):
+            yield data
+    finally:
+        text.close()
+
+async def stream_risk_prediction(request: Request, fmt: Optional[str], chunk_size: int):
+    if fmt is None:
+        fmt = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    if fmt not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {fmt}")
+
+    # StreamingResponse 는 응답 중에 receive 채널로 연결 종료를 감시하므로
+    # 요청 본문은 먼저 임시 파일(일정 크기 이상이면 디스크)에 받아 둔 뒤 읽는다
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+
+    return StreamingResponse(
+        _score_spooled(spool, fmt, chunk_size),
+        media_type="application/x-ndjson"
+    )
\ No newline at end of file
@@ -1,12 +1,35 @@
-from services.intent_service import route_intent
+from typing import List
+from services.components import intent_engine
+from services.intent_batcher import intent_batcher
+from services.executors import embedding_executor
 from fastapi import HTTPException
 
-def fetch_text_search(text: str):
+TEXT_SEARCH_BATCH_MAX_ITEMS = 256
+
+async def fetch_text_search(text: str):
     try:
-        intent_result = route_intent(text)
+        # 동시에 들어온 요청과 묶어서 한 번에 인코딩
+        intent_result = await intent_batcher.route(text)
         return {
             "text": text,
             "intent": intent_result
         }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"처리 중 오류: {str(e)}")
+
+async def fetch_text_search_batch(texts: List[str]):
+    if len(texts) > TEXT_SEARCH_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {TEXT_SEARCH_BATCH_MAX_ITEMS}개까지 요청할 수 있습니다.")
+    try:
+        # 인코더는 첫 요청(또는 시작 시 워밍업) 때 로드
+        intent_service = await intent_engine.aget()
+        intent_results = await embedding_executor.run(intent_service.route_intents, texts)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"처리 중 오류: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"처리 중 오류: {str(e)}")
+    return {
+        "results": [{"text": t, "intent": r} for t, r in zip(texts, intent_results)]
+    }
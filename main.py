@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.quiz_api import router as quiz_router
@@ -6,8 +7,21 @@ from api.risk_prediction_api import router as risk_prediction_router
 from api.better_risk_api import router as better_risk_router
 from api.audio_api import router as audio_router
 from api.text_search_api import router as text_search_router
+from api.metrics_api import router as metrics_router
+from api.health_api import router as health_router
+from services.components import intent_engine, start_background_warmup
 
-app = FastAPI()
+# 무거운 컴포넌트(위험도 모델, 의도 인코더, STT)는 첫 사용 때 로드하고,
+# APP_WARMUP (기본 none, all 또는 쉼표 구분 이름) 대상은 시작 직후 백그라운드에서 미리 로드 (/ready 로 확인)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_background_warmup()
+    yield
+    # 질의 임베딩 캐시를 디스크에 남겨 재시작 후에도 재사용 (QUERY_EMBED_CACHE_PATH 설정 시)
+    if intent_engine.is_loaded:
+        intent_engine.get().query_cache.save()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정
 origins = [
@@ -29,6 +43,8 @@ app.include_router(risk_prediction_router)
 app.include_router(better_risk_router)
 app.include_router(audio_router)
 app.include_router(text_search_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
 
 @app.get("/")
 def read_root():
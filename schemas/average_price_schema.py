@@ -1,7 +1,15 @@
+from typing import List, Optional
 from pydantic import BaseModel
 
 class RateRequest(BaseModel):
     city: str
     district: str
     type: str
-    price: float
\ No newline at end of file
+    price: float
+
+class RateBatchRequest(BaseModel):
+    # 열 단위 입력: 같은 위치의 값들이 매물 하나 (district 가 null 이면 시/도 전체 값)
+    city: List[str]
+    district: List[Optional[str]]
+    type: List[str]
+    price: List[float]
@@ -1,48 +1,171 @@
 # services/audio_service.py
+import asyncio
+import hashlib
+import logging
+import os
 import aiofiles
 import tempfile
 import shutil
 from pathlib import Path
+from typing import Dict, Optional
 from fastapi import HTTPException, UploadFile
-from utils.ffmpeg_util import run_ffmpeg
-from google.cloud import speech
+from utils.ffmpeg_util import FFMPEG_MAX_INPUT_BYTES, run_ffmpeg, run_ffmpeg_pipe
+from utils.audio_decode import decode_to_pcm16k, sniff_format
+from utils.result_cache import DiskCache, TieredCache, cache_from_env
+from utils import vad
+from services.executors import audio_executor
+from services.stt_providers import STT_PROVIDER, recognize_with_retry
+
+logger = logging.getLogger(__name__)
+
+# 변환 방식: pipe (기본, 임시 파일 없이 stdin/stdout) | file (기존 임시 파일 방식)
+# pipe 모드에서도 mp4/m4a/mov/3gp 는 파일로 (stdin 은 seek 할 수 없어 moov 가 끝에 있으면 demux 불가,
+# iOS Safari MediaRecorder 가 이런 파일을 만든다), 그 밖의 형식도 pipe 변환이 실패하면 파일로 한 번 더 시도
+AUDIO_TRANSCODE_MODE = os.getenv("AUDIO_TRANSCODE_MODE", "pipe")
+# wav, webm/opus 는 ffmpeg 프로세스 없이 프로세스 안에서 디코딩 + 리샘플링 (실패/미지원 형식은 ffmpeg 로)
+AUDIO_NATIVE_DECODE = os.getenv("AUDIO_NATIVE_DECODE", "1") == "1"
+# STT 전에 앞뒤 무음 제거 + 발화 길이 제한 (LINEAR16 만, FLAC 은 그대로)
+# 클립 전체가 VAD_MIN_DB 아래일 때만 STT 없이 빈 결과, 음성 구간을 못 찾은 클립은 자르지 않고 STT 로
+AUDIO_VAD = os.getenv("AUDIO_VAD", "1") == "1"
+AUDIO_MAX_UTTERANCE_SEC = float(os.getenv("AUDIO_MAX_UTTERANCE_SEC", "15"))
+
+# 같은 오디오 재업로드(모바일 재시도 등) 시 변환 + STT 를 다시 하지 않도록 전사 결과 캐시
+# 업로드 바이트 해시로 먼저 찾고, 없으면 변환된 16kHz PCM 해시로 (컨테이너만 다른 같은 오디오)
+# 메모리: AUDIO_CACHE_MAX_ENTRIES / AUDIO_CACHE_MAX_BYTES / AUDIO_CACHE_TTL_SEC, AUDIO_CACHE_DIR 를 주면 디스크 2차 캐시
+AUDIO_CACHE_PCM_HASH = os.getenv("AUDIO_CACHE_PCM_HASH", "1") == "1"
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR")
+transcript_cache = TieredCache(
+    cache_from_env("audio_transcript", prefix="AUDIO_CACHE"),
+    DiskCache(
+        "audio_transcript_disk", Path(AUDIO_CACHE_DIR),
+        max_bytes=int(os.getenv("AUDIO_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024))),
+        ttl=float(os.getenv("AUDIO_CACHE_DISK_TTL_SEC", "86400")),
+    ) if AUDIO_CACHE_DIR else None,
+)
+# 전사 결과가 달라지는 설정 (공급자 / 모델 / 언어 / VAD 와 그 조정값 / 발화 길이 제한) 이 바뀌면 예전 결과를 쓰지 않도록
+# (FLAC 여부는 요청마다 다르므로 버전이 아니라 캐시 키에 넣는다)
+_VAD_SETTINGS = (
+    f"vad={vad.VAD_FRAME_MS},{vad.VAD_MIN_DB},{vad.VAD_MARGIN_DB},{vad.VAD_MAX_THRESHOLD_DB},"
+    f"{vad.VAD_MIN_SPEECH_MS},{vad.VAD_PAD_MS}" if AUDIO_VAD else "vad=off"
+)
+TRANSCRIPT_VERSION = f"{STT_PROVIDER}:latest_short:ko-KR:{_VAD_SETTINGS}:max={AUDIO_MAX_UTTERANCE_SEC}"
+# 처리 중인 같은 업로드는 결과를 기다렸다가 같이 받는다 (업로드 해시 → Future)
+_inflight: Dict[str, asyncio.Task] = {}
+
+async def transcode_upload(file: UploadFile, use_flac: bool = False) -> bytes:
+    return await transcode_bytes(await file.read(), use_flac, file.filename)
+
+async def transcode_bytes(data: bytes, use_flac: bool = False, filename: Optional[str] = None) -> bytes:
+    if AUDIO_TRANSCODE_MODE == "file":
+        return await transcode_upload_via_file(data, use_flac, filename)
+    if len(data) > FFMPEG_MAX_INPUT_BYTES:
+        raise HTTPException(status_code=413, detail=f"오디오 파일이 너무 큽니다 (최대 {FFMPEG_MAX_INPUT_BYTES} bytes).")
+    if AUDIO_NATIVE_DECODE and not use_flac:
+        pcm = await audio_executor.run(decode_to_pcm16k, data)
+        if pcm is not None:
+            return pcm
+    if sniff_format(data) == "mp4":
+        return await transcode_upload_via_file(data, use_flac, filename)
+    try:
+        with audio_executor.admit():
+            return await run_ffmpeg_pipe(data, to_flac=use_flac)
+    except HTTPException as e:
+        if e.status_code != 400:
+            raise  # 크기 초과 / 시간 초과 / 실행기 포화는 그대로
+        logger.info("ffmpeg pipe failed, retrying via temp file (%s): %s", filename, e.detail)
+    return await transcode_upload_via_file(data, use_flac, filename)
 
 async def stt_from_webm_ser(file: UploadFile, use_flac: bool = False):
+    data = await file.read()
+    # 해시(최대 FFMPEG_MAX_INPUT_BYTES) 와 디스크 캐시 조회는 audio 실행기에서 (이벤트 루프를 막지 않도록)
+    upload_key, cached = await audio_executor.run(_lookup, "upload", data, use_flac)
+    if cached is not None:
+        return {**cached, "cached": True, "cache_match": "upload"}
+    task = _inflight.get(upload_key)
+    if task is not None:
+        result = await asyncio.shield(task)
+        return {**result, "cached": True, "cache_match": "inflight"}
+
+    # 요청이 끊겨도 변환 / 인식은 끝까지 해서 캐시에 남긴다 (곧 들어올 재시도가 받아감)
+    task = asyncio.ensure_future(_transcribe(data, use_flac, file.filename, upload_key))
+    _inflight[upload_key] = task
+    task.add_done_callback(lambda t: _finish_inflight(upload_key, t))
+    result = await asyncio.shield(task)
+    return {**result, "cached": "cache_match" in result}  # PCM 해시로 찾은 경우도 캐시 응답
+
+def _format_tag(use_flac: bool) -> str:
+    # 같은 오디오라도 FLAC(VAD 없이 그대로) 과 LINEAR16 의 전사 결과는 따로 저장
+    return "flac" if use_flac else "pcm16"
+
+def _lookup(kind: str, data: bytes, use_flac: bool):
+    # (캐시 키, 캐시된 결과 또는 None), 블로킹 작업이므로 audio 실행기에서 호출
+    key = f"{kind}:{_format_tag(use_flac)}:{hashlib.sha256(data).hexdigest()}"
+    return key, transcript_cache.get(key, TRANSCRIPT_VERSION)
+
+def _store(keys, result: Dict) -> None:
+    for key in keys:
+        if key:
+            transcript_cache.put(key, result, TRANSCRIPT_VERSION)
+
+def _finish_inflight(upload_key: str, task: asyncio.Task) -> None:
+    _inflight.pop(upload_key, None)
+    if not task.cancelled():
+        task.exception()  # 기다리는 요청이 없어도 "never retrieved" 경고가 나지 않도록
+
+async def _transcribe(data: bytes, use_flac: bool, filename: Optional[str], upload_key: str):
+    audio_bytes = await transcode_bytes(data, use_flac, filename)
+    pcm_key = None
+    if AUDIO_CACHE_PCM_HASH:
+        pcm_key, cached = await audio_executor.run(_lookup, "pcm", audio_bytes, use_flac)
+        if cached is not None:
+            await _store_quietly([upload_key], cached)
+            return {**cached, "cache_match": "pcm"}
+
+    encoding = "FLAC" if use_flac else "LINEAR16"
+    summary = None
+    if AUDIO_VAD and not use_flac:
+        audio_bytes, summary = await audio_executor.run(vad.trim_silence, audio_bytes, max_sec=AUDIO_MAX_UTTERANCE_SEC)
+        vad.record(summary)
+    rejected = summary is not None and not audio_bytes
+    if rejected:
+        result = {"text": "", "confidence": None}  # 클립 전체가 무음이면 STT 호출 없이
+    else:
+        try:
+            result = await audio_executor.run(google_stt_bytes, audio_bytes, encoding=encoding)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"STT 실패: {e}")
+    if summary is not None:
+        result = {**result, "vad": summary}
+    # 오류와 VAD 로 거절한 빈 결과는 저장하지 않는다 (다음 재시도는 다시 판정 / 인식)
+    if rejected:
+        return result
+    await _store_quietly([upload_key, pcm_key], result)
+    return result
+
+async def _store_quietly(keys, result: Dict) -> None:
+    # 이미 얻은 결과를 실행기 포화(503) 때문에 버리지 않도록 저장 실패는 캐시만 건너뛴다
+    try:
+        await audio_executor.run(_store, keys, result)
+    except HTTPException as e:
+        logger.warning("transcript not cached (%s): %s", e.status_code, e.detail)
+
+async def transcode_upload_via_file(data: bytes, use_flac: bool = False, filename: Optional[str] = None) -> bytes:
     with tempfile.TemporaryDirectory() as td:
         td = Path(td)
-        src_name = Path(file.filename or "audio.webm").name
+        src_name = Path(filename or "audio.webm").name
         src = td / src_name
         async with aiofiles.open(src, "wb") as f:
-            await f.write(await file.read())
+            await f.write(data)
 
-        out = td / ("audio.flac" if use_flac else "audio.wav")
-        try:
-            run_ffmpeg(src, out, to_flac=use_flac)
-        except HTTPException as e:
-            raise
+        out = td / ("audio.flac" if use_flac else "audio.pcm")
+        # 블로킹 작업(ffmpeg, STT)은 이벤트 루프 밖의 audio 실행기에서 (가득 차면 503)
+        await audio_executor.run(run_ffmpeg, src, out, to_flac=use_flac)
 
         async with aiofiles.open(out, "rb") as f:
-            audio_bytes = await f.read()
-        encoding = "FLAC" if use_flac else "LINEAR16"
-        try:
-            return google_stt_bytes(audio_bytes, encoding=encoding)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"STT 실패: {e}")
+            return await f.read()
 
 def google_stt_bytes(audio_bytes: bytes, encoding: str = "LINEAR16", rate: int = 16000, lang="ko-KR"):
-    client = speech.SpeechClient()
-    audio = speech.RecognitionAudio(content=audio_bytes)
-    config = speech.RecognitionConfig(
-        encoding=getattr(speech.RecognitionConfig.AudioEncoding, encoding),
-        sample_rate_hertz=rate,
-        language_code=lang,
-        enable_automatic_punctuation=True,
-        model="latest_short"
-    )
-    resp = client.recognize(config=config, audio=audio)
-    if resp.results:
-        text = " ".join(alt.transcript for r in resp.results for alt in r.alternatives[:1])
-        confidence = resp.results[0].alternatives[0].confidence
-    else:
-        text, confidence = "", None
-    return {"text": text, "confidence": confidence}
\ No newline at end of file
+    # 프로세스 전체에서 재사용하는 STT 클라이언트 (STT_PROVIDER) + deadline / 재시도 / 동시 호출 제한
+    return recognize_with_retry(audio_bytes, encoding=encoding, rate=rate, lang=lang)
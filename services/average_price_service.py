@@ -1,19 +1,70 @@
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+import numpy as np
 from data.rate_data import rate
 
+RateIndex = Dict[Tuple[str, str], Dict[Optional[str], int]]
+
+
+def build_rate_index(rows: List[Dict]) -> Tuple[RateIndex, np.ndarray]:
+    """rate 목록 → (city, type) → {district: 행 번호} 2단계 색인 + 행 번호별 rate 배열.
+
+    district 가 None 인 행은 시/도 전체 값으로 같은 dict 의 None 키에 들어간다.
+    같은 키가 여러 번 나오면 먼저 나온 행을 쓴다 (기존 선형 탐색과 동일).
+    """
+    index: RateIndex = {}
+    for i, r in enumerate(rows):
+        index.setdefault((r["city"], r["type"]), {}).setdefault(r["district"], i)
+    rates = np.array([r["rate"] for r in rows], dtype=np.float64)
+    return index, rates
+
+
+RATE_INDEX, RATE_VALUES = build_rate_index(rate)
+
+
+def find_rate_row(city: str, district: Optional[str], type_: str) -> Optional[int]:
+    # 구/군 행이 있으면 그 행, 없으면 시/도 전체(district=None) 행 (행 순서와 상관없이 구체적인 쪽 우선)
+    districts = RATE_INDEX.get((city, type_))
+    if districts is None:
+        return None
+    row = districts.get(district)
+    return districts.get(None) if row is None else row
+
+
 def calculate_average_price(city: str, district: str, type_: str, price: float):
-# 해당 조건에 맞는 rate 검색
-    matched = next(
-        (
-            r for r in rate
-            if r["city"] == city and r["type"] == type_ and (r["district"] == district or r["district"] is None)
-        ),
-        None
-    )
-    if not matched:
+    # 해당 조건에 맞는 rate 검색
+    row = find_rate_row(city, district, type_)
+    if row is None:
         return None
-    
+
+    matched = rate[row]
     average_price = price * matched["rate"] / 100
     return {
         "rate": matched["rate"],
         "averagePrice": int(average_price)
-    }
\ No newline at end of file
+    }
+
+
+def calculate_average_prices(cities: Sequence[str], districts: Sequence[Optional[str]],
+                             types: Sequence[str], prices: Sequence[float]) -> Dict[str, np.ndarray]:
+    """여러 매물을 한 번에 계산: 색인으로 rate 를 찾고 price * rate / 100 은 한 번의 배열 연산으로.
+
+    반환: matched (bool), rate (float, 없으면 NaN), averagePrice (int64, 없으면 0)
+    """
+    cache: Dict[Hashable, int] = {}  # 같은 (시, 구, 유형) 은 한 번만 찾는다
+    rows = np.empty(len(cities), dtype=np.int64)
+    for i, key in enumerate(zip(cities, districts, types)):
+        row = cache.get(key)
+        if row is None:
+            found = find_rate_row(key[0], key[1], key[2])
+            row = cache[key] = -1 if found is None else found
+        rows[i] = row
+
+    matched = rows >= 0
+    rates = np.where(matched, RATE_VALUES[np.where(matched, rows, 0)], np.nan)
+    # int(price * rate / 100) 과 같은 연산 순서 + 0 방향 버림
+    average = np.trunc(np.asarray(prices, dtype=np.float64) * rates / 100)
+    return {
+        "matched": matched,
+        "rate": rates,
+        "averagePrice": np.where(matched, average, 0).astype(np.int64),
+    }
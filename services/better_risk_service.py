@@ -1,48 +1,15 @@
-from fastapi import FastAPI, HTTPException
-from catboost import CatBoostClassifier
-from pathlib import Path
-import pandas as pd
-import math
-from catboost import Pool
-import itertools
-from utils.util import get_jeonse_rate, get_unsold_value, get_base_rate, map_housing_type, calculate_guarantee_period
-
-# 모델 로드
-MODEL_PATH = Path(__file__).parent.parent / "models" / "catboost_0822.cbm"
-model = CatBoostClassifier()
-model.load_model(MODEL_PATH)
-
-# 데이터 로드 (전세가율 xlsx)
-JEONSE_PATH = Path(__file__).parent.parent / "data" / "dataset_Jeonse_rate.xlsx"
-try:
-    jeonse_df = pd.read_excel(JEONSE_PATH, engine="openpyxl", header=1)  # header=1 추가: row2를 헤더로
-    new_columns = []
-    for col in jeonse_df.columns:
-        if isinstance(col, (float, int)):
-            year = math.floor(col)
-            month_str = str(round((col - year) * 100))
-            if len(month_str) == 1:
-                month_str = '0' + month_str
-            new_columns.append(f"{year:d}.{month_str}")
-        else:
-            new_columns.append(str(col))
-    jeonse_df.columns = new_columns
-except FileNotFoundError:
-    raise RuntimeError(f"전세가율 데이터 파일을 찾을 수 없습니다: {JEONSE_PATH}")
-
-# 데이터 로드 (미분양현황 xlsx)
-UNSOLD_PATH = Path(__file__).parent.parent / "data" / "dataset_unsold.xlsx"
-try:
-    unsold_df = pd.read_excel(UNSOLD_PATH, engine="openpyxl", header=0)  # 첫 줄이 header
-except FileNotFoundError:
-    raise RuntimeError(f"지역별 미판매 데이터 파일을 찾을 수 없습니다: {UNSOLD_PATH}")
-
-# 데이터 로드 (기준금리 xlsx)
-BASE_RATE_PATH = Path(__file__).parent.parent / "data" / "dataset_base_interest_rate.xlsx"
-try:
-    base_rate_df = pd.read_excel(BASE_RATE_PATH, engine="openpyxl", header=0)
-except FileNotFoundError:
-    raise RuntimeError(f"기준금리 파일을 찾을 수 없습니다: {BASE_RATE_PATH}")
+from typing import Optional
+from fastapi import HTTPException
+from utils.util import map_housing_type, calculate_guarantee_period
+from services.feature_store import FeatureStore, get_feature_store
+from services.risk_features import (
+    FEATURE_ORDER, classes_from_proba, counterfactual_rows, request_cache_key
+)
+from services.recommendation_search import search_factors, DEFAULT_STRATEGY, DEFAULT_BUDGET
+from utils.result_cache import cache_from_env
+
+# 추천 탐색은 후보 수백 개를 평가하므로 같은 입력(+탐색 방식/예산)의 결과를 재사용
+better_risk_result_cache = cache_from_env("better_risk")
 
 def better_risk(
     initialLTV,
@@ -52,20 +19,33 @@ def better_risk(
     region,
     houseType,
     guaranteeStartMonth,
-    guaranteeEndMonth
+    guaranteeEndMonth,
+    store: Optional[FeatureStore] = None,
+    strategy: Optional[str] = None,
+    budget: Optional[int] = None
 ):
-    
+    # 모델/데이터/버전은 snapshot 하나에서 함께 가져온다 (계산 중 reload 돼도 섞이지 않음)
+    snapshot = (store or get_feature_store()).snapshot()
+    cache_key = request_cache_key(initialLTV, housePrice, depositAmount, seniority, region, houseType,
+                                  guaranteeStartMonth, guaranteeEndMonth) + (strategy or DEFAULT_STRATEGY, budget or DEFAULT_BUDGET)
+    cached = better_risk_result_cache.get(cache_key, snapshot.cache_version)
+    if cached is not None:
+        return cached
+
+    model = snapshot.model
+    market_index = snapshot.market_index
+
     loanAmount = initialLTV * housePrice
     guaranteePeriodMonths = calculate_guarantee_period(guaranteeStartMonth, guaranteeEndMonth)
-    jeonseRateStartMonth = get_jeonse_rate(jeonse_df, region, houseType, guaranteeStartMonth)
+    jeonseRateStartMonth = market_index.get_jeonse_rate(region, houseType, guaranteeStartMonth)
     if jeonseRateStartMonth is None:
         raise HTTPException(status_code=400, detail="전세가율 데이터를 찾을 수 없습니다.")
     
-    unsoldValue = get_unsold_value(unsold_df, region, guaranteeStartMonth)
+    unsoldValue = market_index.get_unsold_value(region, guaranteeStartMonth)
     if unsoldValue is None:
         raise HTTPException(status_code=400, detail="지역별 미판매 데이터를 찾을 수 없습니다.")
     
-    baseRate = get_base_rate(base_rate_df, guaranteeStartMonth)
+    baseRate = market_index.get_base_rate(guaranteeStartMonth)
 
     # ⚡ feature_order에 맞게 데이터 구성
     features_dict = {
@@ -86,86 +66,68 @@ def better_risk(
         "대출액": loanAmount,
     }
 
-    # DataFrame으로 변환 (순서 보장)
-    feature_order = [
-        "초기LTV", "주택가액", "임대보증금액", "선순위",
-        "시도", "주택구분", "보증기간_개월", "보증시작월_전세가율",
-        "기준금리", "미분양주택수", "보증시작월_dt_연", "보증시작월_dt_월",
-        "보증완료월_dt_연", "보증완료월_dt_월", "대출액"
-    ]
-    features_df = pd.DataFrame([[features_dict[col] for col in feature_order]], columns=feature_order)
-
-    # Pool 객체 생성 (categorical_features 지정)
-    categorical_features = ["시도", "주택구분"]
-    pool = Pool(features_df, cat_features=categorical_features)
-
+    # DataFrame 없이 한 행을 바로 예측 (predict_proba 한 번으로 클래스까지 계산)
+    row = [features_dict[col] for col in FEATURE_ORDER]
     try:
-        prediction = model.predict(pool)
-        probability = model.predict_proba(pool)[:, 1] * 100
+        probability = model.predict_proba([row])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {e}")
+    prediction = classes_from_proba(model, probability)
+    probability = probability * 100
     
     if prediction == 1.0:
-        adjustments = [0.8, 0.9, 1.0, 1.1, 1.2]  # 탐색 범위 확장
-        combinations = list(itertools.product(adjustments, repeat=3))
-        rows = []
-        for hp_factor, deposit_factor, seniority_factor in combinations:
-            new_housePrice = housePrice * hp_factor
-            new_depositAmount = depositAmount * deposit_factor
-            new_seniority = seniority * seniority_factor
-
-            if new_housePrice == 0:
-                continue  # division by zero 방지
-            new_initialLTV = (new_seniority + new_depositAmount) / new_housePrice
-            new_loanAmount = new_initialLTV * new_housePrice
-
-            new_features = features_dict.copy()
-            new_features.update({
-                "주택가액": new_housePrice,
-                "임대보증금액": new_depositAmount,
-                "선순위": new_seniority,
-                "초기LTV": new_initialLTV,
-                "대출액": new_loanAmount
-            })
-            rows.append([new_features[col] for col in feature_order])
-
-        new_df = pd.DataFrame(rows, columns=feature_order)
-        new_pool = Pool(new_df, cat_features=categorical_features)
-
-        # 27개 케이스 확률 한 번에 계산
-        probs = model.predict_proba(new_pool)[:, 1] * 100
-
-        # 최소 확률 찾기
-        best_idx = probs.argmin()
-        best_prob = probs[best_idx]
+        # 배수 범위가 0.8 ~ 1.2 라 주택가액이 0 인 후보는 housePrice == 0 일 때뿐이고,
+        # 그때는 모든 후보를 건너뛰어 비교할 대상이 없다 (음수 주택가액은 기존처럼 그대로 탐색)
+        if housePrice == 0:
+            raise HTTPException(status_code=400, detail="주택가액이 0 이면 조정안을 계산할 수 없습니다.")
+
+        def score(factors):
+            # (주택가액, 임대보증금액, 선순위) 배수 후보들의 위험 확률을 한 번에 계산
+            return model.predict_proba(counterfactual_rows(features_dict, factors)) * 100
+
+        try:
+            search = search_factors(score, strategy=strategy, budget=budget)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        hp_factor, deposit_factor, seniority_factor = search.factors
+        best_housePrice = round(housePrice * hp_factor)
+        best_depositAmount = round(depositAmount * deposit_factor)
+        best_seniority = round(seniority * seniority_factor)
+        best_prob = search.probability
 
         best_result = {
             "주택가액": {
-                "isUseful": round(new_df.iloc[best_idx]["주택가액"]) - housePrice != 0,
-                "result": (round(new_df.iloc[best_idx]["주택가액"]) - housePrice) / housePrice * 100,
-                "newResult": round(new_df.iloc[best_idx]["주택가액"])
+                "isUseful": best_housePrice - housePrice != 0,
+                "result": (best_housePrice - housePrice) / housePrice * 100,
+                "newResult": best_housePrice
             },
             "임대보증금액": {
-                "isUseful": round(new_df.iloc[best_idx]["임대보증금액"]) - depositAmount != 0,
-                "result": (round(new_df.iloc[best_idx]["임대보증금액"]) - depositAmount) / depositAmount * 100,
-                "newResult": round(new_df.iloc[best_idx]["임대보증금액"])
+                "isUseful": best_depositAmount - depositAmount != 0,
+                "result": (best_depositAmount - depositAmount) / depositAmount * 100,
+                "newResult": best_depositAmount
             },
             "선순위": {
-                "isUseful": round(new_df.iloc[best_idx]["선순위"]) - seniority != 0,
-                "result": (round(new_df.iloc[best_idx]["선순위"]) - seniority) / seniority * 100,
-                "newResult": round(new_df.iloc[best_idx]["선순위"])
+                "isUseful": best_seniority - seniority != 0,
+                "result": (best_seniority - seniority) / seniority * 100,
+                "newResult": best_seniority
             },
             "probability": round(float(best_prob), 2) ,
-            "isFound": False if best_prob >= probability else True
+            "isFound": False if best_prob >= probability else True,
+            "strategy": search.strategy,
+            "evaluations": search.evaluations
         }
 
-        return {
+        result = {
             "prediction": float(prediction[0]),
             "probability": round(float(probability[0]), 2),
             "recommendation": best_result
         }
     else:
-        return {
+        result = {
             "prediction": float(prediction[0]),
             "probability": round(float(probability[0]), 2)
-        }
\ No newline at end of file
+        }
+
+    better_risk_result_cache.put(cache_key, result, snapshot.cache_version)
+    return result
@@ -0,0 +1,258 @@
+# services/bulk_scoring_service.py
+import argparse
+import csv
+import json
+import sys
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional, TextIO, Tuple
+from fastapi import HTTPException
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from schemas.risk_prediction_schema import RiskRequest
+from services.feature_store import FeatureStore
+from services.risk_prediction_service import predict_risk_batch
+
+try:
+    import resource  # Unix 전용 (peak RSS 측정)
+except ImportError:
+    resource = None
+
+DEFAULT_CHUNK_SIZE = 2000
+MAX_LINE_CHARS = 1 << 20
+# 출력 NDJSON: 매물 결과/오류 레코드는 "index" 를 갖고,
+# 그 밖의 레코드는 "type" 으로 구분한다 ("error": 처리 중단, "summary": 마지막 줄)
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 byte 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def read_lines(text: TextIO, max_chars: int = MAX_LINE_CHARS) -> Iterator[Optional[str]]:
+    # 한 줄씩 읽되 max_chars 보다 긴 줄은 끝까지 버리고 None (메모리 상한)
+    while True:
+        line = text.readline(max_chars + 1)
+        if not line:
+            return
+        if len(line) > max_chars and not line.endswith("\n"):
+            while True:
+                rest = text.readline(max_chars + 1)
+                if not rest or rest.endswith("\n"):
+                    break
+            yield None
+            continue
+        yield line
+
+
+def iter_records(text: TextIO, fmt: str = "ndjson") -> Iterator[Tuple[Optional[Dict], Optional[str]]]:
+    """NDJSON / CSV 텍스트 스트림 → (레코드, 오류) 를 차례로.
+
+    CSV 는 첫 행을 헤더로 쓰고 csv.reader 로 읽으므로 따옴표 안의 줄바꿈도 한 필드로 처리된다
+    (text 는 newline="" 으로 열어야 한다). 빈 줄은 건너뛴다.
+    """
+    if fmt not in ("ndjson", "csv"):
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+
+    if fmt == "ndjson":
+        for line in read_lines(text):
+            if line is None:
+                yield None, "한 줄이 너무 깁니다."
+                continue
+            line = line.strip().lstrip("\ufeff")
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield None, f"줄을 해석할 수 없습니다: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield None, "줄을 해석할 수 없습니다: 각 줄은 JSON 객체여야 합니다."
+                continue
+            yield record, None
+        return
+
+    overflow = False
+
+    def lines() -> Iterator[str]:
+        nonlocal overflow
+        for line in read_lines(text):
+            if line is None:
+                overflow, line = True, "\n"
+            yield line
+
+    reader = csv.reader(lines())
+    header: Optional[List[str]] = None
+    while True:
+        try:
+            values = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield None, f"줄을 해석할 수 없습니다: {e}"
+            continue
+        if overflow:
+            overflow = False
+            yield None, "한 줄이 너무 깁니다."
+            continue
+        if not any(v.strip() for v in values):
+            continue
+        if header is None:
+            header = [v.strip().lstrip("\ufeff") for v in values]
+            continue
+        yield dict(zip(header, values)), None
+
+
+def _error_detail(e: Exception) -> str:
+    return e.detail if isinstance(e, HTTPException) else str(e)
+
+
+class BulkScorer:
+    """레코드를 chunk_size 단위로 모아 predict_risk_batch 로 점수를 매긴다.
+
+    한 번에 메모리에 올라가는 레코드는 chunk 하나 분량뿐이다.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, store: Optional[FeatureStore] = None):
+        self.chunk_size = chunk_size
+        self.store = store
+        self.rows = 0
+        self.scored = 0
+        self.failed = 0
+        self._pending: List[RiskRequest] = []
+        self._positions: List[int] = []
+        self._errors: List[Dict] = []
+        self._started = time.perf_counter()
+
+    def add(self, record: Optional[Dict], error: Optional[str] = None) -> None:
+        index = self.rows
+        self.rows += 1
+        if error is None:
+            try:
+                self._pending.append(RiskRequest(**record))
+                self._positions.append(index)
+                return
+            except ValidationError as e:
+                error = "입력 형식이 올바르지 않습니다: " + ", ".join(
+                    ".".join(str(p) for p in err["loc"]) for err in e.errors()
+                )
+        self._errors.append({"index": index, "error": error})
+
+    @property
+    def is_full(self) -> bool:
+        return len(self._pending) + len(self._errors) >= self.chunk_size
+
+    def _score(self, requests: List[RiskRequest], positions: List[int]) -> List[Dict]:
+        result = predict_risk_batch(requests, store=self.store)
+        out = []
+        for r in result["results"]:
+            r["index"] = positions[r["index"]]
+            out.append(r)
+        for e in result["errors"]:
+            out.append({"index": positions[e["index"]], "error": e["detail"]})
+        return out
+
+    def flush(self) -> List[Dict]:
+        out = self._errors
+        if self._pending:
+            try:
+                out.extend(self._score(self._pending, self._positions))
+            except Exception:
+                # 한 행 때문에 chunk 전체가 실패하면 행 단위로 다시 점수를 매겨 실패한 행만 오류로 남긴다
+                for request, position in zip(self._pending, self._positions):
+                    try:
+                        out.extend(self._score([request], [position]))
+                    except Exception as e:
+                        out.append({"index": position, "error": _error_detail(e)})
+        out.sort(key=lambda r: r["index"])
+        self.failed += sum(1 for r in out if "error" in r)
+        self.scored += sum(1 for r in out if "error" not in r)
+        self._pending, self._positions, self._errors = [], [], []
+        return out
+
+    def summary(self) -> Dict:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "type": "summary",
+            "rows": self.rows,
+            "scored": self.scored,
+            "errors": self.failed,
+            "elapsed_sec": round(elapsed, 3),
+            "rows_per_sec": round(self.rows / elapsed, 1) if elapsed > 0 else None,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+def score_chunks(text: TextIO, fmt: str = "ndjson", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 store: Optional[FeatureStore] = None) -> Iterator[List[Dict]]:
+    # 결과를 chunk 단위 list 로 내보내고 마지막에 [{"type": "summary", ...}]
+    scorer = BulkScorer(chunk_size, store)
+    for record, error in iter_records(text, fmt):
+        scorer.add(record, error)
+        if scorer.is_full:
+            yield scorer.flush()
+    yield scorer.flush()
+    yield [scorer.summary()]
+
+
+def score_lines(text: TextIO, fmt: str = "ndjson", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                store: Optional[FeatureStore] = None) -> Iterator[Dict]:
+    # 동기 버전 (CLI 용)
+    for rows in score_chunks(text, fmt, chunk_size, store):
+        yield from rows
+
+
+async def score_text_stream(text: TextIO, fmt: str = "ndjson",
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """비동기 버전 (API 용): chunk 단위로 NDJSON 바이트를 내보낸다.
+
+    파일 읽기와 모델 추론은 이벤트 루프 밖(스레드풀)에서 한다.
+    응답이 시작된 뒤에는 상태 코드를 바꿀 수 없으므로, 처리 중 오류는
+    {"type": "error", ...} 레코드로 내보내고 끝낸다.
+    """
+    chunks = score_chunks(text, fmt, chunk_size)
+    while True:
+        try:
+            rows = await run_in_threadpool(next, chunks, None)
+        except Exception as e:
+            yield _encode([{"type": "error", "error": _error_detail(e)}])
+            return
+        if rows is None:
+            return
+        yield _encode(rows)
+
+
+def _encode(rows: List[Dict]) -> bytes:
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows).encode("utf-8")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    # python -m services.bulk_scoring_service listings.ndjson -o scores.ndjson
+    ap = argparse.ArgumentParser(description="NDJSON/CSV 매물 파일 일괄 위험도 예측")
+    ap.add_argument("input", help="입력 파일 경로 (- 이면 stdin)")
+    ap.add_argument("-o", "--output", help="출력 NDJSON 경로 (기본: stdout)")
+    ap.add_argument("--format", choices=["ndjson", "csv"], help="입력 형식 (기본: 확장자로 판단)")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = ap.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.endswith(".csv") else "ndjson")
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+    dst = sys.stdout if not args.output else open(args.output, "w", encoding="utf-8")
+    try:
+        for row in score_lines(src, fmt=fmt, chunk_size=args.chunk_size):
+            if row.get("type") == "summary":
+                print(json.dumps(row, ensure_ascii=False), file=sys.stderr)
+                continue
+            dst.write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+
+if __name__ == "__main__":
+    main()
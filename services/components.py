@@ -0,0 +1,142 @@
+# services/components.py
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# 시작 시 백그라운드에서 미리 로드할 컴포넌트 (쉼표 구분, all | none)
+# 기본은 none: 일부 API(퀴즈, 평균 전세가 등)만 받는 워커가 모든 모델을 올리지 않도록 필요한 것만 지정
+WARMUP = os.getenv("APP_WARMUP", "none")
+
+
+class LazyComponent:
+    """무거운 서비스(모델, 외부 클라이언트)를 처음 사용할 때 한 번만 로드한다."""
+
+    def __init__(self, name: str, loader: Callable[[], Any], probe: Optional[Callable[[], bool]] = None,
+                 load_time: Optional[Callable[[], Optional[float]]] = None):
+        self.name = name
+        self.loader = loader
+        self.probe = probe  # get() 을 거치지 않고 로드된 경우를 확인 (예: 서비스가 직접 import)
+        self.load_time = load_time  # get() 을 거치지 않고 로드된 경우의 로드 시간 (초)
+        self.value: Any = None
+        self.loaded = False
+        self.load_sec: Optional[float] = None
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        if self.loaded:
+            return self.value
+        with self._lock:
+            if not self.loaded:
+                start = time.perf_counter()
+                try:
+                    self.value = self.loader()
+                except Exception as e:
+                    self.error = f"{type(e).__name__}: {e}"
+                    raise
+                self.load_sec = time.perf_counter() - start
+                self.loaded = True
+                self.error = None
+                logger.info("component %s loaded in %.1fms", self.name, self.load_sec * 1000)
+        return self.value
+
+    async def aget(self) -> Any:
+        # 이벤트 루프를 막지 않도록 첫 로드는 스레드에서
+        if self.loaded:
+            return self.value
+        return await run_in_threadpool(self.get)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded or bool(self.probe and self.probe())
+
+    def status(self) -> Dict:
+        load_sec = self.load_sec
+        if load_sec is None and self.load_time is not None and self.is_loaded:
+            load_sec = self.load_time()
+        return {
+            "loaded": self.is_loaded,
+            "load_ms": round(load_sec * 1000, 1) if load_sec is not None else None,
+            "error": self.error,
+        }
+
+
+def _load_risk_model():
+    from services.feature_store import get_feature_store
+    return get_feature_store()
+
+
+def _risk_model_ready() -> bool:
+    module = sys.modules.get("services.feature_store")
+    return module is not None and module.feature_store.is_ready
+
+
+def _risk_model_load_sec() -> Optional[float]:
+    # 서비스가 get_feature_store() 로 직접 로드한 경우 feature store 가 잰 아티팩트별 로드 시간의 합
+    timings = sys.modules["services.feature_store"].feature_store.timings
+    return sum(timings.values()) if timings else None
+
+
+def _import(module: str) -> Callable[[], Any]:
+    return lambda: importlib.import_module(module)
+
+
+def _imported(module: str, last_attr: str) -> Callable[[], bool]:
+    # import 가 끝까지 진행됐는지 모듈 마지막에 정의되는 이름으로 확인 (import 중에도 sys.modules 에는 들어있음)
+    return lambda: hasattr(sys.modules.get(module), last_attr)
+
+
+# 위험도 모델 + 시장 데이터 / 의도 분류 인코더 + 임베딩 bank / Google STT + ffmpeg
+risk_model = LazyComponent("risk_model", _load_risk_model, _risk_model_ready, _risk_model_load_sec)
+intent_engine = LazyComponent("intent_encoder", _import("services.intent_service"), _imported("services.intent_service", "route_intent"))
+speech = LazyComponent("speech", _import("services.audio_service"), _imported("services.audio_service", "google_stt_bytes"))
+
+COMPONENTS: Dict[str, LazyComponent] = {c.name: c for c in (risk_model, intent_engine, speech)}
+
+warmup_state = {"requested": [], "done": False}
+
+
+def warmup_targets(spec: str = WARMUP) -> List[str]:
+    spec = spec.strip().lower()
+    if spec in ("", "none", "0"):
+        return []
+    if spec == "all":
+        return list(COMPONENTS)
+    return [name.strip() for name in spec.split(",") if name.strip() in COMPONENTS]
+
+
+def warm_up(names: List[str]) -> None:
+    for name in names:
+        try:
+            COMPONENTS[name].get()
+        except Exception as e:
+            # 실패해도 다른 컴포넌트는 계속 로드 (/ready 에서 오류 확인)
+            logger.warning("warm-up of %s failed: %s", name, e)
+    warmup_state["done"] = True
+
+
+def start_background_warmup(spec: str = WARMUP) -> Optional[threading.Thread]:
+    names = warmup_targets(spec)
+    warmup_state["requested"] = names
+    warmup_state["done"] = not names
+    if not names:
+        return None
+    thread = threading.Thread(target=warm_up, args=(names,), name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def health_report() -> Dict:
+    return {name: c.status() for name, c in COMPONENTS.items()}
+
+
+def is_ready() -> bool:
+    # 워밍업 대상이 모두 로드되어야 ready (워밍업을 끄면 항상 ready, 나머지는 첫 요청 때 로드)
+    return all(COMPONENTS[name].is_loaded for name in warmup_state["requested"])
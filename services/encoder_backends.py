@@ -0,0 +1,211 @@
+# services/encoder_backends.py
+import argparse
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "intfloat/multilingual-e5-small"
+BASE_DIR = Path(__file__).parent.parent
+ONNX_DIR = BASE_DIR / "models" / "e5-small-onnx"
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model.int8.onnx"
+PARITY_FILE = "parity.json"  # benchmarks.bench_encoder_backends 가 라우팅 parity 를 통과하면 기록
+MAX_SEQ_LENGTH = 512
+FINGERPRINT_SAMPLES = 1024  # 가중치 지문에 쓰는 텐서별 (또는 파일) 표본 수
+
+
+class SentenceTransformerEncoder:
+    """sentence-transformers (PyTorch) 로 인코딩하는 기본 백엔드."""
+
+    name = "sentence_transformers"
+
+    def __init__(self, model_name: str, device: str = "cpu", threads: Optional[int] = None):
+        from sentence_transformers import SentenceTransformer
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name, device=device)
+        self.version = f"{model_name}:{self.name}"
+        self.fingerprint = self._weights_fingerprint()
+
+    def _weights_fingerprint(self) -> str:
+        # 이름 / shape / 텐서마다 고르게 뽑은 값으로 만든 가중치 지문 (같은 이름의 다른 checkpoint 구분)
+        h = hashlib.sha256()
+        for name, param in self.model.state_dict().items():
+            flat = param.detach().reshape(-1)
+            h.update(f"{name}:{tuple(param.shape)}:{param.dtype}".encode())
+            h.update(flat[::max(1, flat.numel() // FINGERPRINT_SAMPLES)].float().cpu().numpy().tobytes())
+        return h.hexdigest()[:16]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+
+
+def file_fingerprint(path: Path, chunk: int = 4096) -> str:
+    # 파일 크기 + 고르게 떨어진 FINGERPRINT_SAMPLES 곳의 내용 해시 (큰 모델 파일을 다 읽지 않도록)
+    size = path.stat().st_size
+    h = hashlib.sha256(str(size).encode())
+    with open(path, "rb") as f:
+        for offset in sorted({size * i // FINGERPRINT_SAMPLES for i in range(FINGERPRINT_SAMPLES)}):
+            f.seek(offset)
+            h.update(f.read(chunk))
+    return h.hexdigest()[:16]
+
+
+def _model_stamp(model_file: Path) -> Dict:
+    stat = model_file.stat()
+    return {"file": model_file.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def parity_verified(model_file: Path) -> bool:
+    # 이 모델 파일 그대로 sentence-transformers 와 라우팅 parity 를 통과한 기록이 있는지
+    try:
+        records = json.loads((model_file.parent / PARITY_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return False
+    record = records.get(model_file.name)
+    if not record or record.get("reference") != SentenceTransformerEncoder.name:
+        return False
+    return model_file.exists() and record.get("stamp") == _model_stamp(model_file)
+
+
+def record_parity(model_file: Path, result: Dict) -> None:
+    path = model_file.parent / PARITY_FILE
+    try:
+        records = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        records = {}
+    records[model_file.name] = {"stamp": _model_stamp(model_file), "reference": SentenceTransformerEncoder.name, **result}
+    path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def onnx_model_file(onnx_dir: Path = ONNX_DIR, quantize: bool = False) -> Path:
+    return Path(onnx_dir) / (ONNX_INT8_MODEL_FILE if quantize else ONNX_MODEL_FILE)
+
+
+class OnnxEncoder:
+    """같은 모델을 ONNX 로 export 해서 onnxruntime 으로 인코딩하는 백엔드 (선택 사항, 기본값 아님).
+
+    torch / sentence-transformers 없이 tokenizers + onnxruntime 만 로드하므로 워커 메모리가 작다.
+    sentence-transformers 와 같은 mean pooling + L2 정규화를 적용한다.
+    quantize=True 이면 int8 dynamic quantization 모델(model.int8.onnx)을 사용한다.
+    아티팩트는 `python -m services.encoder_backends export [--quantize]` 로 만든다.
+
+    아직 실제 가중치로 sentence-transformers 와의 parity 를 확인하지 않았다.
+    `python -m benchmarks.bench_encoder_backends` 가 라우팅 결과 일치를 확인하면 onnx_dir/parity.json 에
+    기록하고, 기록이 없거나 모델 파일이 바뀌었으면 로드할 때 경고를 남긴다 (verified=False).
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_name: str, onnx_dir: Path = ONNX_DIR, quantize: bool = False,
+                 threads: Optional[int] = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = onnx_model_file(onnx_dir, quantize)
+        if not model_file.exists():
+            raise RuntimeError(f"ONNX 인코더 파일을 찾을 수 없습니다: {model_file} (python -m services.encoder_backends export)")
+
+        self.tokenizer = Tokenizer.from_file(str(Path(onnx_dir) / "tokenizer.json"))
+        self.tokenizer.enable_truncation(MAX_SEQ_LENGTH)
+        if self.tokenizer.padding is None:
+            pad_token = "<pad>" if self.tokenizer.token_to_id("<pad>") is not None else "[PAD]"
+            self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id(pad_token) or 0, pad_token=pad_token)
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(model_file), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.version = f"{model_name}:{self.name}{':int8' if quantize else ''}"
+        self.fingerprint = file_fingerprint(model_file)
+        self.verified = parity_verified(model_file)
+        if not self.verified:
+            logger.warning("ONNX 인코더 %s 는 sentence-transformers 와의 parity 가 확인되지 않았습니다 "
+                           "(python -m benchmarks.bench_encoder_backends 로 확인).", model_file)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        hidden = self.session.run(None, {k: v for k, v in feeds.items() if k in self.input_names})[0]
+
+        # mean pooling (padding 제외) + L2 정규화
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return (pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)).astype(np.float32)
+
+
+ENCODER_BACKENDS = {
+    SentenceTransformerEncoder.name: SentenceTransformerEncoder,
+    OnnxEncoder.name: OnnxEncoder,
+}
+
+
+def load_encoder(name: str, model_name: str, device: str = "cpu"):
+    # 환경 변수: INTENT_ENCODER_THREADS (스레드 수), INTENT_ONNX_DIR, INTENT_ONNX_QUANTIZE=1 (int8)
+    threads = int(os.getenv("INTENT_ENCODER_THREADS", "0")) or None
+    if name == SentenceTransformerEncoder.name:
+        return SentenceTransformerEncoder(model_name, device=device, threads=threads)
+    if name == OnnxEncoder.name:
+        return OnnxEncoder(
+            model_name,
+            onnx_dir=Path(os.getenv("INTENT_ONNX_DIR", str(ONNX_DIR))),
+            quantize=os.getenv("INTENT_ONNX_QUANTIZE", "0") == "1",
+            threads=threads,
+        )
+    raise RuntimeError(f"알 수 없는 인코더 백엔드입니다: {name} (가능: {', '.join(ENCODER_BACKENDS)})")
+
+
+def export_onnx(model_name: str, out_dir: Path = ONNX_DIR, quantize: bool = False) -> None:
+    # transformer 본체만 ONNX 로 export (pooling/정규화는 OnnxEncoder 에서 numpy 로 처리)
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    tokenizer.save_pretrained(out_dir)  # tokenizer.json 포함
+    model = AutoModel.from_pretrained(model_name).eval()
+
+    sample = tokenizer(["query: 샘플 문장"], return_tensors="pt")
+    input_names = [k for k in ("input_ids", "attention_mask", "token_type_ids") if k in sample]
+    dynamic_axes = {k: {0: "batch", 1: "sequence"} for k in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            model, tuple(sample[k] for k in input_names), str(out_dir / ONNX_MODEL_FILE),
+            input_names=input_names, output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes, opset_version=14,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(str(out_dir / ONNX_MODEL_FILE), str(out_dir / ONNX_INT8_MODEL_FILE), weight_type=QuantType.QInt8)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    # python -m services.encoder_backends export [--quantize] [--out models/e5-small-onnx]
+    ap = argparse.ArgumentParser(description="의도 분류 인코더 ONNX export")
+    ap.add_argument("command", choices=["export"])
+    ap.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    ap.add_argument("--out", default=str(ONNX_DIR))
+    ap.add_argument("--quantize", action="store_true", help="int8 dynamic quantization 모델도 생성")
+    args = ap.parse_args(argv)
+    export_onnx(args.model, Path(args.out), quantize=args.quantize)
+    print(f"exported to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+# services/executors.py
+import os
+from utils.bounded_executor import BoundedExecutor
+
+# ffmpeg 변환 + Google STT 호출 (대부분 subprocess / 네트워크 대기)
+audio_executor = BoundedExecutor(
+    "audio",
+    max_workers=int(os.getenv("AUDIO_WORKERS", "4")),
+    max_queue=int(os.getenv("AUDIO_MAX_QUEUE", "16")),
+)
+
+# 의도 분류 인코딩 (CPU 작업이고 인코더가 내부에서 여러 스레드를 쓰므로 작게 유지)
+embedding_executor = BoundedExecutor(
+    "embedding",
+    max_workers=int(os.getenv("EMBEDDING_WORKERS", "2")),
+    max_queue=int(os.getenv("EMBEDDING_MAX_QUEUE", "32")),
+)
+
+# WebSocket 스트리밍 인식 연결 수 (연결마다 ffmpeg 프로세스 + 인식 스트림을 잡고 있으므로 admit() 으로만 센다)
+stream_executor = BoundedExecutor(
+    "stream",
+    max_workers=int(os.getenv("STT_STREAM_MAX_SESSIONS", "8")),
+    max_queue=0,
+)
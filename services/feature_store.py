@@ -0,0 +1,254 @@
+# services/feature_store.py
+import hashlib
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import pandas as pd
+from utils.market_data import (
+    MarketDataIndex, MonthTable, JEONSE_KEY_COLUMNS, UNSOLD_KEY_COLUMNS,
+    BASE_RATE_MONTH_COLUMN, BASE_RATE_VALUE_COLUMN,
+)
+from utils.dataset_cache import cached_month_table
+from services.model_backends import load_backend
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+MODEL_PATH = BASE_DIR / "models" / "catboost_0822.cbm"
+JEONSE_PATH = BASE_DIR / "data" / "dataset_Jeonse_rate.xlsx"
+UNSOLD_PATH = BASE_DIR / "data" / "dataset_unsold.xlsx"
+BASE_RATE_PATH = BASE_DIR / "data" / "dataset_base_interest_rate.xlsx"
+
+# 예측 백엔드 선택: catboost (기본) | cmodel (standalone C 평가 라이브러리, services/model_backends.py 참고)
+MODEL_BACKEND = os.getenv("RISK_MODEL_BACKEND", "catboost")
+# 0 보다 크면 get_feature_store() 가 이 간격(초)마다 모델/데이터 파일 변경을 확인해 다시 로드
+RELOAD_CHECK_SEC = float(os.getenv("FEATURE_STORE_RELOAD_CHECK_SEC", "0"))
+
+
+def load_jeonse_df(path: Path) -> pd.DataFrame:
+    # 데이터 로드 (전세가율 xlsx)
+    try:
+        jeonse_df = pd.read_excel(path, engine="openpyxl", header=1)  # header=1 추가: row2를 헤더로
+    except FileNotFoundError:
+        raise RuntimeError(f"전세가율 데이터 파일을 찾을 수 없습니다: {path}")
+    new_columns = []
+    for col in jeonse_df.columns:
+        if isinstance(col, (float, int)):
+            year = math.floor(col)
+            month_str = str(round((col - year) * 100))
+            if len(month_str) == 1:
+                month_str = '0' + month_str
+            new_columns.append(f"{year:d}.{month_str}")
+        else:
+            new_columns.append(str(col))
+    jeonse_df.columns = new_columns
+    return jeonse_df
+
+
+def load_unsold_df(path: Path) -> pd.DataFrame:
+    # 데이터 로드 (미분양현황 xlsx)
+    try:
+        return pd.read_excel(path, engine="openpyxl", header=0)  # 첫 줄이 header
+    except FileNotFoundError:
+        raise RuntimeError(f"지역별 미판매 데이터 파일을 찾을 수 없습니다: {path}")
+
+
+def load_base_rate_df(path: Path) -> pd.DataFrame:
+    # 데이터 로드 (기준금리 xlsx)
+    try:
+        return pd.read_excel(path, engine="openpyxl", header=0)
+    except FileNotFoundError:
+        raise RuntimeError(f"기준금리 파일을 찾을 수 없습니다: {path}")
+
+
+def build_jeonse_table(path: Path) -> MonthTable:
+    return MonthTable.from_wide_frame(load_jeonse_df(path), JEONSE_KEY_COLUMNS)
+
+
+def build_unsold_table(path: Path) -> MonthTable:
+    return MonthTable.from_wide_frame(load_unsold_df(path), UNSOLD_KEY_COLUMNS)
+
+
+def build_base_rate_table(path: Path) -> MonthTable:
+    return MonthTable.from_long_frame(load_base_rate_df(path), BASE_RATE_MONTH_COLUMN, BASE_RATE_VALUE_COLUMN)
+
+
+def load_market_index(
+    jeonse_path: Path = JEONSE_PATH,
+    unsold_path: Path = UNSOLD_PATH,
+    base_rate_path: Path = BASE_RATE_PATH,
+) -> MarketDataIndex:
+    return MarketDataIndex(
+        cached_month_table(jeonse_path, build_jeonse_table),
+        cached_month_table(unsold_path, build_unsold_table),
+        cached_month_table(base_rate_path, build_base_rate_table),
+    )
+
+
+def artifact_version(backend: str, *paths: Path) -> str:
+    # 백엔드 + 파일 경로/수정시각/크기로 만든 버전 문자열 (결과 캐시 키에 사용)
+    parts = [backend]
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+
+# 로드 순번 (모든 FeatureStore 공통, 클수록 나중에 로드한 것)
+_load_generation = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class StoreSnapshot:
+    """한 번에 로드한 모델/데이터 묶음.
+
+    reload 는 이 객체를 통째로 바꾸므로, 요청 처음에 snapshot() 을 한 번 받아 쓰면
+    계산 도중에 reload 가 끝나도 모델/데이터/버전이 섞이지 않는다.
+    """
+    model: Any  # services.model_backends 의 백엔드 (predict_proba, probability_threshold)
+    market_index: MarketDataIndex
+    version: str  # 모델/데이터 파일 버전
+    generation: int
+
+    @property
+    def cache_version(self) -> Tuple[int, str]:
+        # 결과 캐시 버전: 로드 순번으로 신구를 비교 (ResultCache 는 현재보다 오래된 버전을 무시)
+        return self.generation, self.version
+
+
+class FeatureStore:
+    """CatBoost 모델과 시장 데이터를 프로세스당 한 번만 로드해 위험도 서비스들이 공유한다."""
+
+    def __init__(
+        self,
+        model_path: Path = MODEL_PATH,
+        jeonse_path: Path = JEONSE_PATH,
+        unsold_path: Path = UNSOLD_PATH,
+        base_rate_path: Path = BASE_RATE_PATH,
+        backend: str = MODEL_BACKEND,
+    ):
+        self.backend = backend
+        self.model_path = model_path
+        self.jeonse_path = jeonse_path
+        self.unsold_path = unsold_path
+        self.base_rate_path = base_rate_path
+
+        self._snapshot: Optional[StoreSnapshot] = None
+        self.reloads = 0
+
+        self.timings: Dict[str, float] = {}  # 아티팩트별 로드 시간 (초)
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._snapshot is not None
+
+    def snapshot(self) -> StoreSnapshot:
+        # 현재 모델/데이터/버전 (한 요청 안에서는 이 값 하나만 사용)
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise RuntimeError("feature store 가 아직 로드되지 않았습니다.")
+        return snapshot
+
+    @property
+    def model(self):
+        return self._snapshot.model if self._snapshot else None
+
+    @property
+    def market_index(self) -> Optional[MarketDataIndex]:
+        return self._snapshot.market_index if self._snapshot else None
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._snapshot.version if self._snapshot else None
+
+    def _timed(self, name: str, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        self.timings[name] = time.perf_counter() - start
+        return result
+
+    def current_version(self) -> str:
+        return artifact_version(self.backend, self.model_path, self.jeonse_path, self.unsold_path, self.base_rate_path)
+
+    def _load_artifacts(self) -> None:
+        self.timings = {}
+        version = self.current_version()
+        model = self._timed("model", load_backend, self.backend, self.model_path)
+        # xlsx 파싱 대신 data/.cache 의 .npy 캐시를 memory-map (원본이 바뀌었으면 다시 생성)
+        jeonse = self._timed("jeonse", cached_month_table, self.jeonse_path, build_jeonse_table)
+        unsold = self._timed("unsold", cached_month_table, self.unsold_path, build_unsold_table)
+        base_rate = self._timed("base_rate", cached_month_table, self.base_rate_path, build_base_rate_table)
+        # 새 아티팩트가 모두 준비된 뒤 snapshot 을 한 번에 교체 (진행 중인 요청은 이전 snapshot 으로 끝난다)
+        self._snapshot = StoreSnapshot(model, MarketDataIndex(jeonse, unsold, base_rate), version, next(_load_generation))
+        self._checked_at = time.monotonic()
+        logger.info("feature store loaded: %s", self.timing_report())
+
+    def load(self) -> "FeatureStore":
+        if self.is_ready:
+            return self
+        with self._lock:
+            if self.is_ready:
+                return self
+            self._load_artifacts()
+        return self
+
+    def reload(self) -> "FeatureStore":
+        # 모델/데이터를 다시 로드 (version 이 바뀌면 결과 캐시가 자동으로 비워진다)
+        with self._lock:
+            self._load_artifacts()
+            self.reloads += 1
+        return self
+
+    def reload_if_changed(self, interval: float = RELOAD_CHECK_SEC) -> "FeatureStore":
+        if interval <= 0 or not self.is_ready or time.monotonic() - self._checked_at < interval:
+            return self
+        self._checked_at = time.monotonic()
+        if self.current_version() != self.version:
+            self.reload()
+        return self
+
+    def timing_report(self) -> Dict:
+        return {
+            "ready": self.is_ready,
+            "backend": self.backend,
+            "version": self.version,
+            "generation": self._snapshot.generation if self._snapshot else None,
+            "reloads": self.reloads,
+            "timings_ms": {name: round(sec * 1000, 1) for name, sec in self.timings.items()},
+            "total_ms": round(sum(self.timings.values()) * 1000, 1),
+        }
+
+
+# 프로세스 전역 인스턴스
+feature_store = FeatureStore()
+
+
+def get_feature_store() -> FeatureStore:
+    return feature_store.load().reload_if_changed()
+
+
+def build_dataset_caches() -> None:
+    # 배포/이미지 빌드 단계에서 미리 캐시를 만들어 둔다: python -m services.feature_store
+    for path, build in [
+        (JEONSE_PATH, build_jeonse_table),
+        (UNSOLD_PATH, build_unsold_table),
+        (BASE_RATE_PATH, build_base_rate_table),
+    ]:
+        start = time.perf_counter()
+        cached_month_table(path, build)
+        print(f"{path.name}: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    build_dataset_caches()
@@ -0,0 +1,144 @@
+# services/intent_batcher.py
+import asyncio
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from services.executors import embedding_executor
+
+MAX_BATCH_SIZE = int(os.getenv("INTENT_BATCH_MAX_SIZE", "32"))
+MAX_WAIT_MS = float(os.getenv("INTENT_BATCH_MAX_WAIT_MS", "5"))
+MAX_QUEUE = int(os.getenv("INTENT_BATCH_MAX_QUEUE", "256"))
+
+RouteFn = Callable[[List[str]], List[Dict]]
+
+
+def _default_route_fn(texts: List[str]) -> List[Dict]:
+    # 인코더 로드는 첫 요청 때 (이 모듈 import 만으로 모델을 올리지 않도록)
+    from services.components import intent_engine
+    return intent_engine.get().route_intents(texts)
+
+
+class IntentMicroBatcher:
+    """동시에 들어온 route_intent 요청을 잠깐(max_wait_ms) 모아 한 번의 배치 인코딩으로 처리한다.
+
+    배치가 차거나(max_batch_size) 대기 시간이 지나면 바로 실행하고, 인코딩 중에 들어온 요청은 다음 배치로 모인다.
+    """
+
+    def __init__(self, route_fn: RouteFn = _default_route_fn,
+                 max_batch_size: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS,
+                 max_queue: int = MAX_QUEUE):
+        self.route_fn = route_fn
+        self.max_queue = max_queue
+        self.rejected = 0
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.wait_sec_total = 0.0
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def route(self, text: str) -> Dict:
+        # 잘못된 입력이 같은 배치의 다른 요청까지 실패시키지 않도록 큐에 넣기 전에 거른다
+        if not isinstance(text, str):
+            raise HTTPException(status_code=422, detail="text 는 문자열이어야 합니다.")
+        self._ensure_worker()
+        if self._queue.qsize() >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                                headers={"Retry-After": "1"})
+        future = self._loop.create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future, float]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            try:
+                if timeout <= 0:
+                    batch.append(self._queue.get_nowait())  # 이미 쌓인 요청은 기다리지 않고 포함
+                else:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            # 클라이언트가 끊겨 취소된 요청은 인코딩하지 않는다
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+            started = time.perf_counter()
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.wait_sec_total += sum(started - queued_at for _, _, queued_at in batch)
+            try:
+                results = await embedding_executor.run(self.route_fn, [text for text, _, _ in batch])
+            except HTTPException as e:
+                # 실행기 포화 등 요청과 상관없는 오류는 배치 전체에
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            except Exception:
+                # 배치가 실패하면 하나씩 다시 처리해서 실패한 요청에만 예외를 돌려준다
+                await self._route_each(batch)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def _route_each(self, batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        for text, future, _ in batch:
+            if future.done():
+                continue
+            try:
+                result = (await embedding_executor.run(self.route_fn, [text]))[0]
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    def stats(self) -> Dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else None,
+            "largest_batch": self.largest_batch,
+            "mean_wait_ms": round(self.wait_sec_total / self.items * 1000, 2) if self.items else None,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+        }
+
+
+# 프로세스 전역 인스턴스 (/text-search, /audio/speech-to-text 공용)
+intent_batcher = IntentMicroBatcher()
@@ -0,0 +1,130 @@
+# services/intent_index.py
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BANK_VERSION = 1
+BANK_DIR = Path(os.getenv("INTENT_BANK_DIR", str(Path(__file__).parent.parent / "data" / ".cache" / "intent_bank")))
+
+
+class IntentIndex:
+    """기능별 예시/설명 임베딩을 하나의 연속 행렬로 묶은 인덱스.
+
+    행 배치: [기능0 예시들, 기능1 예시들, ..., 기능0 설명, 기능1 설명, ...]
+    offsets[i]:offsets[i+1] 가 기능 i 의 예시 구간이고, 설명은 desc_start + i 행이다.
+    질의 임베딩과 한 번의 행렬곱으로 모든 유사도를 구한다.
+    """
+
+    def __init__(self, func_names: List[str], matrix: np.ndarray, offsets: np.ndarray):
+        self.func_names = list(func_names)
+        self.matrix = matrix  # (예시 수 + 기능 수, d) float32, 캐시에서 읽으면 memory-map
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.desc_start = int(self.offsets[-1])
+        self.sizes = np.diff(self.offsets)
+
+        # 기능별 예시 행 번호를 (기능 수, 최대 예시 수) 로 패딩 (빈 칸은 -inf 열을 가리킨다)
+        pad_col = self.matrix.shape[0]
+        self._segment_idx = np.full((len(self.func_names), int(self.sizes.max(initial=1))), pad_col, dtype=np.int64)
+        for i, (start, size) in enumerate(zip(self.offsets[:-1], self.sizes)):
+            self._segment_idx[i, :size] = np.arange(start, start + size)
+
+    @classmethod
+    def from_banks(cls, func_names: List[str], example_bank: Dict[str, np.ndarray],
+                   desc_embs: Dict[str, np.ndarray]) -> "IntentIndex":
+        sizes = [len(example_bank[f]) for f in func_names]
+        matrix = np.ascontiguousarray(np.vstack(
+            [example_bank[f] for f in func_names] + [np.stack([desc_embs[f] for f in func_names])]
+        ), dtype=np.float32)
+        return cls(func_names, matrix, np.concatenate([[0], np.cumsum(sizes)]))
+
+    def example_bank(self) -> Dict[str, np.ndarray]:
+        return {f: self.matrix[self.offsets[i]:self.offsets[i + 1]] for i, f in enumerate(self.func_names)}
+
+    def desc_embs(self) -> Dict[str, np.ndarray]:
+        return {f: self.matrix[self.desc_start + i] for i, f in enumerate(self.func_names)}
+
+    def similarities(self, queries: np.ndarray):
+        # queries (Q, d) → (예시 유사도 (Q, F, 최대 예시 수, 빈 칸 -inf), 설명 유사도 (Q, F))
+        sims = np.atleast_2d(queries).astype(np.float32, copy=False) @ self.matrix.T
+        padded = np.concatenate([sims, np.full((len(sims), 1), -np.inf, dtype=sims.dtype)], axis=1)
+        return padded[:, self._segment_idx], sims[:, self.desc_start:]
+
+    def knn_scores(self, example_sims: np.ndarray, top_k: int) -> np.ndarray:
+        # 기능별 상위 top_k 예시 유사도 평균 (예시가 top_k 보다 적으면 전체 평균)
+        if top_k <= 0:
+            top_k = example_sims.shape[-1]
+        k = min(top_k, example_sims.shape[-1])
+        top = -np.partition(-example_sims, k - 1, axis=-1)[..., :k]
+        counts = np.minimum(self.sizes, top_k)
+        return np.where(np.isfinite(top), top, 0.0).sum(axis=-1, dtype=np.float64) / counts
+
+    def scores(self, queries: np.ndarray, boosts: np.ndarray, top_k: int = 3,
+               knn_weight: float = 0.7, desc_weight: float = 0.25) -> np.ndarray:
+        # 최종 점수 (Q, F) = 예시 kNN * 0.7 + 설명 유사도 * 0.25 + 키워드 가중치
+        example_sims, desc_sims = self.similarities(queries)
+        return knn_weight * self.knn_scores(example_sims, top_k) + desc_weight * desc_sims.astype(np.float64) + boosts
+
+
+def bank_key(model_version: str, func_names: List[str], examples: Dict[str, List[str]],
+             descriptions: Dict[str, str]) -> str:
+    # 모델(이름 + 백엔드 + 가중치 지문) + 기능 순서 + 예시/설명 문장이 같으면 같은 키 (하나라도 바뀌면 다시 계산)
+    # sort_keys 는 dict 순서를 지우므로 열 순서를 정하는 func_names 는 리스트로 따로 넣는다
+    payload = json.dumps({"model": model_version, "func_names": list(func_names), "examples": examples,
+                          "descriptions": descriptions}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def save_intent_index(index: IntentIndex, bank_dir: Path, meta: Dict) -> None:
+    # 임시 디렉터리에 쓴 뒤 교체해서 다른 워커가 반쯤 쓰인 파일을 읽지 않도록 한다
+    tmp_dir = bank_dir.with_name(bank_dir.name + f".tmp{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    try:
+        np.save(tmp_dir / "matrix.npy", np.ascontiguousarray(index.matrix, dtype=np.float32), allow_pickle=False)
+        np.save(tmp_dir / "offsets.npy", index.offsets, allow_pickle=False)
+        with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({"version": BANK_VERSION, "func_names": index.func_names, **meta}, f, ensure_ascii=False)
+        shutil.rmtree(bank_dir, ignore_errors=True)
+        os.replace(tmp_dir, bank_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def load_intent_index(bank_dir: Path, func_names: Optional[List[str]] = None) -> IntentIndex:
+    # func_names 를 주면 저장된 열(기능) 순서가 같은지 확인
+    with open(bank_dir / "meta.json", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != BANK_VERSION:
+        raise ValueError(f"지원하지 않는 bank 버전입니다: {meta.get('version')}")
+    if func_names is not None and meta.get("func_names") != list(func_names):
+        raise ValueError(f"bank 의 기능 목록이 다릅니다: {meta.get('func_names')}")
+    matrix = np.load(bank_dir / "matrix.npy", mmap_mode="r")
+    offsets = np.load(bank_dir / "offsets.npy")
+    return IntentIndex(meta["func_names"], matrix, offsets)
+
+
+def cached_intent_index(model_version: str, func_names: List[str], examples: Dict[str, List[str]],
+                        descriptions: Dict[str, str], build: Callable[[], IntentIndex],
+                        root: Path = BANK_DIR) -> IntentIndex:
+    """data/.cache/intent_bank/<키>/ 의 임베딩 bank 를 memory-map 하고, 없으면 build() 로 계산해서 저장한다."""
+    key = bank_key(model_version, func_names, examples, descriptions)
+    bank_dir = root / key
+    if (bank_dir / "meta.json").exists():
+        try:
+            return load_intent_index(bank_dir, func_names)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("intent bank unreadable, rebuilding %s: %s", bank_dir, e)
+
+    index = build()
+    try:
+        save_intent_index(index, bank_dir, {"model": model_version, "key": key})
+    except OSError as e:
+        logger.warning("intent bank not written to %s: %s", bank_dir, e)
+    return index
@@ -1,20 +1,39 @@
 # services/intent_service.py
+import os
 from typing import Dict, List, Optional, Union  # Union 추가
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from services.encoder_backends import load_encoder
+from services.intent_index import IntentIndex, cached_intent_index
+from utils.embedding_cache import EmbeddingCache
 
 # 모델 및 리소스
 DEVICE = "cpu"  # GPU 사용 시 "cuda:0"
 MODEL_NAME = "intfloat/multilingual-e5-small"
-model = SentenceTransformer(MODEL_NAME, device=DEVICE)
+# 인코더 백엔드: sentence_transformers (기본) | onnx (선택, parity 미확인 시 경고 — services/encoder_backends.py 참고)
+ENCODER_BACKEND = os.getenv("INTENT_ENCODER_BACKEND", "sentence_transformers")
+model = load_encoder(ENCODER_BACKEND, MODEL_NAME, device=DEVICE)
+# 이름이 같아도 가중치가 다르면 (다른 checkpoint / export) 저장된 bank 와 임베딩 캐시를 재사용하지 않도록 가중치 지문 포함
+ENCODER_ID = f"{model.version}@{model.fingerprint}"
 
-def embed_queries(texts: List[str]) -> np.ndarray:
+# 반복되는 짧은 질의("퀴즈", "체크리스트" 등)는 인코딩 없이 캐시에서 반환
+# QUERY_EMBED_CACHE_SIZE=0 이면 사용 안 함, QUERY_EMBED_CACHE_PATH 를 주면 float16 으로 디스크에 유지
+query_cache = EmbeddingCache(
+    "query_embedding",
+    ENCODER_ID,  # 백엔드/양자화/가중치가 다르면 저장된 임베딩을 재사용하지 않음
+    max_entries=int(os.getenv("QUERY_EMBED_CACHE_SIZE", "10000")),
+    path=os.getenv("QUERY_EMBED_CACHE_PATH") or None,
+)
+
+def _encode_queries(texts: List[str]) -> np.ndarray:
     texts = [f"query: {t.strip()}" for t in texts]
-    return model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    return model.encode(texts)
+
+def embed_queries(texts: List[str]) -> np.ndarray:
+    return query_cache.embed(texts, _encode_queries)
 
 def embed_passages(texts: List[str]) -> np.ndarray:
     texts = [f"passage: {t.strip()}" for t in texts]
-    return model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    return model.encode(texts)
 
 FUNCTION_EXAMPLES: Dict[str, List[str]] = {
     "check_registry": [
@@ -52,9 +71,17 @@ KEYWORD_PRIORS: Dict[str, List[str]] = {
 
 FUNC_NAMES = list(FUNCTION_EXAMPLES.keys())
 
-# 임베딩 사전 계산
-example_bank = {f: embed_passages(FUNCTION_EXAMPLES[f]) for f in FUNC_NAMES}
-desc_embs = {f: embed_passages([FUNCTION_DESCRIPTIONS[f]])[0] for f in FUNC_NAMES}
+def build_intent_index() -> IntentIndex:
+    # 임베딩 사전 계산: 예시 + 설명 임베딩을 하나의 행렬로 묶어 질의당 행렬곱 한 번으로 점수 계산
+    example_bank = {f: embed_passages(FUNCTION_EXAMPLES[f]) for f in FUNC_NAMES}
+    desc_embs = {f: embed_passages([FUNCTION_DESCRIPTIONS[f]])[0] for f in FUNC_NAMES}
+    return IntentIndex.from_banks(FUNC_NAMES, example_bank, desc_embs)
+
+# 모델/예시 문장이 그대로면 data/.cache/intent_bank 의 .npy 를 memory-map (바뀌었을 때만 다시 인코딩)
+intent_index = cached_intent_index(ENCODER_ID, FUNC_NAMES, FUNCTION_EXAMPLES, FUNCTION_DESCRIPTIONS,
+                                   build_intent_index)
+example_bank = intent_index.example_bank()
+desc_embs = intent_index.desc_embs()
 
 def prior_boost(utterance: str) -> Dict[str, float]:
     u = utterance.replace(" ", "")
@@ -65,35 +92,30 @@ def prior_boost(utterance: str) -> Dict[str, float]:
                 boosts[f] += 0.03
     return boosts
 
+def prior_boost_vector(utterance: str) -> np.ndarray:
+    # intent_index 열(func_names) 순서의 키워드 가중치 벡터
+    boosts = prior_boost(utterance)
+    return np.array([boosts[f] for f in intent_index.func_names])
+
 def cosine(a: np.ndarray, b: np.ndarray) -> float:
     return float(np.dot(a, b))  # 이미 정규화됨
 
 def rank_functions(user_text: str, top_k: int = 3) -> Dict[str, float]:
-    q = embed_queries([user_text])[0]
-    sims_knn = {}
-    for f in FUNC_NAMES:
-        sims = example_bank[f] @ q
-        topk = np.sort(sims)[-top_k:]
-        sims_knn[f] = float(topk.mean())
-    sims_desc = {f: cosine(q, desc_embs[f]) for f in FUNC_NAMES}
-    boosts = prior_boost(user_text)
-    final_scores = {f: sims_knn[f]*0.7 + sims_desc[f]*0.25 + boosts[f]*1.0 for f in FUNC_NAMES}
-    return final_scores
+    q = embed_queries([user_text])
+    final = intent_index.scores(q, prior_boost_vector(user_text), top_k=top_k)[0]
+    return dict(zip(intent_index.func_names, final.tolist()))
 
-def route_intent(user_text: str,
-                 sim_threshold: float = 0.55,
-                 margin: float = 0.05,
-                 top_k: int = 3) -> Dict[str, Optional[Union[str, float, bool, Dict]]]:
-    if not user_text.strip():
-        return {
-            "text": user_text,
-            "matched": False,
-            "function": None,
-            "best_score": 0.0,
-            "second_best": 0.0,
-            "scores": {}
-        }
-    scores = rank_functions(user_text, top_k=top_k)
+def _empty_route(user_text: str) -> Dict:
+    return {
+        "text": user_text,
+        "matched": False,
+        "function": None,
+        "best_score": 0.0,
+        "second_best": 0.0,
+        "scores": {}
+    }
+
+def _route_from_scores(user_text: str, scores: Dict[str, float], sim_threshold: float, margin: float) -> Dict:
     ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
     best_func, best_score = ranked[0]
     second_func, second_score = ranked[1] if len(ranked) > 1 else (None, -1.0)
@@ -106,4 +128,29 @@ def route_intent(user_text: str,
         "best_score": best_func,      # 숫자가 아닌 이름
         "second_best": second_func,    # 숫자가 아닌 이름
         "scores": dict(ranked)
-    }
\ No newline at end of file
+    }
+
+def route_intents(user_texts: List[str],
+                  sim_threshold: float = 0.55,
+                  margin: float = 0.05,
+                  top_k: int = 3) -> List[Dict[str, Optional[Union[str, float, bool, Dict]]]]:
+    # 여러 문장을 embed_queries 한 번(배치 인코딩)으로 라우팅
+    results: List[Optional[Dict]] = [None] * len(user_texts)
+    idx = [i for i, t in enumerate(user_texts) if t.strip()]
+    if idx:
+        q = embed_queries([user_texts[i] for i in idx])
+        boosts = np.stack([prior_boost_vector(user_texts[i]) for i in idx])
+        scores = intent_index.scores(q, boosts, top_k=top_k)
+        for i, row in zip(idx, scores):
+            results[i] = _route_from_scores(user_texts[i], dict(zip(intent_index.func_names, row.tolist())), sim_threshold, margin)
+    return [r if r is not None else _empty_route(t) for r, t in zip(results, user_texts)]
+
+def route_intent(user_text: str,
+                 sim_threshold: float = 0.55,
+                 margin: float = 0.05,
+                 top_k: int = 3) -> Dict[str, Optional[Union[str, float, bool, Dict]]]:
+    return route_intents([user_text], sim_threshold=sim_threshold, margin=margin, top_k=top_k)[0]
+
+if __name__ == "__main__":
+    # 배포/이미지 빌드 단계에서 미리 bank 를 만들어 둔다: python -m services.intent_service
+    print(f"intent bank: {len(FUNC_NAMES)} functions, {intent_index.matrix.shape[0]} rows ({ENCODER_ID})")
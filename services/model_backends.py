@@ -0,0 +1,137 @@
+# services/model_backends.py
+import ctypes
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+import numpy as np
+import pandas as pd
+from services.risk_features import FEATURE_ORDER, CATEGORICAL_FEATURE_INDICES
+
+FLOAT_FEATURE_INDICES = [i for i in range(len(FEATURE_ORDER)) if i not in CATEGORICAL_FEATURE_INDICES]
+
+Rows = Union[List[list], pd.DataFrame]
+
+
+def _as_object_table(rows: Rows) -> np.ndarray:
+    if isinstance(rows, pd.DataFrame):
+        return rows[FEATURE_ORDER].to_numpy(dtype=object)
+    return np.asarray(rows, dtype=object).reshape(len(rows), len(FEATURE_ORDER))
+
+
+class CatBoostBackend:
+    """CatBoostClassifier (.cbm) 로 예측하는 기본 백엔드."""
+
+    name = "catboost"
+
+    def __init__(self, model_path: Path):
+        from catboost import CatBoostClassifier
+        self.model = CatBoostClassifier()
+        self.model.load_model(model_path)
+        threshold = self.model.get_probability_threshold() if hasattr(self.model, "get_probability_threshold") else None
+        self.probability_threshold = 0.5 if threshold is None else float(threshold)
+
+    def predict_proba(self, rows: Rows) -> np.ndarray:
+        # 양성 클래스 확률 (FEATURE_ORDER 순서의 행 리스트 또는 DataFrame)
+        from catboost import Pool
+        pool = Pool(rows, cat_features=CATEGORICAL_FEATURE_INDICES)
+        return self.model.predict_proba(pool)[:, 1]
+
+
+class CModelBackend:
+    """CatBoost standalone C 평가 라이브러리(libcatboostmodel)를 ctypes 로 호출하는 백엔드.
+
+    catboost 파이썬 패키지 없이 같은 .cbm 을 같은 C++ 코드로 평가하므로 결과가 동일하고,
+    워커 cold start 와 상주 메모리가 작다. 라이브러리 경로는 CATBOOST_MODEL_LIB 환경 변수로 지정한다.
+    분류 임계값은 catboost 백엔드와 같이 모델 메타데이터(binclass_probability_threshold, 없으면 0.5)에서 읽는다.
+    배포 전에 benchmarks.bench_model_backends 로 catboost 백엔드와의 parity 를 확인한다.
+    """
+
+    name = "cmodel"
+
+    def __init__(self, model_path: Path):
+        lib = ctypes.CDLL(os.getenv("CATBOOST_MODEL_LIB", "libcatboostmodel.so"))
+        lib.ModelCalcerCreate.restype = ctypes.c_void_p
+        lib.ModelCalcerDelete.argtypes = [ctypes.c_void_p]
+        lib.GetErrorString.restype = ctypes.c_char_p
+        lib.LoadFullModelFromFile.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        lib.LoadFullModelFromFile.restype = ctypes.c_bool
+        lib.GetFloatFeaturesCount.argtypes = [ctypes.c_void_p]
+        lib.GetFloatFeaturesCount.restype = ctypes.c_size_t
+        lib.GetCatFeaturesCount.argtypes = [ctypes.c_void_p]
+        lib.GetCatFeaturesCount.restype = ctypes.c_size_t
+        lib.CalcModelPrediction.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t,
+            ctypes.POINTER(ctypes.POINTER(ctypes.c_float)), ctypes.c_size_t,
+            ctypes.POINTER(ctypes.POINTER(ctypes.c_char_p)), ctypes.c_size_t,
+            ctypes.POINTER(ctypes.c_double), ctypes.c_size_t,
+        ]
+        lib.CalcModelPrediction.restype = ctypes.c_bool
+        lib.CheckModelMetadataHasKey.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t]
+        lib.CheckModelMetadataHasKey.restype = ctypes.c_bool
+        lib.GetModelInfoValueSize.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t]
+        lib.GetModelInfoValueSize.restype = ctypes.c_size_t
+        lib.GetModelInfoValue.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t]
+        lib.GetModelInfoValue.restype = ctypes.c_void_p
+        self._lib = lib
+
+        self._handle = lib.ModelCalcerCreate()
+        if not lib.LoadFullModelFromFile(self._handle, str(model_path).encode()):
+            raise RuntimeError(f"모델 로드 실패: {lib.GetErrorString().decode(errors='ignore')}")
+        float_count = lib.GetFloatFeaturesCount(self._handle)
+        cat_count = lib.GetCatFeaturesCount(self._handle)
+        if (float_count, cat_count) != (len(FLOAT_FEATURE_INDICES), len(CATEGORICAL_FEATURE_INDICES)):
+            raise RuntimeError(f"모델 feature 수가 맞지 않습니다: float={float_count}, cat={cat_count}")
+        threshold = self._metadata("binclass_probability_threshold")
+        self.probability_threshold = 0.5 if threshold is None else float(threshold)
+
+    def _metadata(self, key: str) -> Optional[str]:
+        # 모델 메타데이터 값 (C API 가 돌려주는 문자열은 NUL 로 끝나지 않을 수 있어 길이로 읽는다)
+        raw = key.encode()
+        if not self._lib.CheckModelMetadataHasKey(self._handle, raw, len(raw)):
+            return None
+        size = self._lib.GetModelInfoValueSize(self._handle, raw, len(raw))
+        return ctypes.string_at(self._lib.GetModelInfoValue(self._handle, raw, len(raw)), size).decode()
+
+    def predict_proba(self, rows: Rows) -> np.ndarray:
+        table = _as_object_table(rows)
+        n = len(table)
+        floats = np.ascontiguousarray(table[:, FLOAT_FEATURE_INDICES].astype(np.float32))
+        float_ptrs = (ctypes.POINTER(ctypes.c_float) * n)(*[
+            ctypes.cast(floats.ctypes.data + i * floats.strides[0], ctypes.POINTER(ctypes.c_float)) for i in range(n)
+        ])
+        cat_rows = [
+            (ctypes.c_char_p * len(CATEGORICAL_FEATURE_INDICES))(*[str(v).encode() for v in table[i, CATEGORICAL_FEATURE_INDICES]])
+            for i in range(n)
+        ]
+        cat_ptrs = (ctypes.POINTER(ctypes.c_char_p) * n)(*[ctypes.cast(r, ctypes.POINTER(ctypes.c_char_p)) for r in cat_rows])
+        raw = np.empty(n, dtype=np.float64)
+        ok = self._lib.CalcModelPrediction(
+            self._handle, n,
+            float_ptrs, len(FLOAT_FEATURE_INDICES),
+            cat_ptrs, len(CATEGORICAL_FEATURE_INDICES),
+            raw.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), n,
+        )
+        if not ok:
+            raise RuntimeError(f"예측 실패: {self._lib.GetErrorString().decode(errors='ignore')}")
+        # 기본 예측 타입은 raw formula value → Logloss 확률로 변환 (predict_proba 와 동일)
+        return 1.0 / (1.0 + np.exp(-raw))
+
+    def __del__(self):
+        handle = getattr(self, "_handle", None)
+        if handle:
+            self._lib.ModelCalcerDelete(handle)
+            self._handle = None
+
+
+MODEL_BACKENDS = {
+    CatBoostBackend.name: CatBoostBackend,
+    CModelBackend.name: CModelBackend,
+}
+
+
+def load_backend(name: str, model_path: Path):
+    try:
+        backend_cls = MODEL_BACKENDS[name]
+    except KeyError:
+        raise RuntimeError(f"알 수 없는 모델 백엔드입니다: {name} (가능: {', '.join(MODEL_BACKENDS)})")
+    return backend_cls(model_path)
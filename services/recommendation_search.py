@@ -0,0 +1,143 @@
+# services/recommendation_search.py
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+import numpy as np
+
+# 조정 배수 탐색 범위 (주택가액, 임대보증금액, 선순위 각각)
+FACTOR_MIN, FACTOR_MAX = 0.8, 1.2
+N_FACTORS = 3
+
+DEFAULT_STRATEGY = os.getenv("RECOMMENDATION_SEARCH", "grid")
+GRID_STEPS = int(os.getenv("RECOMMENDATION_GRID_STEPS", "5"))  # 배수당 단계 수 (5 → 0.8, 0.9, ..., 1.2)
+DEFAULT_BUDGET = int(os.getenv("RECOMMENDATION_BUDGET", str(GRID_STEPS ** N_FACTORS)))
+
+# factors (k, 3) → 위험 확률 (k,)
+ScoreFn = Callable[[np.ndarray], np.ndarray]
+
+
+@dataclass
+class SearchResult:
+    factors: np.ndarray  # (3,) 최적 배수
+    probability: float
+    evaluations: int     # 모델로 평가한 후보 수
+    strategy: str
+
+
+class BudgetedEvaluator:
+    """후보 배수를 모델로 평가하면서 평가 횟수(budget)를 세고, 같은 후보는 다시 평가하지 않는다."""
+
+    def __init__(self, score: ScoreFn, budget: int):
+        self.score = score
+        self.budget = budget
+        self.evaluations = 0
+        self.best_factors: Optional[np.ndarray] = None
+        self.best_prob = np.inf
+        self._seen: Dict[tuple, float] = {}
+
+    @property
+    def remaining(self) -> int:
+        return self.budget - self.evaluations
+
+    def evaluate(self, factors: np.ndarray) -> np.ndarray:
+        # 남은 예산만큼만 새 후보를 평가 (예산 밖 / 이미 본 후보는 캐시 값 또는 inf)
+        factors = np.clip(np.round(np.asarray(factors, dtype=np.float64).reshape(-1, N_FACTORS), 6), FACTOR_MIN, FACTOR_MAX)
+        keys = list(map(tuple, factors.tolist()))
+        new_idx, batch_keys = [], set()
+        for i, key in enumerate(keys):
+            if key in self._seen or key in batch_keys or len(new_idx) >= self.remaining:
+                continue
+            new_idx.append(i)
+            batch_keys.add(key)
+
+        if new_idx:
+            probs = np.asarray(self.score(factors[new_idx]), dtype=np.float64)
+            self.evaluations += len(new_idx)
+            for i, p in zip(new_idx, probs):
+                self._seen[keys[i]] = p
+                # 같은 확률이면 먼저 평가한 후보 유지 (기존 grid 의 argmin 과 동일)
+                if p < self.best_prob:
+                    self.best_prob, self.best_factors = p, factors[i]
+
+        return np.array([self._seen.get(k, np.inf) for k in keys])
+
+    def result(self, strategy: str) -> SearchResult:
+        return SearchResult(self.best_factors, float(self.best_prob), self.evaluations, strategy)
+
+
+def _grid(center: np.ndarray, half_width: float, steps: int) -> np.ndarray:
+    # itertools.product 와 같은 순서의 (steps^3, 3) 격자
+    axes = [np.linspace(max(FACTOR_MIN, c - half_width), min(FACTOR_MAX, c + half_width), steps) for c in center]
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, N_FACTORS)
+
+
+def grid_search(evaluator: BudgetedEvaluator, steps: Optional[int] = None) -> None:
+    # 기존 방식: 0.8 ~ 1.2 를 steps 단계로 나눈 격자 전체 (5단계 = 125개, 11단계 = 1331개)
+    evaluator.evaluate(_grid(np.ones(N_FACTORS), (FACTOR_MAX - FACTOR_MIN) / 2, steps or GRID_STEPS))
+
+
+def _seed_grid(evaluator: BudgetedEvaluator) -> float:
+    # 같은 예산의 grid 가 평가하는 후보를 먼저 평가해서 그 최적점을 하한으로 삼는다 (grid 보다 나빠지지 않음)
+    # 남은 예산으로만 더 찾으므로 예산이 격자 크기(기본 125) 이하이면 grid 와 같은 결과
+    grid_search(evaluator)
+    return (FACTOR_MAX - FACTOR_MIN) / max(1, GRID_STEPS - 1)  # 격자 간격
+
+
+def coarse_to_fine_search(evaluator: BudgetedEvaluator, steps: int = 3, shrink: float = 0.5) -> None:
+    # grid 최적점 주변(격자 간격의 절반)부터 3x3x3 격자로 범위를 줄여가며 반복
+    half_width = _seed_grid(evaluator) / 2
+    while evaluator.remaining > 0 and half_width > 1e-4 and evaluator.best_factors is not None:
+        evaluator.evaluate(_grid(evaluator.best_factors, half_width, steps))
+        half_width *= shrink
+
+
+def coordinate_descent_search(evaluator: BudgetedEvaluator, steps: int = 9) -> None:
+    # grid 최적점에서 시작해 한 번에 한 배수만 바꿔가며 선 위에서 최적점을 찾고,
+    # 개선이 없으면 간격을 줄인다
+    half_width = _seed_grid(evaluator) / 2
+    if evaluator.best_factors is None:
+        return
+    current = evaluator.best_factors.copy()
+    while evaluator.remaining > 0 and half_width > 1e-4:
+        before = evaluator.best_prob
+        for axis in range(N_FACTORS):
+            if evaluator.remaining <= 0:
+                break
+            line = np.repeat(current[None, :], steps, axis=0)
+            line[:, axis] = np.linspace(max(FACTOR_MIN, current[axis] - half_width),
+                                        min(FACTOR_MAX, current[axis] + half_width), steps)
+            evaluator.evaluate(line)
+            current = evaluator.best_factors.copy()
+        if evaluator.best_prob >= before:
+            half_width /= 2
+
+
+def latin_hypercube_search(evaluator: BudgetedEvaluator, seed: int = 0) -> None:
+    # grid 이후 남은 예산만큼 라틴 하이퍼큐브 표본
+    _seed_grid(evaluator)
+    n = evaluator.remaining
+    if n <= 0:
+        return
+    rng = np.random.default_rng(seed)
+    u = (rng.permuted(np.tile(np.arange(n), (N_FACTORS, 1)), axis=1).T + rng.random((n, N_FACTORS))) / n
+    evaluator.evaluate(FACTOR_MIN + u * (FACTOR_MAX - FACTOR_MIN))
+
+
+SEARCH_STRATEGIES = {
+    "grid": grid_search,
+    "coarse_to_fine": coarse_to_fine_search,
+    "coordinate_descent": coordinate_descent_search,
+    "latin_hypercube": latin_hypercube_search,
+}
+
+
+def search_factors(score: ScoreFn, strategy: Optional[str] = None, budget: Optional[int] = None) -> SearchResult:
+    strategy = strategy or DEFAULT_STRATEGY
+    budget = budget or DEFAULT_BUDGET
+    try:
+        search = SEARCH_STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"알 수 없는 탐색 방식입니다: {strategy} (가능: {', '.join(SEARCH_STRATEGIES)})")
+    evaluator = BudgetedEvaluator(score, budget)
+    search(evaluator)
+    return evaluator.result(strategy)
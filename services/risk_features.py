@@ -0,0 +1,136 @@
+# services/risk_features.py
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from schemas.risk_prediction_schema import RiskRequest
+from utils.market_data import MarketDataIndex
+from utils.util import map_housing_type
+
+# 모델 학습 시 사용한 feature 순서
+FEATURE_ORDER = [
+    "초기LTV", "주택가액", "임대보증금액", "선순위",
+    "시도", "주택구분", "보증기간_개월", "보증시작월_전세가율",
+    "기준금리", "미분양주택수", "보증시작월_dt_연", "보증시작월_dt_월",
+    "보증완료월_dt_연", "보증완료월_dt_월", "대출액"
+]
+CATEGORICAL_FEATURES = ["시도", "주택구분"]
+CATEGORICAL_FEATURE_INDICES = [FEATURE_ORDER.index(c) for c in CATEGORICAL_FEATURES]
+_COL = {col: i for i, col in enumerate(FEATURE_ORDER)}
+_INT64_MIN, _INT64_MAX = int(np.iinfo(np.int64).min), int(np.iinfo(np.int64).max)
+
+
+def request_cache_key(initialLTV, housePrice, depositAmount, seniority, region, houseType,
+                      guaranteeStartMonth, guaranteeEndMonth) -> tuple:
+    # 결과 캐시 키: 숫자 타입을 맞추고 주택구분은 모델 입력과 같은 범주로 매핑 (같은 feature → 같은 키)
+    return (
+        float(initialLTV), int(housePrice), int(depositAmount), int(seniority),
+        str(region), map_housing_type(houseType), int(guaranteeStartMonth), int(guaranteeEndMonth),
+    )
+
+
+def classes_from_proba(model, proba: np.ndarray) -> np.ndarray:
+    # predict_proba 결과에서 predict 와 같은 클래스(0.0 / 1.0)를 만든다
+    return (proba > model.probability_threshold).astype(np.float64)
+
+
+def counterfactual_rows(features_dict: Dict, factors: np.ndarray) -> np.ndarray:
+    """(주택가액, 임대보증금액, 선순위) 배수 후보 factors (k, 3) 의 feature 행렬 (k, 15).
+
+    바뀌지 않는 feature 는 기준 행을 broadcast 해서 채우고, 금액/LTV 열만 벡터 연산으로 계산한다.
+    """
+    factors = np.asarray(factors, dtype=np.float64).reshape(-1, 3)
+    house_price = features_dict["주택가액"] * factors[:, 0]
+    deposit = features_dict["임대보증금액"] * factors[:, 1]
+    seniority = features_dict["선순위"] * factors[:, 2]
+    ltv = (seniority + deposit) / house_price
+
+    rows = np.empty((len(factors), len(FEATURE_ORDER)), dtype=object)
+    rows[:] = [features_dict[col] for col in FEATURE_ORDER]
+    rows[:, _COL["주택가액"]] = house_price
+    rows[:, _COL["임대보증금액"]] = deposit
+    rows[:, _COL["선순위"]] = seniority
+    rows[:, _COL["초기LTV"]] = ltv
+    rows[:, _COL["대출액"]] = ltv * house_price
+    return rows
+
+
+def _split_months(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # YYYYMM 정수 배열 → (연, 월, 유효 여부)
+    years = values // 100
+    months = values % 100
+    valid = (values >= 100000) & (values <= 999999) & (months >= 1) & (months <= 12)
+    return years, months, valid
+
+
+def _int_column(values: List[int], n: int) -> Tuple[np.ndarray, np.ndarray]:
+    # int64 로 바꿀 수 없는 값(pydantic 은 통과하는 10**20 등)은 0 으로 채우고 유효 여부 False
+    # (np.fromiter 는 OverflowError 로 배치 전체를 실패시킨다)
+    ok = np.fromiter((_INT64_MIN <= v <= _INT64_MAX for v in values), dtype=bool, count=n)
+    return np.fromiter((v if in_range else 0 for v, in_range in zip(values, ok)), dtype=np.int64, count=n), ok
+
+
+def build_feature_frame(requests: List[RiskRequest], market_index: MarketDataIndex) -> Tuple[pd.DataFrame, np.ndarray, List[Dict]]:
+    """여러 요청의 feature 를 한 번에 만든다.
+
+    반환값: (유효한 행만 담은 DataFrame, 그 행들의 원래 인덱스, [{"index", "detail"}] 오류 목록)
+    """
+    n = len(requests)
+    errors: Dict[int, str] = {}
+
+    def fail(mask: np.ndarray, detail: str):
+        for i in np.flatnonzero(mask):
+            errors.setdefault(int(i), detail)
+
+    initial_ltv = np.fromiter((r.initialLTV for r in requests), dtype=np.float64, count=n)
+    house_price, house_price_ok = _int_column([r.housePrice for r in requests], n)
+    deposit, deposit_ok = _int_column([r.depositAmount for r in requests], n)
+    seniority, seniority_ok = _int_column([r.seniority for r in requests], n)
+    regions = [r.region for r in requests]
+    house_types = [r.houseType for r in requests]
+    # 범위를 벗어난 월은 0 이 되어 아래 YYYYMM 형식 검사에서 걸러진다
+    start, _ = _int_column([r.guaranteeStartMonth for r in requests], n)
+    end, _ = _int_column([r.guaranteeEndMonth for r in requests], n)
+    fail(~house_price_ok, "주택가액이 허용 범위를 벗어났습니다.")
+    fail(~deposit_ok, "임대보증금액이 허용 범위를 벗어났습니다.")
+    fail(~seniority_ok, "선순위 금액이 허용 범위를 벗어났습니다.")
+
+    start_y, start_m, start_ok = _split_months(start)
+    end_y, end_m, end_ok = _split_months(end)
+    fail(~start_ok, "보증 시작월 형식이 잘못되었습니다 (YYYYMM).")
+    fail(~end_ok, "보증 완료월 형식이 잘못되었습니다 (YYYYMM).")
+
+    period = (end_y - start_y) * 12 + (end_m - start_m)
+    fail(period < 0, "보증 완료월이 시작월보다 빠릅니다.")
+
+    # 잘못된 월은 조회만 가능하도록 1월로 채운 뒤 오류 행으로 걸러낸다
+    safe_m = np.where(start_ok, start_m, 1)
+    jeonse, jeonse_found = market_index.get_jeonse_rates(regions, house_types, start_y, safe_m)
+    fail(~jeonse_found, "전세가율 데이터를 찾을 수 없습니다.")
+    unsold, unsold_found = market_index.get_unsold_values(regions, start_y, safe_m)
+    fail(~unsold_found, "지역별 미판매 데이터를 찾을 수 없습니다.")
+    base_rate = market_index.get_base_rates(start_y, safe_m)
+
+    valid = np.ones(n, dtype=bool)
+    valid[list(errors)] = False
+    idx = np.flatnonzero(valid)
+
+    features_df = pd.DataFrame({
+        "초기LTV": initial_ltv[idx],
+        "주택가액": house_price[idx],
+        "임대보증금액": deposit[idx],
+        "선순위": seniority[idx],
+        "시도": [regions[i] for i in idx],
+        "주택구분": [map_housing_type(house_types[i]) for i in idx],
+        "보증기간_개월": period[idx],
+        "보증시작월_전세가율": jeonse[idx],
+        "기준금리": base_rate[idx],
+        "미분양주택수": unsold[idx],
+        "보증시작월_dt_연": start_y[idx],
+        "보증시작월_dt_월": start_m[idx],
+        "보증완료월_dt_연": end_y[idx],
+        "보증완료월_dt_월": end_m[idx],
+        "대출액": initial_ltv[idx] * house_price[idx],
+    }, columns=FEATURE_ORDER)
+
+    error_list = [{"index": i, "detail": errors[i]} for i in sorted(errors)]
+    return features_df, idx, error_list
@@ -1,47 +1,15 @@
-from fastapi import FastAPI, HTTPException
-from catboost import CatBoostClassifier
-from pathlib import Path
-import pandas as pd
-import math
-from catboost import Pool
-from utils.util import get_jeonse_rate, get_unsold_value, get_base_rate, map_housing_type, calculate_guarantee_period
+from typing import List, Optional
+from fastapi import HTTPException
+from utils.util import map_housing_type, calculate_guarantee_period
+from schemas.risk_prediction_schema import RiskRequest
+from services.feature_store import FeatureStore, get_feature_store
+from services.risk_features import (
+    FEATURE_ORDER, build_feature_frame, classes_from_proba, request_cache_key
+)
+from utils.result_cache import cache_from_env
 
-# 모델 로드
-MODEL_PATH = Path(__file__).parent.parent / "models" / "catboost_0822.cbm"
-model = CatBoostClassifier()
-model.load_model(MODEL_PATH)
-
-# 데이터 로드 (전세가율 xlsx)
-JEONSE_PATH = Path(__file__).parent.parent / "data" / "dataset_Jeonse_rate.xlsx"
-try:
-    jeonse_df = pd.read_excel(JEONSE_PATH, engine="openpyxl", header=1)  # header=1 추가: row2를 헤더로
-    new_columns = []
-    for col in jeonse_df.columns:
-        if isinstance(col, (float, int)):
-            year = math.floor(col)
-            month_str = str(round((col - year) * 100))
-            if len(month_str) == 1:
-                month_str = '0' + month_str
-            new_columns.append(f"{year:d}.{month_str}")
-        else:
-            new_columns.append(str(col))
-    jeonse_df.columns = new_columns
-except FileNotFoundError:
-    raise RuntimeError(f"전세가율 데이터 파일을 찾을 수 없습니다: {JEONSE_PATH}")
-
-# 데이터 로드 (미분양현황 xlsx)
-UNSOLD_PATH = Path(__file__).parent.parent / "data" / "dataset_unsold.xlsx"
-try:
-    unsold_df = pd.read_excel(UNSOLD_PATH, engine="openpyxl", header=0)  # 첫 줄이 header
-except FileNotFoundError:
-    raise RuntimeError(f"지역별 미판매 데이터 파일을 찾을 수 없습니다: {UNSOLD_PATH}")
-
-# 데이터 로드 (기준금리 xlsx)
-BASE_RATE_PATH = Path(__file__).parent.parent / "data" / "dataset_base_interest_rate.xlsx"
-try:
-    base_rate_df = pd.read_excel(BASE_RATE_PATH, engine="openpyxl", header=0)
-except FileNotFoundError:
-    raise RuntimeError(f"기준금리 파일을 찾을 수 없습니다: {BASE_RATE_PATH}")
+# 같은 입력의 반복 요청은 모델을 다시 돌리지 않는다 (모델/데이터 버전이 바뀌면 비워짐)
+risk_result_cache = cache_from_env("risk_prediction")
 
 def predict_risk(
     initialLTV,
@@ -51,19 +19,30 @@ def predict_risk(
     region,
     houseType,
     guaranteeStartMonth,
-    guaranteeEndMonth
+    guaranteeEndMonth,
+    store: Optional[FeatureStore] = None
 ):
+    # 모델/데이터/버전은 snapshot 하나에서 함께 가져온다 (계산 중 reload 돼도 섞이지 않음)
+    snapshot = (store or get_feature_store()).snapshot()
+    cache_key = request_cache_key(initialLTV, housePrice, depositAmount, seniority, region, houseType,
+                                  guaranteeStartMonth, guaranteeEndMonth)
+    cached = risk_result_cache.get(cache_key, snapshot.cache_version)
+    if cached is not None:
+        return cached
+
+    model = snapshot.model
+    market_index = snapshot.market_index
     loanAmount = initialLTV * housePrice
     guaranteePeriodMonths = calculate_guarantee_period(guaranteeStartMonth, guaranteeEndMonth)
-    jeonseRateStartMonth = get_jeonse_rate(jeonse_df, region, houseType, guaranteeStartMonth)
+    jeonseRateStartMonth = market_index.get_jeonse_rate(region, houseType, guaranteeStartMonth)
     if jeonseRateStartMonth is None:
         raise HTTPException(status_code=400, detail="전세가율 데이터를 찾을 수 없습니다.")
     
-    unsoldValue = get_unsold_value(unsold_df, region, guaranteeStartMonth)
+    unsoldValue = market_index.get_unsold_value(region, guaranteeStartMonth)
     if unsoldValue is None:
         raise HTTPException(status_code=400, detail="지역별 미판매 데이터를 찾을 수 없습니다.")
     
-    baseRate = get_base_rate(base_rate_df, guaranteeStartMonth)
+    baseRate = market_index.get_base_rate(guaranteeStartMonth)
 
     # ⚡ feature_order에 맞게 데이터 구성
     features_dict = {
@@ -84,26 +63,40 @@ def predict_risk(
         "대출액": loanAmount,
     }
 
-    # DataFrame으로 변환 (순서 보장)
-    feature_order = [
-        "초기LTV", "주택가액", "임대보증금액", "선순위",
-        "시도", "주택구분", "보증기간_개월", "보증시작월_전세가율",
-        "기준금리", "미분양주택수", "보증시작월_dt_연", "보증시작월_dt_월",
-        "보증완료월_dt_연", "보증완료월_dt_월", "대출액"
-    ]
-    features_df = pd.DataFrame([[features_dict[col] for col in feature_order]], columns=feature_order)
-
-    # Pool 객체 생성 (categorical_features 지정)
-    categorical_features = ["시도", "주택구분"]
-    pool = Pool(features_df, cat_features=categorical_features)
-
+    # DataFrame 없이 한 행을 바로 예측 (predict_proba 한 번으로 클래스까지 계산)
+    row = [features_dict[col] for col in FEATURE_ORDER]
     try:
-        prediction = model.predict(pool)
-        probability = model.predict_proba(pool)[:, 1] * 100
+        probability = model.predict_proba([row])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {e}")
+    prediction = classes_from_proba(model, probability)
+    probability = probability * 100
 
-    return {
+    result = {
         "prediction": float(prediction[0]),
         "probability": round(float(probability[0]), 2)
-    }
\ No newline at end of file
+    }
+    risk_result_cache.put(cache_key, result, snapshot.cache_version)
+    return result
+
+def predict_risk_batch(requests: List[RiskRequest], store: Optional[FeatureStore] = None):
+    snapshot = (store or get_feature_store()).snapshot()
+    model = snapshot.model
+
+    features_df, valid_idx, errors = build_feature_frame(requests, snapshot.market_index)
+    results = []
+    if len(valid_idx) > 0:
+        try:
+            # predict_proba 한 번으로 확률과 클래스를 모두 계산
+            proba = model.predict_proba(features_df)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Prediction failed: {e}")
+        predictions = classes_from_proba(model, proba)
+        for i, pred, p in zip(valid_idx, predictions, proba):
+            results.append({
+                "index": int(i),
+                "prediction": float(pred),
+                "probability": round(float(p * 100), 2)
+            })
+
+    return {"results": results, "errors": errors}
@@ -0,0 +1,240 @@
+# services/stt_providers.py
+import base64
+import itertools
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+
+# STT 공급자: google (gRPC, 기본) | http (Google REST v1 speech:recognize 형식, 로컬 대역 서버 포함)
+STT_PROVIDER = os.getenv("STT_PROVIDER", "google")
+# 클라이언트(채널 / 커넥션)를 프로세스 전체에서 재사용 (0 이면 요청마다 새로 만들고 닫음, 비교용)
+STT_CLIENT_REUSE = os.getenv("STT_CLIENT_REUSE", "1") == "1"
+STT_POOL_SIZE = int(os.getenv("STT_POOL_SIZE", "2"))  # gRPC 채널 수 / HTTP keep-alive 커넥션 수
+STT_KEEPALIVE_SEC = float(os.getenv("STT_KEEPALIVE_SEC", "30"))
+STT_GRPC_ENDPOINT = os.getenv("STT_GRPC_ENDPOINT")  # 예: 에뮬레이터 localhost:50051 (insecure)
+STT_HTTP_ENDPOINT = os.getenv("STT_HTTP_ENDPOINT", "https://speech.googleapis.com")
+STT_API_KEY = os.getenv("STT_API_KEY")
+# 요청 하나의 전체 시간(재시도 포함), 재시도 횟수와 백오프, 동시 호출 수
+STT_DEADLINE_SEC = float(os.getenv("STT_DEADLINE_SEC", "15"))
+STT_RETRIES = int(os.getenv("STT_RETRIES", "2"))
+STT_BACKOFF_BASE_MS = float(os.getenv("STT_BACKOFF_BASE_MS", "100"))
+STT_BACKOFF_MAX_MS = float(os.getenv("STT_BACKOFF_MAX_MS", "2000"))
+STT_MAX_CONCURRENCY = int(os.getenv("STT_MAX_CONCURRENCY", "8"))
+
+RETRYABLE_HTTP_STATUS = (429, 500, 502, 503, 504)
+
+
+def recognition_config(encoding: str, rate: int, lang: str) -> Dict:
+    return {
+        "encoding": encoding,
+        "sampleRateHertz": rate,
+        "languageCode": lang,
+        "enableAutomaticPunctuation": True,
+        "model": "latest_short",
+    }
+
+
+def join_alternatives(alternatives: List) -> Dict:
+    # [(transcript, confidence)] (결과마다 첫 번째 후보) → 기존 google_stt_bytes 와 같은 형식
+    if not alternatives:
+        return {"text": "", "confidence": None}
+    return {"text": " ".join(t for t, _ in alternatives), "confidence": alternatives[0][1]}
+
+
+class GoogleGrpcStt:
+    """google-cloud-speech 클라이언트 풀.
+
+    SpeechClient(gRPC 채널)는 처음 쓸 때 pool_size 개까지 만들고 돌아가며 재사용한다.
+    채널에는 keep-alive ping 을 설정해 유휴 중에 끊긴 연결로 첫 요청이 실패하지 않도록 한다.
+    """
+
+    name = "google"
+
+    def __init__(self, pool_size: int = STT_POOL_SIZE, reuse: bool = STT_CLIENT_REUSE,
+                 endpoint: Optional[str] = STT_GRPC_ENDPOINT):
+        from google.api_core import exceptions as google_exceptions
+        from google.cloud import speech
+        self.speech = speech
+        self.retryable = (google_exceptions.ServiceUnavailable, google_exceptions.InternalServerError,
+                          google_exceptions.TooManyRequests, google_exceptions.DeadlineExceeded)
+        self.pool_size = max(1, pool_size)
+        self.reuse = reuse
+        self.endpoint = endpoint
+        self.clients_created = 0
+        self._pool: List = []
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def _channel_options(self) -> List:
+        keepalive_ms = int(STT_KEEPALIVE_SEC * 1000)
+        return [
+            ("grpc.keepalive_time_ms", keepalive_ms),
+            ("grpc.keepalive_timeout_ms", 10000),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+        ]
+
+    def _new_client(self):
+        from google.cloud.speech_v1.services.speech.transports import SpeechGrpcTransport
+        if self.endpoint:
+            import grpc
+            channel = grpc.insecure_channel(self.endpoint, options=self._channel_options())
+        else:
+            channel = SpeechGrpcTransport.create_channel(options=self._channel_options())
+        self.clients_created += 1
+        return self.speech.SpeechClient(transport=SpeechGrpcTransport(channel=channel))
+
+    def client(self):
+        if not self.reuse:
+            return self._new_client()
+        with self._lock:
+            if len(self._pool) < self.pool_size:
+                self._pool.append(self._new_client())
+                return self._pool[-1]
+            return self._pool[next(self._next) % self.pool_size]
+
+    def recognize(self, audio_bytes: bytes, encoding: str, rate: int, lang: str, timeout: float) -> Dict:
+        speech = self.speech
+        config = recognition_config(encoding, rate, lang)
+        client = self.client()
+        try:
+            resp = client.recognize(
+                config=speech.RecognitionConfig(
+                    encoding=getattr(speech.RecognitionConfig.AudioEncoding, encoding),
+                    sample_rate_hertz=config["sampleRateHertz"],
+                    language_code=config["languageCode"],
+                    enable_automatic_punctuation=config["enableAutomaticPunctuation"],
+                    model=config["model"],
+                ),
+                audio=speech.RecognitionAudio(content=audio_bytes),
+                timeout=timeout,
+                retry=None,  # 재시도는 recognize_with_retry 에서 공급자와 상관없이 같은 규칙으로
+            )
+        finally:
+            if not self.reuse:
+                client.transport.close()
+        return join_alternatives([(r.alternatives[0].transcript, r.alternatives[0].confidence)
+                                  for r in resp.results if r.alternatives])
+
+    def is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, self.retryable)
+
+
+class HttpStt:
+    """Google REST (POST /v1/speech:recognize) 형식으로 호출하는 공급자.
+
+    httpx 커넥션 풀로 keep-alive 연결을 재사용한다. endpoint 를 로컬 대역 서버
+    (python -m benchmarks.fake_stt_server) 로 바꾸면 오프라인에서도 오디오 경로 전체를 부하 테스트할 수 있다.
+    """
+
+    name = "http"
+
+    def __init__(self, endpoint: str = STT_HTTP_ENDPOINT, api_key: Optional[str] = STT_API_KEY,
+                 pool_size: int = STT_POOL_SIZE, reuse: bool = STT_CLIENT_REUSE):
+        import httpx
+        self.httpx = httpx
+        self.url = f"{endpoint.rstrip('/')}/v1/speech:recognize"
+        self.params = {"key": api_key} if api_key else None
+        self.reuse = reuse
+        self.limits = httpx.Limits(max_connections=max(1, pool_size), max_keepalive_connections=max(1, pool_size),
+                                   keepalive_expiry=STT_KEEPALIVE_SEC)
+        self.clients_created = 0
+        self._client = self._new_client() if reuse else None
+
+    def _new_client(self):
+        self.clients_created += 1
+        return self.httpx.Client(limits=self.limits)
+
+    def recognize(self, audio_bytes: bytes, encoding: str, rate: int, lang: str, timeout: float) -> Dict:
+        payload = {
+            "config": recognition_config(encoding, rate, lang),
+            "audio": {"content": base64.b64encode(audio_bytes).decode("ascii")},
+        }
+        client = self._client or self._new_client()
+        try:
+            resp = client.post(self.url, params=self.params, json=payload, timeout=timeout)
+            resp.raise_for_status()
+        finally:
+            if client is not self._client:
+                client.close()
+        results = resp.json().get("results", [])
+        return join_alternatives([(r["alternatives"][0].get("transcript", ""), r["alternatives"][0].get("confidence"))
+                                  for r in results if r.get("alternatives")])
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, self.httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_HTTP_STATUS
+        return isinstance(error, self.httpx.TransportError)
+
+
+PROVIDERS = {"google": GoogleGrpcStt, "http": HttpStt}
+_providers: Dict[str, object] = {}
+_providers_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(1, STT_MAX_CONCURRENCY))
+stt_stats = {"calls": 0, "retries": 0, "failures": 0, "rejected": 0, "in_flight": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(key: str, delta: int = 1) -> None:
+    with _stats_lock:
+        stt_stats[key] += delta
+
+
+def get_stt_provider(name: str = STT_PROVIDER):
+    # 공급자(와 그 클라이언트 풀)는 프로세스에 하나, 첫 호출 때 생성
+    with _providers_lock:
+        if name not in _providers:
+            if name not in PROVIDERS:
+                raise ValueError(f"알 수 없는 STT_PROVIDER: {name}")
+            _providers[name] = PROVIDERS[name]()
+        return _providers[name]
+
+
+def backoff_sec(attempt: int) -> float:
+    # 지수 백오프 + full jitter (동시에 실패한 요청들이 같은 순간에 다시 몰리지 않도록)
+    return random.uniform(0, min(STT_BACKOFF_MAX_MS, STT_BACKOFF_BASE_MS * 2 ** attempt)) / 1000
+
+
+def recognize_with_retry(audio_bytes: bytes, encoding: str = "LINEAR16", rate: int = 16000, lang: str = "ko-KR",
+                         provider=None, deadline_sec: float = STT_DEADLINE_SEC, retries: int = STT_RETRIES) -> Dict:
+    """동시 호출 수 제한 + 전체 deadline 안에서 일시적 오류만 재시도한다.
+
+    동시 호출 자리를 deadline 안에 얻지 못하면 503, deadline 을 다 쓰면 504.
+    """
+    provider = provider or get_stt_provider()
+    deadline = time.monotonic() + deadline_sec
+    _count("calls")
+    for attempt in range(retries + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if not _slots.acquire(timeout=remaining):
+            _count("rejected")
+            raise HTTPException(status_code=503, detail="STT 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                                headers={"Retry-After": "1"})
+        _count("in_flight")
+        try:
+            return provider.recognize(audio_bytes, encoding, rate, lang, timeout=deadline - time.monotonic())
+        except Exception as e:
+            if attempt == retries or not provider.is_retryable(e):
+                _count("failures")
+                raise
+        finally:
+            _count("in_flight", -1)
+            _slots.release()
+        _count("retries")
+        time.sleep(min(backoff_sec(attempt), max(0.0, deadline - time.monotonic())))
+    _count("failures")
+    raise HTTPException(status_code=504, detail="STT 응답 시간이 초과되었습니다.")
+
+
+def stats() -> Dict:
+    return {
+        **stt_stats,
+        "provider": STT_PROVIDER,
+        "reuse": STT_CLIENT_REUSE,
+        "clients_created": {name: p.clients_created for name, p in _providers.items()},
+    }
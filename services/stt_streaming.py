@@ -0,0 +1,238 @@
+# services/stt_streaming.py
+import asyncio
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from services.stt_providers import get_stt_provider
+
+STREAM_SAMPLE_RATE = 16000
+BYTES_PER_SEC = STREAM_SAMPLE_RATE * 2  # s16le mono
+
+# 스트리밍 인식 백엔드: google (기본) | fake (오프라인 테스트 / 부하 테스트용)
+STT_STREAMING_BACKEND = os.getenv("STT_STREAMING_BACKEND", "google")
+# 이 값 이상의 stability 를 가진 중간 결과만 "안정된" 텍스트로 보고 의도 분류
+STT_STABLE_THRESHOLD = float(os.getenv("STT_STABLE_THRESHOLD", "0.8"))
+# 한 연결에서 인식할 최대 오디오 길이 (초과분은 버리고 그때까지의 결과로 종료)
+STT_STREAM_MAX_SEC = float(os.getenv("STT_STREAM_MAX_SEC", "60"))
+STT_FAKE_TRANSCRIPT = os.getenv("STT_FAKE_TRANSCRIPT", "전세 사기 위험도 알려줘")
+STT_FAKE_WORD_MS = float(os.getenv("STT_FAKE_WORD_MS", "400"))
+
+
+@dataclass
+class Transcript:
+    """스트리밍 인식 결과 하나.
+
+    text 는 현재 구간의 전체 가설, stable_text 는 그중 앞으로 바뀌지 않을 것으로 보이는 앞부분이다.
+    is_final 이면 구간이 끝난 것이고, 이후 결과는 다음 구간의 텍스트다.
+    """
+    text: str
+    stable_text: str
+    is_final: bool = False
+    confidence: Optional[float] = None
+
+
+class FakeStreamingRecognizer:
+    """오프라인 테스트용 인식기: 받은 오디오 길이에 비례해 정해진 문장을 한 단어씩 드러낸다.
+
+    word_ms 만큼 오디오가 들어올 때마다 다음 단어가 나오고, 새 단어는 다음 조각이 들어올 때까지 불안정으로 둔다.
+    """
+
+    name = "fake"
+
+    def __init__(self, transcript: str = STT_FAKE_TRANSCRIPT, word_ms: float = STT_FAKE_WORD_MS):
+        self.words = transcript.split()
+        self.word_ms = word_ms
+
+    async def recognize(self, pcm_chunks: AsyncIterator[bytes], rate: int = STREAM_SAMPLE_RATE,
+                        lang: str = "ko-KR") -> AsyncIterator[Transcript]:
+        bytes_per_word = max(1, int(rate * 2 * self.word_ms / 1000))
+        received, shown, stable = 0, 0, 0
+        async for chunk in pcm_chunks:
+            received += len(chunk)
+            n = min(len(self.words), received // bytes_per_word)
+            new_stable = n - 1 if n > shown else n
+            if n == 0 or (n, new_stable) == (shown, stable):
+                continue
+            shown, stable = n, new_stable
+            yield Transcript(" ".join(self.words[:n]), " ".join(self.words[:stable]))
+        text = " ".join(self.words[:shown])
+        yield Transcript(text, text, is_final=True, confidence=0.9 if text else None)
+
+
+class GoogleStreamingRecognizer:
+    """Google Speech streaming_recognize (interim_results) 를 비동기 반복자로 감싼다.
+
+    gRPC 스트림은 블로킹이므로 연결마다 스레드 하나에서 응답을 읽고, 오디오 조각은 큐로 넘긴다.
+    클라이언트는 일반 인식과 같은 프로세스 공용 풀(stt_providers)에서 첫 인식 때 가져온다.
+    """
+
+    name = "google"
+
+    def client(self):
+        return get_stt_provider("google").client()
+
+    async def recognize(self, pcm_chunks: AsyncIterator[bytes], rate: int = STREAM_SAMPLE_RATE,
+                        lang: str = "ko-KR") -> AsyncIterator[Transcript]:
+        from google.cloud import speech
+        client = await asyncio.to_thread(self.client)
+        loop = asyncio.get_running_loop()
+        audio_q: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        events: asyncio.Queue = asyncio.Queue()
+        config = speech.StreamingRecognitionConfig(
+            config=speech.RecognitionConfig(
+                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=rate,
+                language_code=lang,
+                enable_automatic_punctuation=True,
+                model="latest_short",
+            ),
+            interim_results=True,
+        )
+
+        def requests():
+            while True:
+                chunk = audio_q.get()
+                if chunk is None:
+                    return
+                yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+        def consume():
+            try:
+                for resp in client.streaming_recognize(config=config, requests=requests()):
+                    results = [r for r in resp.results if r.alternatives]
+                    if not results:
+                        continue
+                    # 한 응답의 결과들을 이어 붙이면 전체 가설, 그중 stability 가 높은 앞부분이 안정된 텍스트
+                    text = "".join(r.alternatives[0].transcript for r in results).strip()
+                    if results[0].is_final:
+                        event = Transcript(text, text, is_final=True, confidence=results[0].alternatives[0].confidence)
+                    else:
+                        stable = []
+                        for r in results:
+                            if r.stability < STT_STABLE_THRESHOLD:
+                                break
+                            stable.append(r.alternatives[0].transcript)
+                        event = Transcript(text, "".join(stable).strip())
+                    loop.call_soon_threadsafe(events.put_nowait, event)
+            except Exception as e:
+                loop.call_soon_threadsafe(events.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(events.put_nowait, None)
+
+        async def pump():
+            try:
+                async for chunk in pcm_chunks:
+                    audio_q.put(chunk)
+            finally:
+                audio_q.put(None)
+
+        threading.Thread(target=consume, name="stt-stream", daemon=True).start()
+        pump_task = asyncio.ensure_future(pump())
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+            await pump_task  # 오디오 입력 쪽 오류 전달
+        finally:
+            # 중간에 끊기면 요청 generator 를 끝내 gRPC 스트림과 스레드가 종료되게 한다
+            pump_task.cancel()
+            audio_q.put(None)
+            await asyncio.gather(pump_task, return_exceptions=True)
+
+
+_recognizers: Dict[str, object] = {}
+
+
+def get_streaming_recognizer(backend: str = STT_STREAMING_BACKEND):
+    if backend not in _recognizers:
+        if backend == "fake":
+            _recognizers[backend] = FakeStreamingRecognizer()
+        elif backend == "google":
+            _recognizers[backend] = GoogleStreamingRecognizer()
+        else:
+            raise ValueError(f"알 수 없는 STT_STREAMING_BACKEND: {backend}")
+    return _recognizers[backend]
+
+
+async def _limit_audio(pcm_chunks: AsyncIterator[bytes], max_bytes: int, state: Dict) -> AsyncIterator[bytes]:
+    async for chunk in pcm_chunks:
+        remaining = max_bytes - state["audio_bytes"]
+        if remaining <= 0:
+            state["truncated"] = True
+            return
+        chunk = chunk[:remaining]
+        state["audio_bytes"] += len(chunk)
+        yield chunk
+
+
+async def stream_session(audio_chunks: AsyncIterator[bytes],
+                         send: Callable[[Dict], Awaitable[None]],
+                         route: Callable[[str], Awaitable[Dict]],
+                         audio_format: str = "webm",
+                         recognizer=None,
+                         lang: str = "ko-KR",
+                         max_sec: float = STT_STREAM_MAX_SEC) -> Dict:
+    """오디오 조각 → (ffmpeg 점진 변환) → 스트리밍 인식 → 중간 결과 / 의도 / 최종 결과를 send 로 보낸다.
+
+    audio_format 이 pcm 이면 16kHz mono s16le 를 그대로 인식기로 보내고, 그 밖에는 ffmpeg 로 계속 변환한다.
+    안정된 텍스트가 늘어날 때마다 route 로 의도를 분류해 최종 결과 전에 먼저 보낸다.
+    보낸 메시지 형식: interim {text, stable_text} / intent {text, intent} / final {text, confidence, intent, ...}
+    """
+    recognizer = recognizer or get_streaming_recognizer()
+    if audio_format == "pcm":
+        pcm_chunks = audio_chunks
+    else:
+        # ffmpeg 설정은 변환이 필요한 연결에서만 로드
+        from utils.ffmpeg_util import ffmpeg_pcm_stream
+        pcm_chunks = ffmpeg_pcm_stream(audio_chunks)
+
+    state = {"audio_bytes": 0, "truncated": False}
+    committed: List[str] = []  # 끝난 구간들의 최종 텍스트
+    last_interim, routed_text, routed_intent, confidence = None, "", None, None
+
+    async def route_once(text: str):
+        nonlocal routed_text, routed_intent
+        if text and text != routed_text:
+            routed_text, routed_intent = text, await route(text)
+            await send({"type": "intent", "text": text, "intent": routed_intent})
+
+    limited = _limit_audio(pcm_chunks, int(max_sec * BYTES_PER_SEC), state)
+    results = recognizer.recognize(limited, STREAM_SAMPLE_RATE, lang)
+    try:
+        async for result in results:
+            if result.is_final:
+                if result.text:
+                    committed.append(result.text)
+                confidence = result.confidence
+                await route_once(" ".join(committed))
+                continue
+            interim = (" ".join(committed + [result.text]).strip(), " ".join(committed + [result.stable_text]).strip())
+            if interim != last_interim:
+                last_interim = interim
+                await send({"type": "interim", "text": interim[0], "stable_text": interim[1]})
+            await route_once(interim[1])
+    finally:
+        # 전송 실패 / 연결 끊김으로 중간에 빠져나와도 인식 스트림과 ffmpeg 프로세스를 바로 정리
+        # (async generator 는 예외로 빠져나올 때 자동으로 닫히지 않는다)
+        await results.aclose()
+        await limited.aclose()
+        if pcm_chunks is not audio_chunks:
+            await pcm_chunks.aclose()
+
+    text = " ".join(committed)
+    final = {
+        "type": "final",
+        "text": text,
+        "confidence": confidence,
+        "intent": routed_intent if text and text == routed_text else None,
+        "audio_sec": round(state["audio_bytes"] / BYTES_PER_SEC, 2),
+        "truncated": state["truncated"],
+    }
+    await send(final)
+    return final
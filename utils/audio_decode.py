@@ -0,0 +1,116 @@
+import io
+import wave
+from math import gcd
+from typing import Optional
+import numpy as np
+from scipy.signal import resample_poly
+
+try:
+    import av  # PyAV: webm/opus, ogg 디코딩 (선택)
+except ImportError:
+    av = None
+
+try:
+    import soundfile  # float WAV, FLAC 등 (선택)
+except ImportError:
+    soundfile = None
+
+TARGET_RATE = 16000
+
+
+def sniff_format(data: bytes) -> Optional[str]:
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "wav"
+    if data[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"  # EBML (webm / matroska)
+    if data[:4] == b"OggS":
+        return "ogg"
+    if data[:4] == b"fLaC":
+        return "flac"
+    if data[4:8] == b"ftyp":
+        return "mp4"  # ISO BMFF (mp4 / m4a / mov / 3gp), 디코더 없음 → ffmpeg
+    return None
+
+
+def to_pcm16_mono(samples: np.ndarray, rate: int, target_rate: int = TARGET_RATE) -> bytes:
+    """(프레임, 채널) float 샘플 [-1, 1] → 16kHz mono s16le (ffmpeg -ac 1 -ar 16000 과 같은 형식)."""
+    mono = samples.mean(axis=1) if samples.ndim == 2 else samples
+    if rate != target_rate:
+        # polyphase 리샘플링 (48000 → 16000 이면 up=1, down=3)
+        g = gcd(rate, target_rate)
+        mono = resample_poly(mono, target_rate // g, rate // g)
+    return (np.clip(mono, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def _decode_wav(data: bytes):
+    # 정수 PCM WAV 는 표준 라이브러리로 (float WAV 등은 soundfile 이 있을 때만)
+    try:
+        with wave.open(io.BytesIO(data)) as w:
+            width, channels, rate = w.getsampwidth(), w.getnchannels(), w.getframerate()
+            frames = w.readframes(w.getnframes())
+    except (wave.Error, EOFError):
+        return _decode_soundfile(data)
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        return _decode_soundfile(data)  # 24bit 등
+    return samples.reshape(-1, channels), rate
+
+
+def _decode_soundfile(data: bytes):
+    if soundfile is None:
+        return None
+    samples, rate = soundfile.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    return samples, rate
+
+
+def _decode_av(data: bytes):
+    if av is None:
+        return None
+    chunks, rate = [], None
+    with av.open(io.BytesIO(data)) as container:
+        stream = container.streams.audio[0]
+        for frame in container.decode(stream):
+            # planar/packed 상관없이 (채널, 샘플) float 로
+            array = frame.to_ndarray()
+            if array.dtype.kind in "iu":
+                array = array.astype(np.float32) / np.iinfo(array.dtype).max
+            if frame.format.is_planar:
+                array = array.T
+            else:
+                array = array.reshape(-1, len(frame.layout.channels))
+            chunks.append(array.astype(np.float32))
+            rate = frame.sample_rate
+    if not chunks:
+        return None
+    return np.concatenate(chunks), rate
+
+
+_DECODERS = {
+    "wav": _decode_wav,
+    "webm": _decode_av,
+    "ogg": _decode_av,
+    "flac": _decode_soundfile,
+}
+
+
+def decode_to_pcm16k(data: bytes) -> Optional[bytes]:
+    """자주 오는 형식(wav, webm/opus)을 프로세스 안에서 16kHz mono PCM 으로 변환.
+
+    지원하지 않는 형식이거나 디코더(PyAV / soundfile)가 없으면 None → ffmpeg 로 처리한다.
+    """
+    decoder = _DECODERS.get(sniff_format(data))
+    if decoder is None:
+        return None
+    try:
+        decoded = decoder(data)
+    except Exception:
+        return None  # 손상된 파일 등은 ffmpeg 가 오류 메시지를 만들도록 넘긴다
+    if decoded is None:
+        return None
+    samples, rate = decoded
+    return to_pcm16_mono(samples, rate)
@@ -0,0 +1,107 @@
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import numpy as np
+from fastapi import HTTPException
+
+# /metrics 에서 조회할 실행기 목록 (이름 → 실행기)
+EXECUTOR_REGISTRY: Dict[str, "BoundedExecutor"] = {}
+
+
+class BoundedExecutor:
+    """크기가 정해진 스레드 풀 + 대기열.
+
+    이벤트 루프를 막는 작업(ffmpeg, STT, 임베딩)을 여기서 실행하고,
+    실행 중 + 대기 작업이 max_workers + max_queue 를 넘으면 바로 503 을 돌려준다 (지연시간 폭주 대신 backpressure).
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0  # 대기 + 실행 중
+        self._running = 0
+        self._waits = deque(maxlen=1000)  # 최근 대기 시간 (초)
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        EXECUTOR_REGISTRY[name] = self
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _reject(self) -> None:
+        self.rejected += 1
+        raise HTTPException(
+            status_code=503,
+            detail=f"요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요. ({self.name})",
+            headers={"Retry-After": "1"},
+        )
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._reject()
+            self._pending += 1
+            self.submitted += 1
+        queued_at = time.perf_counter()
+
+        def task():
+            with self._lock:
+                self._running += 1
+                self._waits.append(time.perf_counter() - queued_at)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self.completed += 1
+
+        future = self._pool.submit(task)
+        # 시작 전에 취소돼도, 실행이 끝나도 한 번만 자리를 반납
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    @contextlib.contextmanager
+    def admit(self):
+        # 스레드가 필요 없는 비동기 작업(파이프 ffmpeg 등)도 같은 한도로 세고, 가득 차면 503
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._reject()
+            self._pending += 1
+            self._running += 1
+            self.submitted += 1
+            self._waits.append(0.0)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._running -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            waits = np.array(self._waits) * 1000
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_ms_p50": round(float(np.percentile(waits, 50)), 2) if len(waits) else None,
+                "wait_ms_p99": round(float(np.percentile(waits, 99)), 2) if len(waits) else None,
+            }
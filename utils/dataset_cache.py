@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Optional
+import numpy as np
+from utils.market_data import MonthTable
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+CACHE_DIR_NAME = ".cache"
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_dir_for(source: Path) -> Path:
+    # 원본 파일 옆 data/.cache/<파일명>/
+    return source.parent / CACHE_DIR_NAME / source.stem
+
+
+def _source_stamp(source: Path) -> dict:
+    st = source.stat()
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _read_meta(cache_dir: Path) -> Optional[dict]:
+    try:
+        with open(cache_dir / "meta.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def is_cache_fresh(source: Path, cache_dir: Path) -> bool:
+    meta = _read_meta(cache_dir)
+    if meta is None or meta.get("version") != CACHE_VERSION:
+        return False
+    stamp = _source_stamp(source)
+    if meta.get("mtime_ns") == stamp["mtime_ns"] and meta.get("size") == stamp["size"]:
+        return True
+    # mtime만 바뀐 경우(복사, checkout 등) 내용 해시가 같으면 재사용
+    if meta.get("sha256") != file_sha256(source):
+        return False
+    meta.update(stamp)
+    _write_json(cache_dir / "meta.json", meta)
+    return True
+
+
+def _write_json(path: Path, obj) -> None:
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def save_month_table(table: MonthTable, source: Path, cache_dir: Path) -> None:
+    # 임시 디렉터리에 쓴 뒤 교체해서 다른 워커가 반쯤 쓰인 캐시를 읽지 않도록 한다
+    tmp_dir = cache_dir.with_name(cache_dir.name + f".tmp{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    try:
+        np.save(tmp_dir / "months.npy", table.months, allow_pickle=False)
+        np.save(tmp_dir / "values.npy", np.ascontiguousarray(table.values), allow_pickle=False)
+        _write_json(tmp_dir / "keys.json", [[key, row] for key, row in table.keys.items()])
+        _write_json(tmp_dir / "meta.json", {
+            "version": CACHE_VERSION,
+            "source": source.name,
+            "sha256": file_sha256(source),
+            **_source_stamp(source),
+        })
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        os.replace(tmp_dir, cache_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def load_month_table_cache(cache_dir: Path) -> MonthTable:
+    months = np.load(cache_dir / "months.npy")
+    values = np.load(cache_dir / "values.npy", mmap_mode="r")
+    with open(cache_dir / "keys.json", encoding="utf-8") as f:
+        pairs = json.load(f)
+    keys = {(tuple(key) if isinstance(key, list) else key): row for key, row in pairs}
+    return MonthTable(months, values, keys)
+
+
+def cached_month_table(source: Path, build: Callable[[Path], MonthTable]) -> MonthTable:
+    """source(xlsx)에 대한 MonthTable 을 캐시에서 memory-map 하고, 캐시가 없거나 오래됐으면 다시 만든다."""
+    cache_dir = cache_dir_for(source)
+    if source.exists() and is_cache_fresh(source, cache_dir):
+        try:
+            return load_month_table_cache(cache_dir)
+        except (OSError, ValueError) as e:
+            logger.warning("dataset cache unreadable, rebuilding %s: %s", cache_dir, e)
+
+    table = build(source)
+    try:
+        save_month_table(table, source, cache_dir)
+    except (OSError, ValueError) as e:
+        # 쓰기 권한이 없거나 object 배열 등 저장할 수 없는 경우에도 서비스는 계속 동작
+        logger.warning("dataset cache not written for %s: %s", source, e)
+    return table
@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from utils.result_cache import CACHE_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    # NFKC + 문장부호 제거 + 공백 정리: "위험도 평가해줘!!" == " 위험도  평가해줘 "
+    text = unicodedata.normalize("NFKC", text)
+    text = "".join(" " if unicodedata.category(ch).startswith("P") else ch for ch in text)
+    return _SPACES.sub(" ", text).strip()
+
+
+class EmbeddingCache:
+    """정규화한 문장 → 임베딩 LRU 캐시.
+
+    정규화한 문장은 캐시 키로만 쓰고, 모델에는 캐시 사용 여부와 상관없이 원문을 넣는다.
+    path 를 주면 float16 으로 디스크에 저장/복원해서 재시작 후에도 유지한다 (model 이름이 다르면 무시).
+    """
+
+    def __init__(self, name: str, model_name: str, max_entries: int = 10000,
+                 path: Optional[Path] = None, save_every: int = 500):
+        self.name = name
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.save_every = save_every
+        self._data: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.loaded = 0
+        if self.path is not None:
+            self.load()
+        CACHE_REGISTRY[name] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _put(self, key: str, vec: np.ndarray) -> None:
+        self._data[key] = vec
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def embed(self, texts: List[str], encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        # 캐시에 없는 문장만 (중복 제거 후) 한 번에 encode
+        if not self.enabled:
+            return encode(texts)
+        keys = [normalize_text(t) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vec = self._data.get(key)
+                if vec is not None:
+                    self._data.move_to_end(key)
+                    found[key] = vec
+        missing: Dict[str, str] = {}  # 키 → 처음 나온 원문
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        # 같은 호출 안의 중복 문장은 한 번만 인코딩하므로 적중으로 센다
+        with self._lock:
+            self.misses += len(missing)
+            self.hits += len(keys) - len(missing)
+        if missing:
+            vecs = np.asarray(encode(list(missing.values())), dtype=np.float32)
+            with self._lock:
+                for key, vec in zip(missing, vecs):
+                    found[key] = vec
+                    self._put(key, vec)
+                self._unsaved += len(missing)
+                should_save = self.path is not None and self._unsaved >= self.save_every
+            if should_save:
+                self.save()
+        return np.stack([found[k] for k in keys])
+
+    def load(self) -> None:
+        try:
+            with open(self.path.with_suffix(".json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            vectors = np.load(self.path.with_suffix(".npy"), allow_pickle=False)
+        except (FileNotFoundError, ValueError, json.JSONDecodeError):
+            return
+        if meta.get("model") != self.model_name or len(meta.get("texts", [])) != len(vectors):
+            logger.info("embedding cache %s: 모델이 달라 저장된 캐시를 사용하지 않습니다.", self.path)
+            return
+        with self._lock:
+            for key, vec in zip(meta["texts"][-self.max_entries:], vectors[-self.max_entries:]):
+                self._put(key, vec.astype(np.float32))
+            self.loaded = len(self._data)
+
+    def save(self) -> None:
+        # LRU 순서 그대로 float16 행렬 + 문장 목록(json)으로 저장 (임시 파일에 쓴 뒤 교체)
+        if self.path is None:
+            return
+        with self._lock:
+            texts = list(self._data)
+            vectors = np.stack(list(self._data.values())).astype(np.float16) if texts else np.zeros((0, 0), np.float16)
+            self._unsaved = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        suffix = f".tmp{os.getpid()}"
+        npy_tmp = self.path.with_suffix(suffix + ".npy")
+        json_tmp = self.path.with_suffix(suffix + ".json")
+        np.save(npy_tmp, vectors, allow_pickle=False)
+        with open(json_tmp, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model_name, "texts": texts}, f, ensure_ascii=False)
+        os.replace(npy_tmp, self.path.with_suffix(".npy"))
+        os.replace(json_tmp, self.path.with_suffix(".json"))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = len(self._data)
+            size = sum(v.nbytes for v in self._data.values())
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "evictions": self.evictions,
+            "loaded_from_disk": self.loaded,
+            "path": str(self.path) if self.path else None,
+        }
@@ -1,6 +1,8 @@
+import asyncio
 import os
 import subprocess
 from pathlib import Path
+from typing import AsyncIterator
 from fastapi import HTTPException
 from dotenv import load_dotenv
 
@@ -13,8 +15,145 @@ def run_ffmpeg(in_path: Path, out_path: Path, to_flac: bool = False):
     if to_flac:
         cmd = [FFMPEG, "-y", "-i", str(in_path), "-ac", "1", "-ar", "16000", "-c:a", "flac", str(out_path)]
     else:
-        cmd = [FFMPEG, "-y", "-i", str(in_path), "-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le", str(out_path)]
+        # 파이프 / 프로세스 내 디코딩과 같은 헤더 없는 raw PCM (WAV 헤더가 VAD 와 PCM 해시에 섞이지 않도록)
+        cmd = [FFMPEG, "-y", "-i", str(in_path), "-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le", "-f", "s16le", str(out_path)]
 
     p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     if p.returncode != 0:
         raise HTTPException(status_code=400, detail=f"ffmpeg 변환 실패: {p.stderr.decode(errors='ignore')[:400]}")
+
+
+# 파이프 모드 제한 (업로드 크기, 변환 결과 크기, 변환 시간)
+FFMPEG_MAX_INPUT_BYTES = int(os.getenv("FFMPEG_MAX_INPUT_BYTES", str(20 * 1024 * 1024)))
+FFMPEG_MAX_OUTPUT_BYTES = int(os.getenv("FFMPEG_MAX_OUTPUT_BYTES", str(50 * 1024 * 1024)))
+FFMPEG_TIMEOUT_SEC = float(os.getenv("FFMPEG_TIMEOUT_SEC", "30"))
+
+def pipe_command(to_flac: bool = False, streaming: bool = False) -> list:
+    # stdin → 16kHz mono → stdout (LINEAR16 은 헤더 없는 raw PCM, 파이프에서는 WAV 헤더 크기를 채울 수 없음)
+    out_format = ["-c:a", "flac", "-f", "flac"] if to_flac else ["-c:a", "pcm_s16le", "-f", "s16le"]
+    # streaming: 입력을 모으지 않고 디코딩되는 대로 바로 출력 (WebSocket 스트리밍 인식)
+    low_latency_in = ["-fflags", "+nobuffer"] if streaming else []
+    low_latency_out = ["-flush_packets", "1"] if streaming else []
+    return [FFMPEG, "-hide_banner", "-loglevel", "error", *low_latency_in, "-i", "pipe:0",
+            "-ac", "1", "-ar", "16000", *out_format, *low_latency_out, "pipe:1"]
+
+async def _drain(stream: asyncio.StreamReader) -> None:
+    while await stream.read(1 << 16):
+        pass
+
+async def run_ffmpeg_pipe(data: bytes, to_flac: bool = False,
+                          timeout: float = FFMPEG_TIMEOUT_SEC,
+                          max_input_bytes: int = FFMPEG_MAX_INPUT_BYTES,
+                          max_output_bytes: int = FFMPEG_MAX_OUTPUT_BYTES) -> bytes:
+    """임시 파일 없이 업로드 바이트를 ffmpeg stdin 으로 넣고 stdout 에서 변환 결과를 읽는다.
+
+    시간 초과, 출력 크기 초과, 요청 취소 시 ffmpeg 프로세스를 종료하고 정리한다.
+    """
+    if len(data) > max_input_bytes:
+        raise HTTPException(status_code=413, detail=f"오디오 파일이 너무 큽니다 (최대 {max_input_bytes} bytes).")
+
+    proc = await asyncio.create_subprocess_exec(
+        *pipe_command(to_flac),
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def feed():
+        try:
+            proc.stdin.write(data)
+            await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg 가 입력을 다 읽기 전에 종료 (오류는 returncode / stderr 로 확인)
+        finally:
+            proc.stdin.close()
+
+    async def read_output():
+        chunks, size = [], 0
+        while True:
+            chunk = await proc.stdout.read(1 << 16)
+            if not chunk:
+                return b"".join(chunks)
+            size += len(chunk)
+            if size > max_output_bytes:
+                raise HTTPException(status_code=413, detail="변환된 오디오가 너무 깁니다.")
+            chunks.append(chunk)
+
+    tasks = [asyncio.ensure_future(c) for c in (feed(), read_output(), proc.stderr.read())]
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()  # 크기 초과 등 (남은 작업은 아래 finally 에서 취소)
+        if pending:
+            raise HTTPException(status_code=504, detail="ffmpeg 변환 시간이 초과되었습니다.")
+        _, out, err = [t.result() for t in tasks]
+        returncode = await proc.wait()
+    finally:
+        # 시간 초과 / 크기 초과 / 요청 취소 시 남은 작업을 취소하고 프로세스 정리
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        # 읽다 만 출력이 파이프 버퍼에 남아 있으면 wait() 가 끝나지 않으므로 끝까지 비운다
+        await asyncio.shield(asyncio.gather(_drain(proc.stdout), _drain(proc.stderr), proc.wait()))
+
+    if returncode != 0:
+        raise HTTPException(status_code=400, detail=f"ffmpeg 변환 실패: {err.decode(errors='ignore')[:400]}")
+    return out
+
+
+async def ffmpeg_pcm_stream(chunks: AsyncIterator[bytes], max_output_bytes: int = FFMPEG_MAX_OUTPUT_BYTES,
+                            read_size: int = 1 << 12) -> AsyncIterator[bytes]:
+    """조각으로 들어오는 오디오(webm 등)를 ffmpeg 하나로 계속 변환해 16kHz mono s16le 조각을 내보낸다.
+
+    입력이 끝나기 전에도 디코딩된 만큼 바로 출력하고, 소비자가 중단하면(연결 끊김 등) 프로세스를 정리한다.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *pipe_command(streaming=True),
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+
+    feed_errors = []
+
+    async def feed():
+        try:
+            async for chunk in chunks:
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            feed_errors.append(e)  # 입력 쪽 오류(연결 끊김 등)는 출력을 다 읽은 뒤 전달
+        finally:
+            proc.stdin.close()
+
+    tasks = [asyncio.ensure_future(feed()), asyncio.ensure_future(proc.stderr.read())]
+    try:
+        size = 0
+        while True:
+            chunk = await proc.stdout.read(read_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_output_bytes:
+                raise HTTPException(status_code=413, detail="변환된 오디오가 너무 깁니다.")
+            yield chunk
+        await tasks[0]
+        if feed_errors:
+            raise feed_errors[0]
+        if await proc.wait() != 0:
+            err = await tasks[1]
+            raise HTTPException(status_code=400, detail=f"ffmpeg 변환 실패: {err.decode(errors='ignore')[:400]}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        await asyncio.shield(asyncio.gather(_drain(proc.stdout), _drain(proc.stderr), proc.wait()))
@@ -0,0 +1,195 @@
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from utils.util import map_housing_type, get_current_month
+
+JEONSE_KEY_COLUMNS = ["지역별(1)", "주택유형별(1)"]
+UNSOLD_KEY_COLUMNS = ["구분(1)"]
+BASE_RATE_MONTH_COLUMN = "yyyymm_str"
+BASE_RATE_VALUE_COLUMN = "기준금리"
+
+
+def _month_days(years: np.ndarray, months: np.ndarray) -> np.ndarray:
+    # (연, 월) → 해당 월 1일의 epoch 일수 (datetime 차이의 .days와 동일한 거리 계산용)
+    month_index = (np.asarray(years, dtype=np.int64) - 1970) * 12 + (np.asarray(months, dtype=np.int64) - 1)
+    return month_index.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+
+def _parse_month_columns(columns: Iterable) -> List[tuple]:
+    # "YYYY.MM" 형식으로 파싱되는 열만 (yyyymm, 원래 열 이름) 으로 반환
+    parsed = []
+    for col in columns:
+        try:
+            dt = datetime.strptime(str(col), "%Y.%m")
+        except ValueError:
+            continue  # 잘못된 날짜 형식의 열은 무시
+        parsed.append((dt.year * 100 + dt.month, col))
+    # 정렬이 안정적이므로 같은 달이 중복되면 먼저 나온 열이 앞에 온다
+    parsed.sort(key=lambda x: x[0])
+    return parsed
+
+
+class MonthTable:
+    """키(지역 등) × 월 축으로 정리된 값 테이블.
+
+    months 는 정렬된 YYYYMM 정수 축, keys 는 키 → 행 번호 dict, values 는 (행, 월) 배열.
+    """
+
+    def __init__(self, months: np.ndarray, values: np.ndarray, keys: Dict[Hashable, int]):
+        self.months = np.asarray(months, dtype=np.int64)
+        self.values = values
+        self.keys = keys
+        self.days = _month_days(self.months // 100, self.months % 100)
+
+    @classmethod
+    def from_wide_frame(cls, df: pd.DataFrame, key_columns: List[str]) -> "MonthTable":
+        # 월이 열로 펼쳐진 표 (전세가율, 미분양)
+        month_cols = _parse_month_columns(c for c in df.columns if c not in key_columns)
+        months = np.array([m for m, _ in month_cols], dtype=np.int64)
+        values = df[[c for _, c in month_cols]].to_numpy()
+
+        keys: Dict[Hashable, int] = {}
+        key_values = df[key_columns].itertuples(index=False, name=None)
+        for i, key in enumerate(key_values):
+            key = key if len(key_columns) > 1 else key[0]
+            keys.setdefault(key, i)  # 중복 키는 첫 번째 행 사용
+        return cls(months, values, keys)
+
+    @classmethod
+    def from_long_frame(cls, df: pd.DataFrame, month_column: str, value_column: str) -> "MonthTable":
+        # 월이 행으로 나열된 표 (기준금리) → 키 없는 1행 테이블
+        month_strs = [str(m) for m in df[month_column].tolist()]
+        first_pos = {}
+        for pos, m in enumerate(month_strs):
+            first_pos.setdefault(m, pos)  # 같은 월이 여러 번 있으면 첫 번째 값 사용
+        month_cols = _parse_month_columns(first_pos.keys())
+        months = np.array([m for m, _ in month_cols], dtype=np.int64)
+        raw = df[value_column].to_numpy()
+        values = raw[[first_pos[c] for _, c in month_cols]].reshape(1, -1)
+        return cls(months, values, {None: 0})
+
+    def nearest_column(self, target: datetime) -> Optional[int]:
+        # 가장 가까운 달의 열 번호 (거리가 같으면 이른 달 우선)
+        if len(self.days) == 0:
+            return None
+        target_days = int(_month_days(target.year, target.month))
+        i = int(np.searchsorted(self.days, target_days))
+        if i == 0:
+            return 0
+        if i == len(self.days):
+            return i - 1
+        if target_days - self.days[i - 1] <= self.days[i] - target_days:
+            return i - 1
+        return i
+
+    def lookup(self, key: Hashable, col: int):
+        row = self.keys.get(key)
+        if row is None:
+            return None
+        return self.values[row, col]
+
+    def nearest_columns(self, years: np.ndarray, months: np.ndarray) -> np.ndarray:
+        # nearest_column 의 배치 버전 (같은 거리 규칙)
+        target_days = _month_days(years, months)
+        n = len(self.days)
+        i = np.searchsorted(self.days, target_days)
+        left = np.clip(i - 1, 0, n - 1)
+        right = np.clip(i, 0, n - 1)
+        use_left = (target_days - self.days[left]) <= (self.days[right] - target_days)
+        return np.where(use_left, left, right)
+
+    def lookup_many(self, keys: List[Hashable], cols: np.ndarray):
+        # (값 배열, 키 존재 여부) — 없는 키는 NaN
+        rows = np.fromiter((self.keys.get(k, -1) for k in keys), dtype=np.int64, count=len(keys))
+        found = rows >= 0
+        out = np.full(len(keys), np.nan)
+        out[found] = self.values[rows[found], cols[found]]
+        return out, found
+
+
+def _to_dotted_month(month) -> str:
+    month = str(month)
+    if len(month) == 6:  # YYYYMM -> YYYY.MM
+        month = f"{month[:4]}.{month[4:]}"
+    return month
+
+
+class MarketDataIndex:
+    """전세가율 / 미분양 / 기준금리 데이터를 서버 시작 시 한 번만 정리해 둔 조회용 인덱스.
+
+    utils.util 의 get_jeonse_rate / get_unsold_value / get_base_rate 와 같은 결과를 반환한다.
+    """
+
+    def __init__(self, jeonse: MonthTable, unsold: MonthTable, base_rate: MonthTable):
+        self.jeonse = jeonse
+        self.unsold = unsold
+        self.base_rate = base_rate
+
+    @classmethod
+    def from_frames(cls, jeonse_df: pd.DataFrame, unsold_df: pd.DataFrame, base_rate_df: pd.DataFrame) -> "MarketDataIndex":
+        return cls(
+            jeonse=MonthTable.from_wide_frame(jeonse_df, JEONSE_KEY_COLUMNS),
+            unsold=MonthTable.from_wide_frame(unsold_df, UNSOLD_KEY_COLUMNS),
+            base_rate=MonthTable.from_long_frame(base_rate_df, BASE_RATE_MONTH_COLUMN, BASE_RATE_VALUE_COLUMN),
+        )
+
+    def get_jeonse_rate(self, region: str, house_type: str, start_month=None):
+        house_type_mapped = map_housing_type(house_type)
+        start_month = get_current_month() if start_month is None else _to_dotted_month(start_month)
+
+        if len(self.jeonse.months) == 0:
+            raise ValueError("jeonse_df에 유효한 날짜 열이 없습니다")
+        try:
+            target_date = datetime.strptime(start_month, "%Y.%m")
+        except ValueError:
+            raise ValueError(f"start_month의 날짜 형식이 잘못되었습니다: {start_month}")
+
+        col = self.jeonse.nearest_column(target_date)
+        return self.jeonse.lookup((region, house_type_mapped), col)
+
+    def get_unsold_value(self, region: str, month):
+        if isinstance(month, int):
+            month = _to_dotted_month(month)
+        try:
+            target_date = datetime.strptime(month, "%Y.%m")
+        except ValueError:
+            raise ValueError(f"month의 날짜 형식이 잘못되었습니다: {month}")
+
+        col = self.unsold.nearest_column(target_date)
+        if col is None:
+            raise ValueError(f"{month}에 적합한 열을 찾을 수 없습니다")
+        return self.unsold.lookup(region, col)
+
+    def get_base_rate(self, month):
+        if isinstance(month, int):
+            month = _to_dotted_month(month)
+        try:
+            target_date = datetime.strptime(month, "%Y.%m")
+        except ValueError:
+            raise ValueError(f"month의 날짜 형식이 잘못되었습니다: {month}")
+
+        col = self.base_rate.nearest_column(target_date)
+        if col is None:
+            raise ValueError(f"{month}에 적합한 기준금리 데이터를 찾을 수 없습니다")
+        return self.base_rate.lookup(None, col)
+
+    # 배치 조회: years / months 는 이미 검증된 정수 배열
+    def get_jeonse_rates(self, regions: List[str], house_types: List[str], years: np.ndarray, months: np.ndarray):
+        if len(self.jeonse.months) == 0:
+            raise ValueError("jeonse_df에 유효한 날짜 열이 없습니다")
+        cols = self.jeonse.nearest_columns(years, months)
+        keys = [(r, map_housing_type(t)) for r, t in zip(regions, house_types)]
+        return self.jeonse.lookup_many(keys, cols)
+
+    def get_unsold_values(self, regions: List[str], years: np.ndarray, months: np.ndarray):
+        if len(self.unsold.months) == 0:
+            raise ValueError("미분양 데이터에 유효한 날짜 열이 없습니다")
+        cols = self.unsold.nearest_columns(years, months)
+        return self.unsold.lookup_many(list(regions), cols)
+
+    def get_base_rates(self, years: np.ndarray, months: np.ndarray) -> np.ndarray:
+        if len(self.base_rate.months) == 0:
+            raise ValueError("기준금리 데이터가 없습니다")
+        cols = self.base_rate.nearest_columns(years, months)
+        return np.asarray(self.base_rate.values[0], dtype=np.float64)[cols]
@@ -0,0 +1,256 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional
+
+# /metrics 에서 조회할 캐시 목록 (이름 → 캐시)
+CACHE_REGISTRY: Dict[str, Any] = {}
+
+
+def _approx_size(key: Hashable, value: Any) -> int:
+    # 결과는 작은 JSON 형태 dict 이므로 직렬화 길이로 메모리 사용량을 근사
+    return len(repr(key)) + len(json.dumps(value, default=str, ensure_ascii=False))
+
+
+class ResultCache:
+    """버전 스탬프가 붙은 LRU + TTL 결과 캐시.
+
+    버전(모델/데이터 버전)이 바뀌면 전체를 비워서 reload 후 예전 결과가 나가지 않도록 한다.
+    버전은 서로 비교 가능한 값이어야 하고, 현재보다 작은(오래된) 버전의 get/put 은 캐시를
+    건드리지 않는다 (reload 전에 시작한 요청이 캐시를 되돌리거나 예전 결과를 넣지 않도록).
+    """
+
+    def __init__(self, name: str, max_entries: int = 4096, max_bytes: int = 8 * 1024 * 1024, ttl: float = 600.0):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key → (value, size, expires_at)
+        self._bytes = 0
+        self._version: Any = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale = 0  # 오래된 버전으로 들어와 무시한 get/put 수
+        CACHE_REGISTRY[name] = self
+
+    def _check_version(self, version: Any) -> bool:
+        # 현재 버전이면 True, 더 새 버전이면 비우고 교체한 뒤 True, 오래된 버전이면 False
+        if version == self._version:
+            return True
+        if version is not None and self._version is not None and version < self._version:
+            self.stale += 1
+            return False
+        if self._data:
+            self.invalidations += 1
+        self._data.clear()
+        self._bytes = 0
+        self._version = version
+        return True
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable, version: Any = None):
+        with self._lock:
+            entry = self._data.get(key) if self._check_version(version) else None
+            if entry is None:
+                self.misses += 1
+                return None
+            value, _, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any, version: Any = None) -> None:
+        size = _approx_size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if not self._check_version(version):
+                return
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (copy.deepcopy(value), size, time.monotonic() + self.ttl)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_sec": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "stale": self.stale,
+            "version": self._version,
+        }
+
+
+def cache_from_env(name: str, prefix: str = "RESULT_CACHE") -> ResultCache:
+    # 환경 변수로 크기/TTL 조정: RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_TTL_SEC
+    return ResultCache(
+        name,
+        max_entries=int(os.getenv(f"{prefix}_MAX_ENTRIES", "4096")),
+        max_bytes=int(os.getenv(f"{prefix}_MAX_BYTES", str(8 * 1024 * 1024))),
+        ttl=float(os.getenv(f"{prefix}_TTL_SEC", "600")),
+    )
+
+
+class DiskCache:
+    """항목 하나 = JSON 파일 하나인 디스크 캐시 (프로세스 재시작 / 여러 워커 사이에서 공유).
+
+    TTL 은 파일 수정 시각 기준이고, 전체 크기가 max_bytes 를 넘으면 오래된 파일부터 지운다.
+    키가 str 이어야 하고 값은 JSON 으로 직렬화할 수 있어야 한다.
+    """
+
+    def __init__(self, name: str, path: Path, max_bytes: int = 256 * 1024 * 1024, ttl: float = 86400.0):
+        self.name = name
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._bytes = sum(f.stat().st_size for f in self.path.glob("*.json"))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        CACHE_REGISTRY[name] = self
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def get(self, key: str, version: Optional[str] = None):
+        file = self._file(key)
+        try:
+            if file.stat().st_mtime + self.ttl < time.time():
+                self._unlink(file)
+                with self._lock:
+                    self.expirations += 1
+                return self._miss()
+            entry = json.loads(file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self._miss()
+        if entry.get("key") != key or entry.get("version") != version:
+            return self._miss()
+        with self._lock:
+            self.hits += 1
+        return entry["value"]
+
+    def put(self, key: str, value: Any, version: Optional[str] = None) -> None:
+        data = json.dumps({"key": key, "version": version, "value": value}, ensure_ascii=False).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        file = self._file(key)
+        tmp = file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            old_size = file.stat().st_size if file.exists() else 0
+            tmp.write_bytes(data)
+            os.replace(tmp, file)  # 읽는 쪽이 쓰다 만 파일을 보지 않도록
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        with self._lock:
+            self._bytes += len(data) - old_size
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _unlink(self, file: Path) -> None:
+        try:
+            size = file.stat().st_size
+            file.unlink()
+        except OSError:
+            return
+        with self._lock:
+            self._bytes -= size
+
+    def _evict(self) -> None:
+        # 오래된 파일부터 max_bytes 의 90% 아래로 (매번 디렉터리를 훑지 않도록 여유를 둔다)
+        files = []
+        for f in self.path.glob("*.json"):
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, f))
+        self._bytes = sum(size for _, size, _ in files)
+        for _, size, f in sorted(files, key=lambda x: x[0]):
+            if self._bytes <= self.max_bytes * 0.9:
+                break
+            try:
+                f.unlink()
+            except OSError:
+                continue
+            self._bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_sec": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TieredCache:
+    """메모리 캐시(ResultCache) 앞단 + 선택적인 2차 저장소(get/put 을 가진 객체, 예: DiskCache).
+
+    메모리에서 못 찾으면 2차 저장소를 보고, 찾으면 메모리로 올린다.
+    """
+
+    def __init__(self, memory: ResultCache, second: Optional[Any] = None):
+        self.memory = memory
+        self.second = second
+
+    def get(self, key: str, version: Optional[str] = None):
+        value = self.memory.get(key, version)
+        if value is None and self.second is not None:
+            value = self.second.get(key, version)
+            if value is not None:
+                self.memory.put(key, value, version)
+        return value
+
+    def put(self, key: str, value: Any, version: Optional[str] = None) -> None:
+        self.memory.put(key, value, version)
+        if self.second is not None:
+            self.second.put(key, value, version)
@@ -0,0 +1,112 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+# 에너지 기반 음성 구간 검출 (16kHz mono s16le)
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "30"))
+VAD_MIN_DB = float(os.getenv("VAD_MIN_DB", "-50"))  # 이보다 작은 프레임은 항상 무음 (dBFS)
+VAD_MARGIN_DB = float(os.getenv("VAD_MARGIN_DB", "12"))  # 잡음 바닥 + margin 보다 커야 음성
+VAD_MAX_THRESHOLD_DB = float(os.getenv("VAD_MAX_THRESHOLD_DB", "-35"))  # 무음 구간이 없는 클립에서 말을 자르지 않도록 상한
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "90"))  # 이보다 짧게 튀는 소리(클릭 등)는 무시
+VAD_PAD_MS = int(os.getenv("VAD_PAD_MS", "200"))  # 자른 구간 앞뒤로 남길 여유 (말 시작/끝 자음 보존)
+
+
+def frame_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    # 프레임별 RMS (dBFS), 마지막 남는 샘플은 버림
+    n = len(samples) // frame_len
+    frames = samples[:n * frame_len].astype(np.float32).reshape(n, frame_len) / 32768
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def speech_frames(db: np.ndarray, min_speech_frames: int, min_db: float = VAD_MIN_DB,
+                  margin_db: float = VAD_MARGIN_DB, max_threshold_db: float = VAD_MAX_THRESHOLD_DB) -> np.ndarray:
+    """프레임별 음성 여부.
+
+    문턱값은 잡음 바닥(하위 10% 프레임 에너지) + margin 을 [min_db, max_threshold_db] 로 자른 값이고,
+    min_speech_frames 보다 짧게 이어진 음성 구간은 지운다.
+    """
+    if len(db) == 0:
+        return np.zeros(0, dtype=bool)
+    threshold = min(max_threshold_db, max(min_db, float(np.percentile(db, 10)) + margin_db))
+    voiced = db > threshold
+    # 연속 구간 경계 → 짧은 구간 제거
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    for s, e in zip(starts, ends):
+        if e - s < min_speech_frames:
+            voiced[s:e] = False
+    return voiced
+
+
+def pcm_frame_db(pcm: bytes, rate: int = 16000, frame_ms: int = VAD_FRAME_MS) -> np.ndarray:
+    # s16le PCM → 프레임별 RMS (dBFS)
+    samples = np.frombuffer(pcm[:len(pcm) // 2 * 2], dtype="<i2")
+    return frame_db(samples, rate * frame_ms // 1000)
+
+
+def speech_bounds(db: np.ndarray, n_samples: int, rate: int = 16000, frame_ms: int = VAD_FRAME_MS,
+                  min_speech_ms: int = VAD_MIN_SPEECH_MS, pad_ms: int = VAD_PAD_MS) -> Optional[Tuple[int, int]]:
+    # 음성이 있는 구간 [start, end) 바이트 오프셋 (앞뒤 pad 포함), 음성이 없으면 None
+    frame_len = rate * frame_ms // 1000
+    voiced = speech_frames(db, max(1, min_speech_ms // frame_ms))
+    idx = np.flatnonzero(voiced)
+    if len(idx) == 0:
+        return None
+    pad = rate * pad_ms // 1000
+    start = max(0, idx[0] * frame_len - pad)
+    end = min(n_samples, (idx[-1] + 1) * frame_len + pad)
+    return start * 2, end * 2
+
+
+def trim_silence(pcm: bytes, rate: int = 16000, max_sec: Optional[float] = None,
+                 min_db: float = VAD_MIN_DB) -> Tuple[bytes, Dict]:
+    """앞뒤 무음을 잘라내고 max_sec 로 길이를 제한한 PCM 과 요약을 돌려준다.
+
+    클립 전체가 min_db 아래일 때만 b"" 를 돌려준다 (호출 쪽에서 STT 없이 빈 결과로 처리).
+    그보다 큰 소리가 있는데 적응형 문턱값으로 음성 구간을 못 찾으면 (잡음이 큰 방의 작은 목소리 등)
+    자르지 않고 그대로 돌려준다.
+    """
+    bytes_per_sec = rate * 2
+    db = pcm_frame_db(pcm, rate)
+    silent = len(db) == 0 or float(db.max()) <= min_db
+    bounds = None if silent else speech_bounds(db, len(pcm) // 2, rate)
+    if bounds:
+        trimmed = pcm[bounds[0]:bounds[1]]
+    else:
+        trimmed = b"" if silent else pcm
+    truncated = max_sec is not None and len(trimmed) > max_sec * bytes_per_sec
+    if truncated:
+        trimmed = trimmed[:int(max_sec * rate) * 2]
+    return trimmed, {
+        "input_sec": round(len(pcm) / bytes_per_sec, 3),
+        "speech_sec": round(len(trimmed) / bytes_per_sec, 3),
+        "removed_sec": round((len(pcm) - len(trimmed)) / bytes_per_sec, 3),
+        "truncated": truncated,
+        "untrimmed": not silent and bounds is None,
+    }
+
+
+# /metrics 용 누적 통계
+vad_stats = {"requests": 0, "rejected_empty": 0, "untrimmed": 0, "truncated": 0, "input_sec": 0.0, "removed_sec": 0.0}
+_stats_lock = threading.Lock()
+
+
+def record(summary: Dict) -> None:
+    with _stats_lock:
+        vad_stats["requests"] += 1
+        vad_stats["rejected_empty"] += summary["speech_sec"] == 0
+        vad_stats["untrimmed"] += summary["untrimmed"]
+        vad_stats["truncated"] += summary["truncated"]
+        vad_stats["input_sec"] += summary["input_sec"]
+        vad_stats["removed_sec"] += summary["removed_sec"]
+
+
+def stats() -> Dict:
+    with _stats_lock:
+        n = vad_stats["requests"]
+        return {
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in vad_stats.items()},
+            "avg_removed_sec": round(vad_stats["removed_sec"] / n, 3) if n else None,
+        }